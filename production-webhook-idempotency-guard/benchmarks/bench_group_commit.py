@@ -0,0 +1,64 @@
+"""
+Throughput benchmark: terminal writes with and without group commit.
+
+N threads each call mark_complete on pre-reserved PROCESSING rows of a
+SqliteStore with synchronous=FULL (one fsync per transaction).
+
+Run:
+    PYTHONPATH=src python benchmarks/bench_group_commit.py [writes]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from webhook_guard.sqlite_store import SqliteStore
+
+
+def _run(directory: str, writes: int, threads: int, window: Optional[float]) -> float:
+    store = SqliteStore(
+        os.path.join(directory, f"bench-{threads}-{window}.db"),
+        synchronous="FULL",
+        group_commit_window_seconds=window,
+        group_commit_max_batch=threads,
+    )
+    ids = [f"evt-{i}" for i in range(writes)]
+    store.reserve_many(ids, 300)
+    store.mark_processing_many(ids)
+
+    per_thread = writes // threads
+    barrier = threading.Barrier(threads)
+
+    def worker(worker_id: int) -> None:
+        barrier.wait()
+        for i in range(per_thread):
+            store.mark_complete(f"evt-{worker_id * per_thread + i}", {"status": "ok"})
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(worker, t) for t in range(threads)]:
+            future.result()
+    rate = per_thread * threads / (time.perf_counter() - started)
+    store.close()
+    return rate
+
+
+def main() -> None:
+    writes = int(sys.argv[1]) if len(sys.argv) > 1 else 8_000
+
+    print(f"terminal writes: {writes} (SqliteStore, synchronous=FULL)")
+    print(f"{'threads':>7} {'individual/s':>13} {'group 2ms/s':>12}")
+    # Same filesystem as the working tree: tmpfs would hide fsync cost
+    with tempfile.TemporaryDirectory(dir=os.getcwd()) as tmp:
+        for threads in (1, 8, 32):
+            individual = _run(tmp, writes, threads, None)
+            grouped = _run(tmp, writes, threads, 0.002)
+            print(f"{threads:>7} {individual:>13.0f} {grouped:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Memory benchmark: bytes per retained webhook record.
+
+Compares the previous representation (regular frozen dataclass with
+three datetime objects) against the slotted WebhookState snapshot and
+the CompactRecord used inside InMemoryStore.
+
+Run:
+    PYTHONPATH=src python benchmarks/bench_memory.py [records]
+"""
+
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from webhook_guard.models import CompactRecord, STATUS_CODES, WebhookState, WebhookStatus
+from webhook_guard.store import InMemoryStore
+
+
+@dataclass(frozen=True)
+class LegacyWebhookState:
+    """The pre-slots WebhookState layout, for comparison."""
+
+    webhook_id: str
+    status: WebhookStatus
+    reserved_until: Optional[Any]
+    result: Optional[Any]
+    error: Optional[str]
+    created_at: Any
+    updated_at: Any
+
+
+def _legacy(i: int) -> LegacyWebhookState:
+    now = datetime.utcnow()
+    return LegacyWebhookState(
+        webhook_id=f"evt_{i:012d}",
+        status=WebhookStatus.COMPLETE,
+        reserved_until=now + timedelta(seconds=300),
+        result=None,
+        error=None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _slotted(i: int) -> WebhookState:
+    now = datetime.utcnow()
+    return WebhookState(
+        webhook_id=f"evt_{i:012d}",
+        status=WebhookStatus.COMPLETE,
+        reserved_until=now + timedelta(seconds=300),
+        result=None,
+        error=None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _compact(i: int) -> CompactRecord:
+    now = time.time_ns()
+    return CompactRecord(
+        status_code=STATUS_CODES[WebhookStatus.COMPLETE],
+        reserved_until_ns=now + 300_000_000_000,
+        result=None,
+        error=None,
+        created_ns=now,
+        updated_ns=now,
+    )
+
+
+def _measure(factory: Callable[[int], Any], records: int) -> float:
+    """Bytes per entry of {webhook_id: record}, including the key string."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = {f"evt_{i:012d}": factory(i) for i in range(records)}
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(table) == records
+    return (after - before) / records
+
+
+def _measure_store(records: int) -> float:
+    store = InMemoryStore()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(records):
+        webhook_id = f"evt_{i:012d}"
+        store.reserve(webhook_id, 300)
+        store.mark_processing(webhook_id)
+        store.mark_complete(webhook_id, None)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / records
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    print(f"records: {records}")
+    print(f"{'representation':<40} {'bytes/record':>12}")
+    for label, factory in (
+        ("before: dataclass + 3 datetimes", _legacy),
+        ("WebhookState (slots, 3 datetimes)", _slotted),
+        ("after: CompactRecord (slots, int ns)", _compact),
+    ):
+        print(f"{label:<40} {_measure(factory, records):>12.1f}")
+    print(f"{'InMemoryStore (end to end)':<40} {_measure_store(records):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Codec benchmark: encode/decode cost and size of typical handler outputs.
+
+Each ResultSerializer configuration (codec x compression) round-trips
+three representative payloads: a small acknowledgement, a payment
+record and a ~20 KB order document.
+
+Run:
+    PYTHONPATH=src python benchmarks/bench_serialization.py [iterations]
+"""
+
+import sys
+import time
+from typing import Any, Dict
+
+from webhook_guard.serialization import BinaryCodec, JsonCodec, PickleCodec, ResultSerializer
+
+
+PAYLOADS: Dict[str, Any] = {
+    "ack": {"status": "ok", "processed": True},
+    "payment": {
+        "id": "evt_1Nx9kL2eZvKYlo2C",
+        "charge": {"id": "ch_3Nx", "amount": 12_500, "currency": "usd", "captured": True},
+        "customer": "cus_9s6XKzkNRiz8i3",
+        "metadata": {"order_id": "A-100234", "attempt": 1},
+        "fee": 0.029,
+    },
+    "order": {
+        "order_id": "A-100234",
+        "lines": [
+            {"sku": f"SKU-{i:05d}", "title": f"Item number {i}", "qty": i % 5 + 1, "price": 9.99 + i}
+            for i in range(200)
+        ],
+        "notes": "gift wrap, leave at door " * 20,
+    },
+}
+
+CONFIGURATIONS = {
+    "pickle": ResultSerializer(PickleCodec()),
+    "json": ResultSerializer(JsonCodec()),
+    "binary": ResultSerializer(BinaryCodec()),
+    "binary+zlib": ResultSerializer(BinaryCodec(), compression="zlib"),
+    "binary+lzma": ResultSerializer(BinaryCodec(), compression="lzma"),
+    "json+zlib": ResultSerializer(JsonCodec(), compression="zlib"),
+}
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+    for name, payload in PAYLOADS.items():
+        print(f"\n{name}")
+        print(f"{'codec':>12} {'bytes':>7} {'encode us':>10} {'decode us':>10}")
+        for label, serializer in CONFIGURATIONS.items():
+            data = serializer.dumps(payload)
+            assert serializer.loads(data) == payload
+            # lzma is orders of magnitude slower: fewer rounds keep runs short
+            rounds = max(1, iterations // 20) if "lzma" in label else iterations
+            encode = _per_call_us(lambda: serializer.dumps(payload), rounds)
+            decode = _per_call_us(lambda: serializer.loads(data), rounds)
+            print(f"{label:>12} {len(data):>7} {encode:>10.1f} {decode:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
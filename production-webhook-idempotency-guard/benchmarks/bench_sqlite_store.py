@@ -0,0 +1,72 @@
+"""
+Throughput benchmark: SqliteStore vs InMemoryStore.
+
+Each operation is one full fresh-delivery cycle:
+reserve -> mark_processing -> mark_complete.
+
+Run:
+    PYTHONPATH=src python benchmarks/bench_sqlite_store.py [cycles] [threads]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from webhook_guard.sqlite_store import SqliteStore
+from webhook_guard.store import InMemoryStore, StripedInMemoryStore
+
+
+def _cycle(store, webhook_id: str) -> None:
+    store.reserve(webhook_id, 300)
+    store.mark_processing(webhook_id)
+    store.mark_complete(webhook_id, {"id": webhook_id, "status": "ok"})
+
+
+def _run(store, cycles: int, threads: int) -> float:
+    per_thread = cycles // threads
+    barrier = threading.Barrier(threads)
+
+    def worker(worker_id: int) -> None:
+        barrier.wait()
+        for i in range(per_thread):
+            _cycle(store, f"evt-{worker_id}-{i}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(worker, t) for t in range(threads)]:
+            future.result()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def main() -> None:
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    print(f"cycles: {cycles} (reserve + mark_processing + mark_complete)")
+    print(f"{'store':<36} {'threads':>7} {'cycles/s':>10} {'store calls/s':>14}")
+
+    rows = [
+        ("InMemoryStore", lambda: InMemoryStore(), 1),
+        ("StripedInMemoryStore", lambda: StripedInMemoryStore(), threads),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for synchronous in ("NORMAL", "FULL"):
+            for n in (1, threads):
+                path = os.path.join(tmp, f"bench-{synchronous}-{n}.db")
+                rows.append(
+                    (f"SqliteStore (synchronous={synchronous})", lambda p=path, s=synchronous: SqliteStore(p, synchronous=s), n)
+                )
+
+        for label, factory, n in rows:
+            store = factory()
+            rate = _run(store, cycles, n)
+            print(f"{label:<36} {n:>7} {rate:>10.0f} {rate * 3:>14.0f}")
+            if hasattr(store, "close"):
+                store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,17 +6,40 @@ Internal modules should not be imported directly by consumers.
 """
 
 from .guard import WebhookGuard
-from .store import WebhookStore, WebhookStatus, WebhookState
-from .lock import DistributedLock
-from .models import ProcessingResult
+from .async_guard import AsyncWebhookGuard
+from .store import WebhookStore, AsyncWebhookStore, SupportsBegin, SupportsBulk, SupportsFindExpired, SupportsOwnedTransitions, SupportsPeekTerminal, WebhookStatus, WebhookState
+from .lock import DistributedLock, AsyncDistributedLock
+from .cache import CachingStore
+from .sqlite_store import SqliteStore
+from .tiered_store import TieredStore
+from .bloom import RotatingBloomFilter
+from .wait import WaitStrategy, FixedWait, BackoffWait, AdaptiveWait
+from .models import ProcessingResult, ResultRef
 
 __all__ = [
     "WebhookGuard",
+    "AsyncWebhookGuard",
     "WebhookStore",
+    "AsyncWebhookStore",
+    "SupportsBegin",
+    "SupportsBulk",
+    "SupportsFindExpired",
+    "SupportsOwnedTransitions",
+    "SupportsPeekTerminal",
+    "CachingStore",
+    "SqliteStore",
+    "TieredStore",
+    "RotatingBloomFilter",
+    "WaitStrategy",
+    "FixedWait",
+    "BackoffWait",
+    "AdaptiveWait",
     "WebhookStatus",
     "WebhookState",
     "DistributedLock",
+    "AsyncDistributedLock",
     "ProcessingResult",
+    "ResultRef",
 ]
 
 __version__ = "0.1.0"
@@ -0,0 +1,237 @@
+from typing import Awaitable, Callable, Any, Optional, Union
+from datetime import datetime
+import inspect
+import time
+import uuid
+
+from .models import ProcessingResult, WebhookStatus
+from .store import AsyncWebhookStore
+from .lock import AsyncDistributedLock
+from .notify import AsyncCompletionNotifier
+from .wait import FixedWait, WaitStrategy
+
+
+class AsyncWebhookGuard:
+    """
+    Asyncio variant of WebhookGuard.
+
+    Runs the same algorithm with the same guarantees, but every store and
+    lock call is awaited, so many in-flight deliveries can share a single
+    event loop. Handlers may be plain callables or coroutine functions.
+    """
+
+    def __init__(
+        self,
+        store: AsyncWebhookStore,
+        lock: AsyncDistributedLock,
+        default_timeout_seconds: int = 300,
+        wait_timeout_seconds: float = 1.0,
+        notifier: Optional[AsyncCompletionNotifier] = None,
+        wait_strategy: Optional[WaitStrategy] = None,
+    ):
+        self._store = store
+        self._lock = lock
+        self._default_timeout = default_timeout_seconds
+        self._notifier = notifier if notifier is not None else AsyncCompletionNotifier()
+        # How contended deliveries wait (see WaitStrategy); by default one
+        # wait of wait_timeout_seconds
+        self._wait = wait_strategy if wait_strategy is not None else FixedWait(wait_timeout_seconds)
+        self._observe = getattr(self._wait, "observe", None)
+        # Optional store capability (see SupportsBegin)
+        self._begin = getattr(store, "begin", None)
+        # Optional store capability (see SupportsOwnedTransitions)
+        self._complete_owned = getattr(store, "mark_complete_owned", None)
+        self._fail_owned = getattr(store, "mark_failed_owned", None)
+        # Optional store capability (see SupportsPeekTerminal)
+        self._peek = getattr(store, "peek_terminal", None)
+
+    async def process(
+        self,
+        webhook_id: str,
+        handler: Callable[[], Union[Any, Awaitable[Any]]],
+        timeout_seconds: Optional[int] = None,
+    ) -> ProcessingResult:
+        """
+        Process a webhook exactly once.
+
+        Algorithm: as WebhookGuard.process, including the begin() path,
+        the lock-free check of locally held terminal states and the
+        wait strategy for contended deliveries. Not supported here: a
+        seen_filter, single-flight coalescing and lockless mode.
+        """
+
+        timeout = timeout_seconds or self._default_timeout
+        start_time = datetime.utcnow()
+        lock_handle = None
+        owner = None
+
+        try:
+            if self._begin is not None:
+                # 1. Fast-path duplicate check without the lock: only
+                #    terminal states held locally
+                if self._peek is not None:
+                    cached = self._cached_result(self._peek(webhook_id), start_time)
+                    if cached is not None:
+                        return cached
+
+                # 3. Acquire distributed lock first: a holder whose lease
+                #    lapsed may still be running, and begin() would take
+                #    its record over
+                lock_handle = await self._lock.try_lock(webhook_id, timeout)
+
+                if lock_handle is None:
+                    return await self._await_in_flight(webhook_id, start_time)
+
+                # 1+2+4. Reserve straight into PROCESSING (single round trip)
+                owner = uuid.uuid4().hex
+                begun, existing_state = await self._begin(webhook_id, timeout, owner)
+
+                if not begun:
+                    cached = self._cached_result(existing_state, start_time)
+                    if cached is not None:
+                        return cached
+
+                    # Live reservation owned by another worker
+                    await self._release(lock_handle)
+                    lock_handle = None
+                    return await self._await_in_flight(webhook_id, start_time)
+
+            else:
+                # 1. Fast-path duplicate check (retry handling)
+                state = await self._store.get_state(webhook_id)
+
+                cached = self._cached_result(state, start_time)
+                if cached is not None:
+                    return cached
+
+                # 2. Atomic reservation (race-safe)
+                reserved, existing_state = await self._store.reserve(webhook_id, timeout)
+
+                if not reserved:
+                    cached = self._cached_result(existing_state, start_time)
+                    if cached is not None:
+                        return cached
+
+                # 3. Acquire distributed lock (concurrency control)
+                lock_handle = await self._lock.try_lock(webhook_id, timeout)
+
+                if lock_handle is None:
+                    return await self._await_in_flight(webhook_id, start_time)
+
+                # 4. Mark PROCESSING (CRASH SAFETY BOUNDARY)
+                await self._store.mark_processing(webhook_id)
+
+            # 5. Execute handler (side effects happen here)
+            started = time.perf_counter()
+            try:
+                output = handler()
+                if inspect.isawaitable(output):
+                    output = await output
+                handler_success = True
+                handler_error = None
+            except Exception as exc:
+                output = None
+                handler_success = False
+                handler_error = str(exc)
+            if self._observe is not None:
+                self._observe(time.perf_counter() - started)
+
+            # 6. Persist terminal state (owner-checked after begin)
+            if owner is not None and self._complete_owned is not None and self._fail_owned is not None:
+                if handler_success:
+                    await self._complete_owned(webhook_id, owner, output)
+                else:
+                    await self._fail_owned(webhook_id, owner, handler_error)
+            elif handler_success:
+                await self._store.mark_complete(webhook_id, output)
+            else:
+                await self._store.mark_failed(webhook_id, handler_error)
+
+            await self._signal_terminal(webhook_id)
+
+            return ProcessingResult(
+                success=handler_success,
+                output=output,
+                error=handler_error,
+                duration_ms=self._duration_ms(start_time),
+                cached=False,
+            )
+
+        finally:
+            # 7. Always release lock
+            await self._release(lock_handle)
+
+    # ---------- helpers ----------
+
+    @staticmethod
+    async def _release(lock_handle) -> None:
+        if lock_handle is not None:
+            try:
+                await lock_handle.release()
+            except Exception:
+                # Lock auto-released on connection close or timeout
+                pass
+
+    async def _await_in_flight(self, webhook_id: str, start_time: datetime) -> ProcessingResult:
+        # Another worker is processing — wait for its terminal state,
+        # re-reading the store before each wait
+        for delay in self._wait.delays():
+            final_state = await self._notifier.wait(
+                webhook_id,
+                delay,
+                lambda: self._store.get_state(webhook_id),
+            )
+            if final_state is not None:
+                break
+        else:
+            # Deadline passed (or holder is in another process)
+            final_state = await self._store.get_state(webhook_id)
+
+        cached = self._cached_result(final_state, start_time)
+        if cached is not None:
+            return cached
+
+        return ProcessingResult(
+            success=False,
+            output=None,
+            error="Webhook is currently being processed",
+            duration_ms=self._duration_ms(start_time),
+            cached=False,
+        )
+
+    async def _signal_terminal(self, webhook_id: str) -> None:
+        # Extra read only when a same-process duplicate is actually waiting
+        if self._notifier.has_waiters(webhook_id):
+            self._notifier.publish(webhook_id, await self._store.get_state(webhook_id))
+
+    def _cached_result(self, state, start_time: datetime) -> Optional[ProcessingResult]:
+        if state is not None:
+            if state.status == WebhookStatus.COMPLETE:
+                return self._cached_success(state, start_time)
+
+            if state.status == WebhookStatus.FAILED:
+                return self._cached_failure(state, start_time)
+
+        return None
+
+    def _cached_success(self, state, start_time: datetime) -> ProcessingResult:
+        return ProcessingResult(
+            success=True,
+            output=state.result,
+            error=None,
+            duration_ms=self._duration_ms(start_time),
+            cached=True,
+        )
+
+    def _cached_failure(self, state, start_time: datetime) -> ProcessingResult:
+        return ProcessingResult(
+            success=False,
+            output=None,
+            error=state.error or "Unknown error",
+            duration_ms=self._duration_ms(start_time),
+            cached=True,
+        )
+
+    @staticmethod
+    def _duration_ms(start_time: datetime) -> int:
+        return int((datetime.utcnow() - start_time).total_seconds() * 1000)
@@ -0,0 +1,103 @@
+from typing import Callable, Iterator
+import hashlib
+import math
+import threading
+import time
+
+
+class _BloomFilter:
+    __slots__ = ("_bits", "_size", "_hashes")
+
+    def __init__(self, size: int, hashes: int):
+        self._bits = bytearray((size + 7) // 8)
+        self._size = size
+        self._hashes = hashes
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self._hashes):
+            yield (h1 + i * h2) % self._size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RotatingBloomFilter:
+    """
+    Probabilistic "seen by this node" set of webhook ids.
+
+    Answers:
+    - "definitely never seen" -> the guard skips the fast-path read,
+      which is guaranteed to miss, and goes straight to reservation
+    - "maybe seen" -> the guard does the normal fast-path read
+
+    Correctness never depends on the answer: reserve() returns the
+    existing state anyway, so a wrong "never seen" only costs what the
+    skipped read would have saved.
+
+    Memory is bounded by rotating two generations every window_seconds;
+    an id is remembered for between one and two windows.
+    """
+
+    def __init__(
+        self,
+        expected_items: int = 1_000_000,
+        false_positive_rate: float = 0.01,
+        window_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if expected_items <= 0:
+            raise ValueError("expected_items must be positive")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+
+        self._size = max(8, math.ceil(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / expected_items * math.log(2)))
+        self._window = window_seconds
+        self._clock = clock
+        self._mutex = threading.Lock()
+        self._current = _BloomFilter(self._size, self._hashes)
+        self._previous = _BloomFilter(self._size, self._hashes)
+        self._rotated_at = clock()
+
+    @property
+    def size_bits(self) -> int:
+        return self._size
+
+    @property
+    def hash_count(self) -> int:
+        return self._hashes
+
+    def add(self, webhook_id: str) -> None:
+        self._maybe_rotate()
+        self._current.add(webhook_id)
+
+    def __contains__(self, webhook_id: str) -> bool:
+        self._maybe_rotate()
+        return webhook_id in self._current or webhook_id in self._previous
+
+    def _maybe_rotate(self) -> None:
+        now = self._clock()
+        if now - self._rotated_at < self._window:
+            return
+
+        with self._mutex:
+            elapsed = now - self._rotated_at
+            if elapsed < self._window:
+                return
+
+            if elapsed < 2 * self._window:
+                self._previous = self._current
+            else:
+                self._previous = _BloomFilter(self._size, self._hashes)
+            self._current = _BloomFilter(self._size, self._hashes)
+            self._rotated_at = now
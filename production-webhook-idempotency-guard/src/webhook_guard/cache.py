@@ -0,0 +1,147 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from .models import WebhookState, WebhookStatus
+from .store import WebhookStore
+
+
+_TERMINAL = (WebhookStatus.COMPLETE, WebhookStatus.FAILED)
+
+
+class CachingStore:
+    """
+    Bounded local cache of terminal states in front of a WebhookStore.
+
+    Safe because terminal states are immutable by contract: once a
+    webhook is COMPLETE or FAILED, every later read returns the same
+    state. Non-terminal states are never cached.
+
+    Eviction:
+    - LRU once max_entries is reached
+    - Entries older than ttl_seconds are treated as misses
+
+    begin() and get_states() are served from the cache when the wrapped
+    store supports them, and peek_terminal() reads the cache alone (see
+    SupportsPeekTerminal); every other method is forwarded unchanged.
+    """
+
+    def __init__(
+        self,
+        store: WebhookStore,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self._store = store
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, WebhookState]]" = OrderedDict()
+        self._mutex = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Only advertise optional capabilities the wrapped store has
+        if hasattr(store, "begin"):
+            self.begin = self._begin
+        if hasattr(store, "get_states"):
+            self.get_states = self._get_states
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "_store":
+            raise AttributeError(name)
+        return getattr(self._store, name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        now = self._clock()
+        state = self._lookup(webhook_id, now)
+        if state is not None:
+            return state
+
+        state = self._store.get_state(webhook_id)
+        self._remember(state, now)
+        return state
+
+    def peek_terminal(self, webhook_id: str) -> Optional[WebhookState]:
+        # A miss is counted by the get_state()/begin() that follows
+        return self._lookup(webhook_id, self._clock(), count_miss=False)
+
+    def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        reserved, existing = self._store.reserve(webhook_id, timeout_seconds)
+        self._remember(existing, self._clock())
+        return reserved, existing
+
+    def mark_processing(self, webhook_id: str) -> None:
+        self._store.mark_processing(webhook_id)
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        self._store.mark_complete(webhook_id, result)
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        self._store.mark_failed(webhook_id, error)
+
+    def _begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        now = self._clock()
+        state = self._lookup(webhook_id, now)
+        if state is not None:
+            return False, state
+
+        begun, existing = self._store.begin(webhook_id, timeout_seconds, owner)
+        self._remember(existing, now)
+        return begun, existing
+
+    def _get_states(self, webhook_ids: Sequence[str]) -> Dict[str, WebhookState]:
+        now = self._clock()
+        states: Dict[str, WebhookState] = {}
+        missing: List[str] = []
+        for webhook_id in webhook_ids:
+            state = self._lookup(webhook_id, now)
+            if state is not None:
+                states[webhook_id] = state
+            else:
+                missing.append(webhook_id)
+
+        if missing:
+            fetched = self._store.get_states(missing)
+            for state in fetched.values():
+                self._remember(state, now)
+            states.update(fetched)
+        return states
+
+    def clear(self) -> None:
+        with self._mutex:
+            self._entries.clear()
+
+    def _lookup(self, webhook_id: str, now: float, count_miss: bool = True) -> Optional[WebhookState]:
+        with self._mutex:
+            entry = self._entries.get(webhook_id)
+            if entry is not None:
+                cached_at, state = entry
+                if now - cached_at < self._ttl:
+                    self._entries.move_to_end(webhook_id)
+                    self.hits += 1
+                    return state
+                del self._entries[webhook_id]
+            if count_miss:
+                self.misses += 1
+        return None
+
+    def _remember(self, state: Optional[WebhookState], now: float) -> None:
+        if state is None or state.status not in _TERMINAL:
+            return
+
+        with self._mutex:
+            self._entries[state.webhook_id] = (now, state)
+            self._entries.move_to_end(state.webhook_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
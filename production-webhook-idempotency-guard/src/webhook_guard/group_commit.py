@@ -0,0 +1,94 @@
+from typing import Callable, Generic, List, Optional, TypeVar
+import threading
+import time
+
+
+T = TypeVar("T")
+
+
+class _Batch(Generic[T]):
+    __slots__ = ("items", "errors", "done")
+
+    def __init__(self):
+        self.items: List[T] = []
+        self.errors: List[Optional[BaseException]] = []
+        self.done = threading.Event()
+
+
+class GroupCommitWriter(Generic[T]):
+    """
+    Group commit for durable terminal-state writes.
+
+    Concurrent callers of submit() are collected into one batch for up to
+    window_seconds (or until max_batch items), then committed with a
+    single commit() call, i.e. one transaction and one fsync. Each caller
+    blocks only until its own batch is durable.
+
+    Protocol:
+    - The first caller of a batch is its leader: it waits out the
+      window, seals the batch and runs commit()
+    - Followers append and wait for the leader
+    - Commits are serialized, so the next batch keeps filling while the
+      previous one is being made durable
+
+    commit(items) must return one entry per item: None on success or the
+    exception to raise in that item's caller. If commit() itself raises,
+    every caller in the batch gets that exception.
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[List[T]], List[Optional[BaseException]]],
+        window_seconds: float = 0.002,
+        max_batch: int = 64,
+    ):
+        if window_seconds < 0:
+            raise ValueError("window_seconds must not be negative")
+        if max_batch <= 0:
+            raise ValueError("max_batch must be positive")
+
+        self._commit = commit
+        self._window = window_seconds
+        self._max_batch = max_batch
+        self._cond = threading.Condition()
+        self._commit_mutex = threading.Lock()
+        self._open: Optional[_Batch[T]] = None
+
+    def submit(self, item: T) -> None:
+        """Add item to the current batch and block until it is durable."""
+        with self._cond:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+
+            index = len(batch.items)
+            batch.items.append(item)
+
+            if len(batch.items) >= self._max_batch:
+                self._open = None
+                self._cond.notify_all()
+
+            if leader:
+                deadline = time.monotonic() + self._window
+                while self._open is batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._open is batch:
+                    self._open = None
+
+        if leader:
+            with self._commit_mutex:
+                try:
+                    batch.errors = self._commit(batch.items)
+                except BaseException as exc:
+                    batch.errors = [exc] * len(batch.items)
+            batch.done.set()
+        else:
+            batch.done.wait()
+
+        error = batch.errors[index]
+        if error is not None:
+            raise error
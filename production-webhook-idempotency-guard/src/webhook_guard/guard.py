@@ -1,10 +1,37 @@
-from typing import Callable, Any, Optional
+from typing import Callable, Any, Optional, Dict, Iterable, List, Tuple
 from datetime import datetime
+import threading
 import time
+import uuid
 
 from .models import ProcessingResult, WebhookStatus
 from .store import WebhookStore
 from .lock import DistributedLock
+from .notify import CompletionNotifier
+from .bloom import RotatingBloomFilter
+from .wait import FixedWait, WaitStrategy
+
+
+_IN_FLIGHT_ERROR = "Webhook is currently being processed"
+
+_BULK_METHODS = (
+    "get_states",
+    "reserve_many",
+    "mark_processing_many",
+    "mark_complete_many",
+    "mark_failed_many",
+)
+
+
+class _Flight:
+    """In-process single-flight slot: one leader, any number of followers."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[ProcessingResult] = None
+        self.error: Optional[BaseException] = None
 
 
 class WebhookGuard:
@@ -21,17 +48,50 @@ class WebhookGuard:
     - Retry handlers
     - Roll back external side effects
     - Enforce cross-webhook ordering
+
+    Lockless mode (lock=None): the store alone provides concurrency
+    control. Requires begin() and owner-checked transitions
+    (SupportsBegin, SupportsOwnedTransitions): begin() records an owner
+    token and lease, and the terminal write only lands while that token
+    still owns the record. Saves the lock round trip and dependency.
     """
 
     def __init__(
         self,
         store: WebhookStore,
-        lock: DistributedLock,
+        lock: Optional[DistributedLock] = None,
         default_timeout_seconds: int = 300,
+        wait_timeout_seconds: float = 1.0,
+        notifier: Optional[CompletionNotifier] = None,
+        coalesce: bool = True,
+        seen_filter: Optional[RotatingBloomFilter] = None,
+        wait_strategy: Optional[WaitStrategy] = None,
     ):
         self._store = store
         self._lock = lock
         self._default_timeout = default_timeout_seconds
+        self._notifier = notifier if notifier is not None else CompletionNotifier()
+        # Optional store capability (see SupportsBegin)
+        self._begin = getattr(store, "begin", None)
+        # Optional store capability (see SupportsOwnedTransitions)
+        self._complete_owned = getattr(store, "mark_complete_owned", None)
+        self._fail_owned = getattr(store, "mark_failed_owned", None)
+        # Optional store capability (see SupportsPeekTerminal)
+        self._peek = getattr(store, "peek_terminal", None)
+        if lock is None and (self._begin is None or self._complete_owned is None or self._fail_owned is None):
+            raise ValueError("lock=None requires a store with begin() and owner-checked transitions")
+        # The bulk path reserves then locks; lockless batches go per id
+        self._bulk = lock is not None and all(hasattr(store, name) for name in _BULK_METHODS)
+        # Optional lock capability: one round trip for a batch of keys
+        self._lock_many = getattr(lock, "try_lock_many", None)
+        self._coalesce = coalesce
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_mutex = threading.Lock()
+        self._seen = seen_filter
+        # How contended deliveries wait (see WaitStrategy); by default one
+        # wait of wait_timeout_seconds
+        self._wait = wait_strategy if wait_strategy is not None else FixedWait(wait_timeout_seconds)
+        self._observe = getattr(self._wait, "observe", None)
 
     def process(
         self,
@@ -50,60 +110,140 @@ class WebhookGuard:
         5. Execute handler
         6. Mark COMPLETE or FAILED
         7. Release lock
+
+        Stores that implement begin() collapse steps 1, 2 and 4 into a
+        single round trip performed after step 3: begin() may take over
+        an expired lease, which is only safe while holding the lock.
+        Step 1 still runs before the lock, but only against terminal
+        states held locally (SupportsPeekTerminal) or, with a
+        seen_filter, ids this node may have seen: retries of finished
+        webhooks skip the lock, first deliveries pay lock + begin().
+        Without begin(), a seen_filter skips step 1 for ids this node
+        has never seen.
+
+        After begin(), step 6 is owner-checked when the store supports it,
+        so a worker whose lease was taken over cannot overwrite the new
+        owner's result. In lockless mode steps 3 and 7 are skipped.
+
+        With coalesce=True, concurrent calls for the same webhook_id in
+        this process are single-flighted: only the first runs the
+        algorithm, the rest share its result (cached=True) with no I/O.
+        Followers wait as long as the wait strategy allows, then return
+        "currently being processed" like any other contended delivery.
         """
 
+        if not self._coalesce:
+            return self._process(webhook_id, handler, timeout_seconds)
+
+        with self._flights_mutex:
+            flight = self._flights.get(webhook_id)
+            leader = flight is None
+            if leader:
+                flight = self._flights[webhook_id] = _Flight()
+
+        if not leader:
+            start_time = datetime.utcnow()
+            for delay in self._wait.delays():
+                if flight.done.wait(delay):
+                    break
+            if not flight.done.is_set():
+                # Leader still running past the wait deadline
+                return self._in_flight_result(start_time)
+            if flight.error is not None:
+                raise flight.error
+            if flight.result.error == _IN_FLIGHT_ERROR and not flight.result.cached:
+                # The leader was itself contended: nothing to share
+                return self._in_flight_result(start_time)
+            return flight.result._copy(duration_ms=self._duration_ms(start_time), cached=True)
+
+        try:
+            flight.result = self._process(webhook_id, handler, timeout_seconds)
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._flights_mutex:
+                del self._flights[webhook_id]
+            flight.done.set()
+
+    def _process(
+        self,
+        webhook_id: str,
+        handler: Callable[[], Any],
+        timeout_seconds: Optional[int],
+    ) -> ProcessingResult:
+
         timeout = timeout_seconds or self._default_timeout
         start_time = datetime.utcnow()
         lock_handle = None
+        owner = None
 
         try:
-            # 1. Fast-path duplicate check (retry handling)
-            state = self._store.get_state(webhook_id)
+            if self._begin is not None:
+                if self._lock is not None:
+                    # 1. Fast-path duplicate check without the lock
+                    cached = self._cached_result(self._peek_state(webhook_id), start_time)
+                    if cached is not None:
+                        return cached
 
-            if state is not None:
-                if state.status == WebhookStatus.COMPLETE:
-                    return self._cached_success(state, start_time)
+                    # 3. Acquire distributed lock first: a holder whose
+                    #    lease lapsed may still be running, and begin()
+                    #    would take its record over
+                    lock_handle = self._lock.try_lock(webhook_id, timeout)
+
+                    if lock_handle is None:
+                        return self._await_in_flight(webhook_id, start_time)
+
+                # 1+2+4. Reserve straight into PROCESSING (single round trip)
+                owner = uuid.uuid4().hex
+                begun, existing_state = self._begin(webhook_id, timeout, owner)
 
-                if state.status == WebhookStatus.FAILED:
-                    return self._cached_failure(state, start_time)
+                if self._seen is not None:
+                    self._seen.add(webhook_id)
 
-            # 2. Atomic reservation (race-safe)
-            reserved, existing_state = self._store.reserve(webhook_id, timeout)
+                if not begun:
+                    cached = self._cached_result(existing_state, start_time)
+                    if cached is not None:
+                        return cached
 
-            if not reserved and existing_state is not None:
-                if existing_state.status == WebhookStatus.COMPLETE:
-                    return self._cached_success(existing_state, start_time)
+                    # Live reservation owned by another worker
+                    self._release(lock_handle)
+                    lock_handle = None
+                    return self._await_in_flight(webhook_id, start_time)
 
-                if existing_state.status == WebhookStatus.FAILED:
-                    return self._cached_failure(existing_state, start_time)
+            else:
+                # 1. Fast-path duplicate check (retry handling),
+                #    skipped for ids this node has definitely never seen
+                if self._seen is None or webhook_id in self._seen:
+                    state = self._store.get_state(webhook_id)
+
+                    cached = self._cached_result(state, start_time)
+                    if cached is not None:
+                        return cached
 
-            # 3. Acquire distributed lock (concurrency control)
-            lock_handle = self._lock.try_lock(webhook_id, timeout)
+                # 2. Atomic reservation (race-safe)
+                reserved, existing_state = self._store.reserve(webhook_id, timeout)
 
-            if lock_handle is None:
-                # Another worker is processing — wait briefly and re-check
-                time.sleep(1)
+                if self._seen is not None:
+                    self._seen.add(webhook_id)
 
-                final_state = self._store.get_state(webhook_id)
-                if final_state is not None:
-                    if final_state.status == WebhookStatus.COMPLETE:
-                        return self._cached_success(final_state, start_time)
+                if not reserved:
+                    cached = self._cached_result(existing_state, start_time)
+                    if cached is not None:
+                        return cached
 
-                    if final_state.status == WebhookStatus.FAILED:
-                        return self._cached_failure(final_state, start_time)
+                # 3. Acquire distributed lock (concurrency control)
+                lock_handle = self._lock.try_lock(webhook_id, timeout)
 
-                return ProcessingResult(
-                    success=False,
-                    output=None,
-                    error="Webhook is currently being processed",
-                    duration_ms=self._duration_ms(start_time),
-                    cached=False,
-                )
+                if lock_handle is None:
+                    return self._await_in_flight(webhook_id, start_time)
 
-            # 4. Mark PROCESSING (CRASH SAFETY BOUNDARY)
-            self._store.mark_processing(webhook_id)
+                # 4. Mark PROCESSING (CRASH SAFETY BOUNDARY)
+                self._store.mark_processing(webhook_id)
 
             # 5. Execute handler (side effects happen here)
+            started = time.perf_counter()
             try:
                 output = handler()
                 handler_success = True
@@ -112,13 +252,22 @@ class WebhookGuard:
                 output = None
                 handler_success = False
                 handler_error = str(exc)
+            if self._observe is not None:
+                self._observe(time.perf_counter() - started)
 
-            # 6. Persist terminal state
-            if handler_success:
+            # 6. Persist terminal state (owner-checked after begin)
+            if owner is not None and self._complete_owned is not None and self._fail_owned is not None:
+                if handler_success:
+                    self._complete_owned(webhook_id, owner, output)
+                else:
+                    self._fail_owned(webhook_id, owner, handler_error)
+            elif handler_success:
                 self._store.mark_complete(webhook_id, output)
             else:
                 self._store.mark_failed(webhook_id, handler_error)
 
+            self._signal_terminal(webhook_id)
+
             return ProcessingResult(
                 success=handler_success,
                 output=output,
@@ -129,15 +278,198 @@ class WebhookGuard:
 
         finally:
             # 7. Always release lock
-            if lock_handle is not None:
-                try:
-                    lock_handle.release()
-                except Exception:
-                    # Lock auto-released on connection close or timeout
-                    pass
+            self._release(lock_handle)
+
+    def process_many(
+        self,
+        items: Iterable[Tuple[str, Callable[[], Any]]],
+        timeout_seconds: Optional[int] = None,
+    ) -> List[ProcessingResult]:
+        """
+        Process a batch of (webhook_id, handler) pairs exactly once each.
+
+        Same algorithm as process(), but each store step is one bulk call
+        for the whole batch (see SupportsBulk). Locks are still per id,
+        acquired in one call when the lock implements try_lock_many().
+
+        Returns per-item results in input order. Repeated ids within the
+        batch run once; later occurrences get the first one's result as
+        cached. Ids already reserved by another worker fall back to
+        process() individually, as does the whole batch in lockless mode.
+        """
+
+        items = list(items)
+        if not self._bulk:
+            return [self.process(webhook_id, handler, timeout_seconds) for webhook_id, handler in items]
+
+        timeout = timeout_seconds or self._default_timeout
+        start_time = datetime.utcnow()
+        results: List[Optional[ProcessingResult]] = [None] * len(items)
+
+        first: Dict[str, int] = {}
+        for index, (webhook_id, _) in enumerate(items):
+            first.setdefault(webhook_id, index)
+
+        # 1. Bulk fast-path duplicate check (ids never seen here skip it)
+        maybe_seen = [
+            webhook_id for webhook_id in first
+            if self._seen is None or webhook_id in self._seen
+        ]
+        states = self._store.get_states(maybe_seen) if maybe_seen else {}
+        to_reserve: List[str] = []
+        for webhook_id, index in first.items():
+            results[index] = self._cached_result(states.get(webhook_id), start_time)
+            if results[index] is None:
+                to_reserve.append(webhook_id)
+
+        # 2. Bulk atomic reservation
+        reserved_ids: List[str] = []
+        in_flight: List[str] = []
+        outcomes = self._store.reserve_many(to_reserve, timeout) if to_reserve else []
+        if self._seen is not None:
+            for webhook_id in to_reserve:
+                self._seen.add(webhook_id)
+
+        for webhook_id, (reserved, existing_state) in zip(to_reserve, outcomes):
+            if reserved:
+                reserved_ids.append(webhook_id)
+                continue
+
+            results[first[webhook_id]] = self._cached_result(existing_state, start_time)
+            if results[first[webhook_id]] is None:
+                in_flight.append(webhook_id)
+
+        handles = {}
+        contended: List[str] = []
+        try:
+            # 3. Acquire distributed locks (one round trip with try_lock_many)
+            if self._lock_many is not None:
+                acquired = zip(reserved_ids, self._lock_many(reserved_ids, timeout))
+            else:
+                acquired = ((webhook_id, self._lock.try_lock(webhook_id, timeout)) for webhook_id in reserved_ids)
+
+            for webhook_id, lock_handle in acquired:
+                if lock_handle is None:
+                    contended.append(webhook_id)
+                else:
+                    handles[webhook_id] = lock_handle
+
+            if handles:
+                # 4. Bulk mark PROCESSING (CRASH SAFETY BOUNDARY)
+                self._store.mark_processing_many(list(handles))
+
+                # 5. Execute handlers
+                completed: Dict[str, Any] = {}
+                failed: Dict[str, str] = {}
+                for webhook_id in handles:
+                    started = time.perf_counter()
+                    try:
+                        completed[webhook_id] = items[first[webhook_id]][1]()
+                    except Exception as exc:
+                        failed[webhook_id] = str(exc)
+                    if self._observe is not None:
+                        self._observe(time.perf_counter() - started)
+
+                # 6. Bulk persist terminal states
+                if completed:
+                    self._store.mark_complete_many(completed)
+                if failed:
+                    self._store.mark_failed_many(failed)
+
+                for webhook_id in handles:
+                    self._signal_terminal(webhook_id)
+                    results[first[webhook_id]] = ProcessingResult(
+                        success=webhook_id in completed,
+                        output=completed.get(webhook_id),
+                        error=failed.get(webhook_id),
+                        duration_ms=self._duration_ms(start_time),
+                        cached=False,
+                    )
+
+        finally:
+            # 7. Always release locks
+            for lock_handle in handles.values():
+                self._release(lock_handle)
+
+        for webhook_id in contended:
+            results[first[webhook_id]] = self._await_in_flight(webhook_id, start_time)
+
+        for webhook_id in in_flight:
+            results[first[webhook_id]] = self.process(webhook_id, items[first[webhook_id]][1], timeout)
+
+        for index, (webhook_id, _) in enumerate(items):
+            if results[index] is None:
+                results[index] = results[first[webhook_id]]._copy(cached=True)
+
+        return results
 
     # ---------- helpers ----------
 
+    def _await_in_flight(self, webhook_id: str, start_time: datetime) -> ProcessingResult:
+        # Another worker is processing — wait for its terminal state,
+        # re-reading the store before each wait
+        for delay in self._wait.delays():
+            final_state = self._notifier.wait(
+                webhook_id,
+                delay,
+                lambda: self._store.get_state(webhook_id),
+            )
+            if final_state is not None:
+                break
+        else:
+            # Deadline passed (or holder is in another process)
+            final_state = self._store.get_state(webhook_id)
+
+        cached = self._cached_result(final_state, start_time)
+        if cached is not None:
+            return cached
+
+        return self._in_flight_result(start_time)
+
+    def _in_flight_result(self, start_time: datetime) -> ProcessingResult:
+        return ProcessingResult(
+            success=False,
+            output=None,
+            error=_IN_FLIGHT_ERROR,
+            duration_ms=self._duration_ms(start_time),
+            cached=False,
+        )
+
+    def _peek_state(self, webhook_id: str):
+        # Terminal state known locally, else a store read only for ids a
+        # seen_filter reports as possibly seen
+        if self._peek is not None:
+            state = self._peek(webhook_id)
+            if state is not None:
+                return state
+        if self._seen is not None and webhook_id in self._seen:
+            return self._store.get_state(webhook_id)
+        return None
+
+    @staticmethod
+    def _release(lock_handle) -> None:
+        if lock_handle is not None:
+            try:
+                lock_handle.release()
+            except Exception:
+                # Lock auto-released on connection close or timeout
+                pass
+
+    def _signal_terminal(self, webhook_id: str) -> None:
+        # Extra read only when a same-process duplicate is actually waiting
+        if self._notifier.has_waiters(webhook_id):
+            self._notifier.publish(webhook_id, self._store.get_state(webhook_id))
+
+    def _cached_result(self, state, start_time: datetime) -> Optional[ProcessingResult]:
+        if state is not None:
+            if state.status == WebhookStatus.COMPLETE:
+                return self._cached_success(state, start_time)
+
+            if state.status == WebhookStatus.FAILED:
+                return self._cached_failure(state, start_time)
+
+        return None
+
     def _cached_success(self, state, start_time: datetime) -> ProcessingResult:
         return ProcessingResult(
             success=True,
@@ -0,0 +1,252 @@
+from typing import Dict, List, Optional, Tuple
+import fcntl
+import hashlib
+import heapq
+import os
+import threading
+import time
+import weakref
+
+
+_STRIPES = 64
+
+# Byte-range locks may lie far beyond EOF: the lock file stays empty
+_OFFSET_SPACE = 1 << 62
+
+
+class _Lease:
+    """Handle for a key held in StripedThreadLock."""
+
+    __slots__ = ("_lock", "_key")
+
+    def __init__(self, lock: "StripedThreadLock", key: str):
+        self._lock = lock
+        self._key = key
+
+    def release(self) -> None:
+        self._lock._release(self._key, self)
+
+
+class StripedThreadLock:
+    """
+    DistributedLock for threaded workers in a single process.
+
+    Guarantees:
+    - Exactly one holder per key (exact keys, no hash sharing)
+    - Non-blocking acquisition
+    - A lease expires after timeout_seconds and the key can be taken
+      over; release() by the previous holder is then a no-op
+    - Released with the process (nothing outlives it)
+
+    Performance:
+    - Keys are partitioned across `stripes` mutexes, so workers on
+      different keys rarely contend
+    - Only held keys take memory: release() drops the entry
+
+    Not shared between processes; see FileRangeLock for pre-forked
+    workers.
+    """
+
+    def __init__(self, stripes: int = _STRIPES):
+        if stripes <= 0:
+            raise ValueError("stripes must be positive")
+
+        self._stripes: List[Tuple[threading.Lock, Dict[str, Tuple[_Lease, float]]]] = [
+            (threading.Lock(), {}) for _ in range(stripes)
+        ]
+        _FORK_RESET.add(self)
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[_Lease]:
+        mutex, held = self._stripes[hash(key) % len(self._stripes)]
+        now = time.monotonic()
+        with mutex:
+            current = held.get(key)
+            if current is not None and current[1] > now:
+                return None
+            lease = _Lease(self, key)
+            held[key] = (lease, now + timeout_seconds)
+            return lease
+
+    def _release(self, key: str, lease: _Lease) -> None:
+        mutex, held = self._stripes[hash(key) % len(self._stripes)]
+        with mutex:
+            current = held.get(key)
+            if current is not None and current[0] is lease:
+                del held[key]
+
+    def _after_fork(self) -> None:
+        # Holders are the parent's threads, which do not exist here
+        self._stripes = [(threading.Lock(), {}) for _ in range(len(self._stripes))]
+
+
+class _RangeHandle:
+    """Handle for a key held in FileRangeLock."""
+
+    __slots__ = ("_lock", "_key")
+
+    def __init__(self, lock: "FileRangeLock", key: str):
+        self._lock = lock
+        self._key = key
+
+    def release(self) -> None:
+        self._lock._release(self._key, self)
+
+
+class FileRangeLock:
+    """
+    DistributedLock for multi-process workers on one host.
+
+    Each key hashes (blake2b) to one byte offset of a shared lock file
+    and is held as an fcntl byte-range lock on that byte.
+
+    Guarantees:
+    - One holder per key across every process using the same path
+    - Non-blocking acquisition
+    - A lease expires after timeout_seconds: its byte is unlocked so
+      other processes can take the key, and release() by the previous
+      holder is then a no-op
+    - The kernel drops a process's locks when it exits or crashes
+
+    Byte-range locks belong to the process, not the thread, so holders
+    within a process are tracked here: an exact key table (one holder
+    per key) and a reference count per offset. Two keys that hash to
+    the same offset only contend across processes (false contention,
+    never shared ownership).
+
+    Performance:
+    - One non-blocking fcntl call per acquire and per release; the file
+      never grows (offsets may lie past EOF)
+    - Only held keys take memory
+    - Expiry runs on one background thread per lock, started on acquire
+      and stopped once no key is held; it sleeps until the earliest
+      deadline (min-heap, stale entries dropped lazily)
+
+    Caveats:
+    - POSIX drops every lock a process holds on a file when it closes
+      ANY descriptor for that file: do not open the lock file elsewhere
+      in the process
+    - Locks are not inherited across fork(); create the lock before
+      forking, with no key held
+    - Not valid across hosts; NFS byte-range locking is not reliable
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._mutex = threading.Lock()
+        self._expiry = threading.Condition(self._mutex)
+        self._keys: Dict[str, Tuple[_RangeHandle, int, float]] = {}
+        self._refs: Dict[int, int] = {}
+        self._deadlines: List[Tuple[float, str]] = []
+        self._sweeper: Optional[threading.Thread] = None
+        _FORK_RESET.add(self)
+
+    def close(self) -> None:
+        """Close the lock file, releasing every lock this process holds."""
+        with self._mutex:
+            self._keys.clear()
+            self._refs.clear()
+            self._deadlines.clear()
+            self._expiry.notify()
+            os.close(self._fd)
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[_RangeHandle]:
+        offset = _offset(key)
+        now = time.monotonic()
+        with self._mutex:
+            current = self._keys.get(key)
+            if current is not None:
+                if current[2] > now:
+                    return None
+                # Expired but not swept yet: take over, the byte stays locked
+                refs = self._refs[offset] - 1
+            else:
+                refs = self._refs.get(offset, 0)
+                if refs == 0:
+                    try:
+                        fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset)
+                    except OSError:
+                        # Held by another process
+                        return None
+
+            handle = _RangeHandle(self, key)
+            deadline = now + timeout_seconds
+            self._keys[key] = (handle, offset, deadline)
+            self._refs[offset] = refs + 1
+            self._schedule(key, deadline)
+            return handle
+
+    def _release(self, key: str, handle: _RangeHandle) -> None:
+        with self._mutex:
+            current = self._keys.get(key)
+            if current is not None and current[0] is handle:
+                self._drop(key, current[1])
+                if not self._keys:
+                    # Let the sweeper stop now rather than at its deadline
+                    self._expiry.notify()
+
+    # ---------- expiry (caller holds self._mutex) ----------
+
+    def _drop(self, key: str, offset: int) -> None:
+        del self._keys[key]
+        refs = self._refs.pop(offset) - 1
+        if refs:
+            self._refs[offset] = refs
+        else:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, offset)
+
+    def _schedule(self, key: str, deadline: float) -> None:
+        if len(self._deadlines) > 2 * len(self._keys) + 64:
+            # Mostly released keys: rebuild from the live ones
+            self._deadlines = [(entry[2], held) for held, entry in self._keys.items()]
+            heapq.heapify(self._deadlines)
+        heapq.heappush(self._deadlines, (deadline, key))
+
+        if self._sweeper is None:
+            self._sweeper = threading.Thread(target=self._sweep, name="file-range-lock-expiry", daemon=True)
+            self._sweeper.start()
+        elif self._deadlines[0][0] == deadline:
+            self._expiry.notify()
+
+    def _sweep(self) -> None:
+        with self._mutex:
+            while self._keys:
+                now = time.monotonic()
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    _, key = heapq.heappop(self._deadlines)
+                    current = self._keys.get(key)
+                    if current is not None and current[2] <= now:
+                        self._drop(key, current[1])
+                if not self._keys:
+                    break
+                self._expiry.wait(self._deadlines[0][0] - now if self._deadlines else None)
+            self._deadlines.clear()
+            self._sweeper = None
+
+    def _after_fork(self) -> None:
+        # The child holds no byte-range locks, whatever the parent held,
+        # and the parent's sweeper thread does not exist here
+        self._mutex = threading.Lock()
+        self._expiry = threading.Condition(self._mutex)
+        self._keys = {}
+        self._refs = {}
+        self._deadlines = []
+        self._sweeper = None
+
+
+def _offset(key: str) -> int:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % _OFFSET_SPACE
+
+
+# Instances whose in-process state is reset in a forked child, by one
+# hook for the module rather than one per instance
+_FORK_RESET: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _after_fork() -> None:
+    for lock in list(_FORK_RESET):
+        lock._after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork)
@@ -30,3 +30,30 @@ class DistributedLock(Protocol):
         Must NOT block indefinitely.
         """
         ...
+
+
+class AsyncLockHandle(Protocol):
+    """Handle representing an acquired distributed lock (asyncio)."""
+
+    async def release(self) -> None:
+        """Release the lock."""
+        ...
+
+
+class AsyncDistributedLock(Protocol):
+    """
+    Asyncio variant of DistributedLock.
+
+    Same guarantees as DistributedLock; acquisition is a coroutine and
+    must NOT wait for the lock to become free.
+    """
+
+    async def try_lock(self, key: str, timeout_seconds: int) -> Optional[AsyncLockHandle]:
+        """
+        Attempt to acquire a lock for the given key.
+
+        Returns:
+            AsyncLockHandle if acquired successfully
+            None if lock is already held by another process
+        """
+        ...
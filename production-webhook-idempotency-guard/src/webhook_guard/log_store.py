@@ -0,0 +1,553 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from .models import CompactRecord, STATUS_CODES, WebhookState, WebhookStatus
+from .serialization import ResultSerializer
+
+
+_PENDING = STATUS_CODES[WebhookStatus.PENDING]
+_PROCESSING = STATUS_CODES[WebhookStatus.PROCESSING]
+_COMPLETE = STATUS_CODES[WebhookStatus.COMPLETE]
+_FAILED = STATUS_CODES[WebhookStatus.FAILED]
+_STATUS_BY_CODE = {code: status for status, code in STATUS_CODES.items()}
+
+# Record framing: payload length, crc32(payload), payload
+_HEADER = struct.Struct("<II")
+
+_SEGMENT_SUFFIX = ".log"
+_CHECKPOINT = "index.checkpoint"
+
+# Index entry: (segment sequence, record offset, record length incl. header)
+_Location = Tuple[int, int, int]
+
+
+class LogStructuredStore:
+    """
+    Append-only, log-structured WebhookStore on local files.
+
+    Layout:
+    - Every transition appends the webhook's full latest state as a
+      length-prefixed, crc32-checksummed record to the active segment
+    - Segments roll over at segment_max_bytes
+    - An in-memory index maps webhook_id -> latest record location
+
+    Durability:
+    - fsync=True: each call returns after its record is on disk
+      (bulk calls append every record, then fsync once)
+    - A torn record at the tail of the last segment is truncated on open
+
+    Recovery:
+    - Opening the directory rebuilds the index by scanning segments in
+      order, starting from the last checkpoint() if one is valid
+
+    Compaction:
+    - compact() rewrites sealed segments keeping only records the index
+      still points to; segments keep their sequence number, so replay
+      order is preserved
+    - Sealed segments are never written to, so the rewrite is built
+      without holding the store's lock; it is taken only to install the
+      new segment and re-point the index, skipping records superseded
+      in the meantime
+    - With compaction_interval_seconds a background thread runs it
+
+    Records are encoded by serializer (pickle unless configured
+    otherwise; see ResultSerializer); the checkpoint is always pickled.
+    Single process only: only open directories you trust.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        fsync: bool = True,
+        compaction_interval_seconds: Optional[float] = None,
+        compaction_min_garbage_ratio: float = 0.5,
+        serializer: Optional[ResultSerializer] = None,
+    ):
+        if segment_max_bytes <= _HEADER.size:
+            raise ValueError("segment_max_bytes is too small")
+
+        self._directory = directory
+        self._segment_max_bytes = segment_max_bytes
+        self._fsync = fsync
+        self._min_garbage_ratio = compaction_min_garbage_ratio
+        self._serializer = serializer if serializer is not None else ResultSerializer()
+        self._mutex = threading.RLock()
+        self._compact_mutex = threading.Lock()
+
+        self._index: Dict[str, _Location] = {}
+        self._fds: Dict[int, int] = {}
+        self._sizes: Dict[int, int] = {}
+        self._garbage: Dict[int, int] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        if compaction_interval_seconds is not None:
+            self._compactor = threading.Thread(
+                target=self._compact_loop,
+                args=(compaction_interval_seconds,),
+                name="webhook-log-compactor",
+                daemon=True,
+            )
+            self._compactor.start()
+
+    # ---------- WebhookStore ----------
+
+    def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        with self._mutex:
+            record = self._read(webhook_id)
+        return record.to_state(webhook_id) if record is not None else None
+
+    def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        """
+        Atomic reservation semantics.
+
+        Returns:
+            (True, None) if newly reserved
+            (False, existing_state) if already exists
+        """
+        with self._mutex:
+            outcome, pending = self._reserve(webhook_id, timeout_seconds)
+            self._append(pending)
+        return outcome
+
+    def begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        """Single-append reservation into PROCESSING (see SupportsBegin)."""
+        with self._mutex:
+            existing = self._read(webhook_id)
+            now = time.time_ns()
+
+            if existing is not None:
+                if existing.is_terminal:
+                    return False, existing.to_state(webhook_id)
+
+                if existing.reserved_until_ns is not None and existing.reserved_until_ns > now:
+                    return False, existing.to_state(webhook_id)
+
+            self._append([(webhook_id, CompactRecord(
+                status_code=_PROCESSING,
+                reserved_until_ns=now + timeout_seconds * 1_000_000_000,
+                result=None,
+                error=None,
+                created_ns=existing.created_ns if existing is not None else now,
+                updated_ns=now,
+                owner=owner,
+            ))])
+        return True, None
+
+    def mark_processing(self, webhook_id: str) -> None:
+        with self._mutex:
+            self._append([self._transition(webhook_id, _PROCESSING, None, None)])
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        with self._mutex:
+            self._append([self._transition(webhook_id, _COMPLETE, result, None)])
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        with self._mutex:
+            self._append([self._transition(webhook_id, _FAILED, None, error)])
+
+    # ---------- owner-checked transitions (see SupportsOwnedTransitions) ----------
+
+    def mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        with self._mutex:
+            self._append([self._transition(webhook_id, _COMPLETE, result, None, owner)])
+
+    def mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        with self._mutex:
+            self._append([self._transition(webhook_id, _FAILED, None, error, owner)])
+
+    # ---------- bulk operations (see SupportsBulk) ----------
+
+    def get_states(self, webhook_ids: Sequence[str]) -> Dict[str, WebhookState]:
+        states: Dict[str, WebhookState] = {}
+        with self._mutex:
+            for webhook_id in webhook_ids:
+                record = self._read(webhook_id)
+                if record is not None:
+                    states[webhook_id] = record.to_state(webhook_id)
+        return states
+
+    def reserve_many(
+        self, webhook_ids: Sequence[str], timeout_seconds: int
+    ) -> List[Tuple[bool, Optional[WebhookState]]]:
+        outcomes: List[Tuple[bool, Optional[WebhookState]]] = []
+        pending: List[Tuple[str, CompactRecord]] = []
+        with self._mutex:
+            reserved = set()
+            for webhook_id in webhook_ids:
+                if webhook_id in reserved:
+                    outcomes.append((False, self._pending_state(webhook_id, pending)))
+                    continue
+                outcome, records = self._reserve(webhook_id, timeout_seconds)
+                outcomes.append(outcome)
+                if records:
+                    reserved.add(webhook_id)
+                pending.extend(records)
+            self._append(pending)
+        return outcomes
+
+    def mark_processing_many(self, webhook_ids: Sequence[str]) -> None:
+        with self._mutex:
+            self._append([
+                self._transition(webhook_id, _PROCESSING, None, None)
+                for webhook_id in webhook_ids
+            ])
+
+    def mark_complete_many(self, results: Mapping[str, Any]) -> None:
+        with self._mutex:
+            self._append([
+                self._transition(webhook_id, _COMPLETE, result, None)
+                for webhook_id, result in results.items()
+            ])
+
+    def mark_failed_many(self, errors: Mapping[str, str]) -> None:
+        with self._mutex:
+            self._append([
+                self._transition(webhook_id, _FAILED, None, error)
+                for webhook_id, error in errors.items()
+            ])
+
+    # ---------- maintenance ----------
+
+    def checkpoint(self) -> None:
+        """Persist the index so the next open only scans newer records."""
+        with self._mutex:
+            self._sync_active()
+            payload = pickle.dumps(
+                {
+                    "index": self._index,
+                    "sizes": self._sizes,
+                    "garbage": self._garbage,
+                },
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            path = os.path.join(self._directory, _CHECKPOINT)
+            self._write_file_atomic(path, _HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+
+    def compact(self) -> int:
+        """
+        Rewrite sealed segments whose garbage ratio is above the threshold.
+
+        Returns:
+            Number of bytes reclaimed
+        """
+        reclaimed = 0
+        with self._compact_mutex:
+            with self._mutex:
+                sealed = [seq for seq in sorted(self._sizes) if seq != self._active]
+            for seq in sealed:
+                with self._mutex:
+                    size = self._sizes.get(seq)
+                    if not size or self._garbage.get(seq, 0) / size < self._min_garbage_ratio:
+                        continue
+                reclaimed += self._compact_segment(seq)
+        return reclaimed
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._mutex:
+            self._sync_active()
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+    # ---------- transitions ----------
+
+    def _reserve(
+        self, webhook_id: str, timeout_seconds: int
+    ) -> Tuple[Tuple[bool, Optional[WebhookState]], List[Tuple[str, CompactRecord]]]:
+        existing = self._read(webhook_id)
+        if existing is not None:
+            return (False, existing.to_state(webhook_id)), []
+
+        now = time.time_ns()
+        return (True, None), [(webhook_id, CompactRecord(
+            status_code=_PENDING,
+            reserved_until_ns=now + timeout_seconds * 1_000_000_000,
+            result=None,
+            error=None,
+            created_ns=now,
+            updated_ns=now,
+        ))]
+
+    def _transition(
+        self, webhook_id: str, target: int, result: Any, error: Optional[str], owner: Optional[str] = None
+    ) -> Tuple[str, CompactRecord]:
+        expected = _PENDING if target == _PROCESSING else _PROCESSING
+        record = self._read(webhook_id)
+        if record is None:
+            raise ValueError(f"Webhook {webhook_id} does not exist")
+
+        if record.status_code != expected:
+            raise ValueError(
+                f"Webhook {webhook_id} is in {record.status} state, cannot mark {_STATUS_BY_CODE[target].value}"
+            )
+
+        if owner is not None and record.owner != owner:
+            raise ValueError(
+                f"Webhook {webhook_id} is owned by another worker, cannot mark {_STATUS_BY_CODE[target].value}"
+            )
+
+        return webhook_id, CompactRecord(
+            status_code=target,
+            reserved_until_ns=record.reserved_until_ns,
+            result=result,
+            error=error,
+            created_ns=record.created_ns,
+            updated_ns=time.time_ns(),
+            owner=record.owner,
+        )
+
+    @staticmethod
+    def _pending_state(webhook_id: str, pending: List[Tuple[str, CompactRecord]]) -> WebhookState:
+        for pending_id, record in reversed(pending):
+            if pending_id == webhook_id:
+                return record.to_state(webhook_id)
+        raise KeyError(webhook_id)
+
+    # ---------- segment I/O ----------
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self._directory, f"{seq:010d}{_SEGMENT_SUFFIX}")
+
+    def _read(self, webhook_id: str) -> Optional[CompactRecord]:
+        location = self._index.get(webhook_id)
+        if location is None:
+            return None
+
+        seq, offset, length = location
+        data = os.pread(self._fds[seq], length, offset)
+        return _decode(data[_HEADER.size:], self._serializer)[1]
+
+    def _append(self, records: List[Tuple[str, CompactRecord]]) -> None:
+        if not records:
+            return
+
+        for webhook_id, record in records:
+            if self._sizes[self._active] >= self._segment_max_bytes:
+                self._roll_over()
+
+            seq = self._active
+            frame = _frame(_encode(webhook_id, record, self._serializer))
+            offset = self._sizes[seq]
+            os.pwrite(self._fds[seq], frame, offset)
+            self._sizes[seq] = offset + len(frame)
+            self._relocate(webhook_id, (seq, offset, len(frame)))
+
+        if self._fsync:
+            os.fsync(self._fds[self._active])
+
+    def _relocate(self, webhook_id: str, location: _Location) -> None:
+        previous = self._index.get(webhook_id)
+        if previous is not None:
+            self._garbage[previous[0]] = self._garbage.get(previous[0], 0) + previous[2]
+        self._index[webhook_id] = location
+
+    def _roll_over(self) -> None:
+        self._sync_active()
+        self._open_segment(self._active + 1, create=True)
+        self._active += 1
+
+    def _sync_active(self) -> None:
+        if self._fsync and self._active in self._fds:
+            os.fsync(self._fds[self._active])
+
+    def _open_segment(self, seq: int, create: bool = False) -> None:
+        flags = os.O_RDWR | (os.O_CREAT if create else 0)
+        self._fds[seq] = os.open(self._segment_path(seq), flags, 0o644)
+        self._sizes.setdefault(seq, 0)
+        self._garbage.setdefault(seq, 0)
+
+    # ---------- recovery ----------
+
+    def _recover(self) -> None:
+        segments = sorted(
+            int(name[: -len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self._directory)
+            if name.endswith(_SEGMENT_SUFFIX) and name[: -len(_SEGMENT_SUFFIX)].isdigit()
+        )
+        for name in os.listdir(self._directory):
+            if name.endswith(".tmp"):
+                os.unlink(os.path.join(self._directory, name))
+
+        checkpoint = self._load_checkpoint(segments)
+        scan_from: Dict[int, int] = {}
+        if checkpoint is not None:
+            self._index = checkpoint["index"]
+            self._garbage = dict(checkpoint["garbage"])
+            scan_from = dict(checkpoint["sizes"])
+
+        for seq in segments:
+            self._open_segment(seq)
+            last = seq == segments[-1]
+            self._sizes[seq] = self._scan(seq, scan_from.get(seq, 0), last)
+
+        self._active = segments[-1] if segments else 0
+        if not segments:
+            self._open_segment(0, create=True)
+
+    def _load_checkpoint(self, segments: List[int]) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self._directory, _CHECKPOINT)
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            return None
+
+        if len(data) < _HEADER.size:
+            return None
+        length, crc = _HEADER.unpack_from(data)
+        payload = data[_HEADER.size:_HEADER.size + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            return None
+
+        checkpoint = pickle.loads(payload)
+        for seq, size in checkpoint["sizes"].items():
+            if seq not in segments or os.path.getsize(self._segment_path(seq)) < size:
+                return None
+        return checkpoint
+
+    def _scan(self, seq: int, offset: int, last: bool) -> int:
+        fd = self._fds[seq]
+        end = os.fstat(fd).st_size
+
+        while offset < end:
+            header = os.pread(fd, _HEADER.size, offset)
+            valid = len(header) == _HEADER.size
+            if valid:
+                length, crc = _HEADER.unpack(header)
+                payload = os.pread(fd, length, offset + _HEADER.size)
+                valid = len(payload) == length and zlib.crc32(payload) == crc
+
+            if not valid:
+                if not last:
+                    raise ValueError(f"Corrupt record in segment {seq} at offset {offset}")
+                # Torn write from a crash: drop the tail
+                os.ftruncate(fd, offset)
+                break
+
+            webhook_id, _ = _decode(payload, self._serializer)
+            self._relocate(webhook_id, (seq, offset, _HEADER.size + length))
+            offset += _HEADER.size + length
+
+        return offset
+
+    # ---------- compaction ----------
+
+    def _compact_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.compact()
+
+    def _compact_segment(self, seq: int) -> int:
+        # Called with _compact_mutex held, so seq's fd stays open
+        with self._mutex:
+            fd = self._fds[seq]
+            old_size = self._sizes[seq]
+            live = sorted(
+                (offset, length, webhook_id)
+                for webhook_id, (loc_seq, offset, length) in self._index.items()
+                if loc_seq == seq
+            )
+
+        # Sealed: nothing is appended to seq, so the copy needs no lock
+        frames = []
+        relocated: List[Tuple[str, _Location, _Location]] = []
+        new_offset = 0
+        for offset, length, webhook_id in live:
+            frames.append(os.pread(fd, length, offset))
+            relocated.append((webhook_id, (seq, offset, length), (seq, new_offset, length)))
+            new_offset += length
+        tmp = self._write_tmp(self._segment_path(seq), b"".join(frames)) if live else None
+
+        with self._mutex:
+            # Offsets are about to change: never leave a stale checkpoint behind
+            checkpoint = os.path.join(self._directory, _CHECKPOINT)
+            if os.path.exists(checkpoint):
+                os.unlink(checkpoint)
+
+            # Records superseded while copying stay behind as garbage
+            current = [
+                (webhook_id, location) for webhook_id, old, location in relocated
+                if self._index.get(webhook_id) == old
+            ]
+            os.close(fd)
+            if not current:
+                if tmp is not None:
+                    os.unlink(tmp)
+                os.unlink(self._segment_path(seq))
+                del self._fds[seq], self._sizes[seq], self._garbage[seq]
+                return old_size
+
+            self._install(tmp, self._segment_path(seq))
+            self._fds[seq] = os.open(self._segment_path(seq), os.O_RDWR)
+            for webhook_id, location in current:
+                self._index[webhook_id] = location
+            self._sizes[seq] = new_offset
+            self._garbage[seq] = new_offset - sum(location[2] for _, location in current)
+            return old_size - new_offset
+
+    def _write_file_atomic(self, path: str, data: bytes) -> None:
+        self._install(self._write_tmp(path, data), path)
+
+    def _write_tmp(self, path: str, data: bytes) -> str:
+        tmp = path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return tmp
+
+    def _install(self, tmp: str, path: str) -> None:
+        os.replace(tmp, path)
+        dir_fd = os.open(self._directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _encode(webhook_id: str, record: CompactRecord, serializer: ResultSerializer) -> bytes:
+    return serializer.dumps(
+        (
+            webhook_id,
+            record.status_code,
+            record.reserved_until_ns,
+            record.result,
+            record.error,
+            record.created_ns,
+            record.updated_ns,
+            record.owner,
+        )
+    )
+
+
+def _decode(payload: bytes, serializer: ResultSerializer) -> Tuple[str, CompactRecord]:
+    webhook_id, status_code, reserved_until_ns, result, error, created_ns, updated_ns, owner = serializer.loads(payload)
+    return webhook_id, CompactRecord(
+        status_code=status_code,
+        reserved_until_ns=reserved_until_ns,
+        result=result,
+        error=error,
+        created_ns=created_ns,
+        updated_ns=updated_ns,
+        owner=owner,
+    )
+
+
+def _frame(payload: bytes) -> bytes:
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 
 class WebhookStatus(str, Enum):
@@ -17,7 +18,7 @@ class WebhookStatus(str, Enum):
     FAILED = "FAILED"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WebhookState:
     """
     Immutable snapshot of webhook state.
@@ -26,6 +27,10 @@ class WebhookState:
     - Retry fast-path
     - Concurrency checks
     - Crash recovery decisions
+
+    owner is the token of the worker that began processing, when the
+    store records one (see SupportsBegin). result is a ResultRef when
+    the store keeps large results out of line.
     """
 
     webhook_id: str
@@ -35,15 +40,20 @@ class WebhookState:
     error: Optional[str]
     created_at: Any
     updated_at: Any
+    owner: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, repr=False)
 class ProcessingResult:
     """
     Result returned from WebhookGuard.process().
 
     cached=True indicates the result was returned from a previous execution
     (retry or concurrent request).
+
+    When the store handed back a ResultRef, output is resolved on first
+    read, so fields(), asdict(), == and dataclasses.replace() all see the
+    value. repr() shows the stored value and never loads it.
     """
 
     success: bool
@@ -51,3 +61,160 @@ class ProcessingResult:
     error: Optional[str]
     duration_ms: int
     cached: bool
+
+    def __getattribute__(self, name: str) -> Any:
+        value = object.__getattribute__(self, name)
+        if name == "output" and isinstance(value, ResultRef):
+            return value.load()
+        return value
+
+    def __repr__(self) -> str:
+        return (
+            f"ProcessingResult(success={self.success!r}, output={object.__getattribute__(self, 'output')!r}, "
+            f"error={self.error!r}, duration_ms={self.duration_ms!r}, cached={self.cached!r})"
+        )
+
+    def _copy(self, **changes: Any) -> "ProcessingResult":
+        # dataclasses.replace() that keeps an unread ResultRef unread
+        values = {name: object.__getattribute__(self, name) for name in self.__slots__}
+        values.update(changes)
+        return ProcessingResult(**values)
+
+
+# ---------- out-of-line results ----------
+
+class ResultRef:
+    """
+    Reference to a handler result a store keeps out of line.
+
+    Stores that move large results to a separate blob area put a
+    ResultRef in WebhookState.result instead of the value, so state reads
+    stay small. ProcessingResult.output resolves it on first access.
+
+    load() fetches the value once and keeps it.
+    """
+
+    __slots__ = ("_loader", "_value", "_loaded")
+
+    def __init__(self, loader: Callable[[], Any]):
+        self._loader = loader
+        self._value: Any = None
+        self._loaded = False
+
+    def load(self) -> Any:
+        if not self._loaded:
+            self._value = self._loader()
+            self._loaded = True
+            self._loader = None
+        return self._value
+
+    def __repr__(self) -> str:
+        return f"ResultRef(loaded={self._loaded})"
+
+
+# ---------- compact storage representation ----------
+
+STATUS_CODES = {
+    WebhookStatus.PENDING: 0,
+    WebhookStatus.PROCESSING: 1,
+    WebhookStatus.COMPLETE: 2,
+    WebhookStatus.FAILED: 3,
+}
+
+_STATUS_BY_CODE = tuple(sorted(STATUS_CODES, key=STATUS_CODES.__getitem__))
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_ns(value: datetime) -> int:
+    """Naive-UTC datetime -> integer nanoseconds since the Unix epoch."""
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+def from_epoch_ns(value: int) -> datetime:
+    """Integer nanoseconds since the Unix epoch -> naive-UTC datetime."""
+    return _EPOCH + timedelta(microseconds=value // 1_000)
+
+
+class CompactRecord:
+    """
+    Compact in-store representation of one webhook's state.
+
+    Used by stores that retain many records in memory:
+    - __slots__, no per-instance __dict__
+    - status as a one-byte code (small ints are shared singletons)
+    - timestamps as int epoch-nanoseconds instead of datetime objects
+    - webhook_id is not stored (it is the container key)
+
+    Records are never mutated; transitions create a new record.
+    to_state() produces the public WebhookState snapshot.
+    """
+
+    __slots__ = (
+        "status_code",
+        "reserved_until_ns",
+        "result",
+        "error",
+        "created_ns",
+        "updated_ns",
+        "owner",
+    )
+
+    def __init__(
+        self,
+        status_code: int,
+        reserved_until_ns: Optional[int],
+        result: Optional[Any],
+        error: Optional[str],
+        created_ns: int,
+        updated_ns: int,
+        owner: Optional[str] = None,
+    ):
+        self.status_code = status_code
+        self.reserved_until_ns = reserved_until_ns
+        self.result = result
+        self.error = error
+        self.created_ns = created_ns
+        self.updated_ns = updated_ns
+        self.owner = owner
+
+    @property
+    def status(self) -> WebhookStatus:
+        return _STATUS_BY_CODE[self.status_code]
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status_code >= STATUS_CODES[WebhookStatus.COMPLETE]
+
+    @classmethod
+    def from_state(cls, state: WebhookState) -> "CompactRecord":
+        return cls(
+            status_code=STATUS_CODES[state.status],
+            reserved_until_ns=(
+                to_epoch_ns(state.reserved_until)
+                if state.reserved_until is not None
+                else None
+            ),
+            result=state.result,
+            error=state.error,
+            created_ns=to_epoch_ns(state.created_at),
+            updated_ns=to_epoch_ns(state.updated_at),
+            owner=state.owner,
+        )
+
+    def to_state(self, webhook_id: str) -> WebhookState:
+        return WebhookState(
+            webhook_id=webhook_id,
+            status=_STATUS_BY_CODE[self.status_code],
+            reserved_until=(
+                from_epoch_ns(self.reserved_until_ns)
+                if self.reserved_until_ns is not None
+                else None
+            ),
+            result=self.result,
+            error=self.error,
+            created_at=from_epoch_ns(self.created_ns),
+            updated_at=from_epoch_ns(self.updated_ns),
+            owner=self.owner,
+        )
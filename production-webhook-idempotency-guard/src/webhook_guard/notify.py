@@ -0,0 +1,153 @@
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import threading
+
+from .models import WebhookState, WebhookStatus
+
+
+_TERMINAL = (WebhookStatus.COMPLETE, WebhookStatus.FAILED)
+
+
+def _is_terminal(state: Optional[WebhookState]) -> bool:
+    return state is not None and state.status in _TERMINAL
+
+
+class _Waiter:
+    __slots__ = ("event", "state")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.state: Optional[WebhookState] = None
+
+
+class CompletionNotifier:
+    """
+    In-process wait/notify for terminal webhook states.
+
+    The lock holder publishes the terminal state right after it is
+    persisted; concurrent duplicates in the same process wake immediately
+    instead of sleeping and polling.
+
+    Race safety:
+    - Waiters register BEFORE re-checking the store
+    - Publishers persist BEFORE checking for waiters
+    So a waiter either sees the terminal state on its re-check or is
+    registered in time to be woken.
+
+    Does NOT:
+    - Notify other processes (cross-process waiters hit their deadline
+      and fall back to reading the store)
+    """
+
+    def __init__(self):
+        self._waiters: Dict[str, List[_Waiter]] = {}
+        self._mutex = threading.Lock()
+
+    def has_waiters(self, webhook_id: str) -> bool:
+        return webhook_id in self._waiters
+
+    def wait(
+        self,
+        webhook_id: str,
+        timeout_seconds: float,
+        check: Callable[[], Optional[WebhookState]],
+    ) -> Optional[WebhookState]:
+        """
+        Wait until a terminal state for webhook_id is published.
+
+        Returns:
+            Terminal WebhookState if published (or already persisted)
+            None if the deadline passed first
+        """
+        waiter = _Waiter()
+        with self._mutex:
+            self._waiters.setdefault(webhook_id, []).append(waiter)
+
+        try:
+            state = check()
+            if _is_terminal(state):
+                return state
+
+            waiter.event.wait(timeout_seconds)
+            return waiter.state
+        finally:
+            self._unregister(webhook_id, waiter)
+
+    def publish(self, webhook_id: str, state: Optional[WebhookState]) -> None:
+        """Wake every waiter for webhook_id with the terminal state."""
+        if not _is_terminal(state):
+            return
+
+        with self._mutex:
+            waiters = self._waiters.pop(webhook_id, [])
+
+        for waiter in waiters:
+            waiter.state = state
+            waiter.event.set()
+
+    def _unregister(self, webhook_id: str, waiter: _Waiter) -> None:
+        with self._mutex:
+            waiters = self._waiters.get(webhook_id)
+            if waiters is None:
+                return
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                pass
+            if not waiters:
+                del self._waiters[webhook_id]
+
+
+class AsyncCompletionNotifier:
+    """
+    Asyncio variant of CompletionNotifier.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self):
+        self._waiters: Dict[str, List["asyncio.Future[WebhookState]"]] = {}
+
+    def has_waiters(self, webhook_id: str) -> bool:
+        return webhook_id in self._waiters
+
+    async def wait(
+        self,
+        webhook_id: str,
+        timeout_seconds: float,
+        check: Callable[[], Awaitable[Optional[WebhookState]]],
+    ) -> Optional[WebhookState]:
+        """
+        Wait until a terminal state for webhook_id is published.
+
+        Returns:
+            Terminal WebhookState if published (or already persisted)
+            None if the deadline passed first
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(webhook_id, []).append(future)
+
+        try:
+            state = await check()
+            if _is_terminal(state):
+                return state
+
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout_seconds)
+            except asyncio.TimeoutError:
+                return None
+        finally:
+            waiters = self._waiters.get(webhook_id)
+            if waiters is not None and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[webhook_id]
+
+    def publish(self, webhook_id: str, state: Optional[WebhookState]) -> None:
+        """Wake every waiter for webhook_id with the terminal state."""
+        if not _is_terminal(state):
+            return
+
+        for future in self._waiters.pop(webhook_id, []):
+            if not future.done():
+                future.set_result(state)
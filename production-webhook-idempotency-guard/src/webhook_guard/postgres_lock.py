@@ -0,0 +1,94 @@
+from typing import Optional
+import hashlib
+
+from .postgres_store import PostgresStore, _Pin
+
+
+_TRY_LOCK = "SELECT pg_try_advisory_lock(%s)"
+
+_UNLOCK = "SELECT pg_advisory_unlock(%s)"
+
+
+class AdvisoryLockHandle:
+    """Handle for a key held in PostgresAdvisoryLock."""
+
+    __slots__ = ("_lock", "_pin", "_key_hash")
+
+    def __init__(self, lock: "PostgresAdvisoryLock", pin: _Pin, key_hash: int):
+        self._lock = lock
+        self._pin = pin
+        self._key_hash = key_hash
+
+    def release(self) -> None:
+        pin, self._pin = self._pin, None
+        if pin is not None:
+            self._lock._release(pin, self._key_hash)
+
+
+class PostgresAdvisoryLock:
+    """
+    DistributedLock on PostgreSQL session advisory locks, sharing a
+    PostgresStore's connection pool.
+
+    Guarantees:
+    - One holder per key across every session (pg_try_advisory_lock on
+      a signed 64-bit blake2b hash of the key)
+    - Non-blocking acquisition
+    - Auto-release: the server drops a session's advisory locks when
+      its connection closes, e.g. when the holding process dies
+
+    Lock and state share one connection: the lock checks a connection
+    out of the store's pool and pins it to the calling thread until
+    release(), and the store runs that thread's statements on it. The
+    guard's mark_processing/mark_complete therefore need no further
+    checkout, and no second system is involved.
+
+    Hash collisions: two keys with the same hash contend (false
+    contention, never shared ownership). Advisory locks are re-entrant
+    within a session, so a session refuses a hash it already holds
+    instead of stacking it.
+
+    timeout_seconds is not enforced: a lock lasts until release() or
+    disconnect. Release on the acquiring thread; each held lock keeps
+    its thread's connection out of the pool.
+    """
+
+    def __init__(self, store: PostgresStore):
+        self._store = store
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[AdvisoryLockHandle]:
+        key_hash = _key_hash(key)
+        pin = self._store._pin()
+        try:
+            if key_hash in pin.keys:
+                acquired = False
+            else:
+                acquired = pin.conn.execute(_TRY_LOCK, (key_hash,)).fetchone()[0]
+        except BaseException:
+            self._store._unpin(pin)
+            raise
+
+        if not acquired:
+            self._store._unpin(pin)
+            return None
+
+        pin.keys[key_hash] = key
+        return AdvisoryLockHandle(self, pin, key_hash)
+
+    def _release(self, pin: _Pin, key_hash: int) -> None:
+        del pin.keys[key_hash]
+        try:
+            pin.conn.execute(_UNLOCK, (key_hash,))
+        except BaseException:
+            # The session may still hold the lock: never pool it. A
+            # closed connection is discarded by the pool on return,
+            # which ends the session and its locks with it
+            pin.conn.close()
+            raise
+        finally:
+            self._store._unpin(pin)
+
+
+def _key_hash(key: str) -> int:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
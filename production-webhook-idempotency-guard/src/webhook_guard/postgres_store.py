@@ -0,0 +1,358 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+import threading
+
+from .models import WebhookState, WebhookStatus, _STATUS_BY_CODE
+from .serialization import ResultSerializer
+
+
+# Server clock as naive UTC, matching the other stores' timestamps
+_NOW = "(now() AT TIME ZONE 'UTC')"
+
+# status holds models.STATUS_CODES: 0 PENDING, 1 PROCESSING, 2 COMPLETE, 3 FAILED
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_state (
+    webhook_id     TEXT PRIMARY KEY,
+    status         SMALLINT NOT NULL,
+    reserved_until TIMESTAMP,
+    result         BYTEA,
+    error          TEXT,
+    created_at     TIMESTAMP NOT NULL,
+    updated_at     TIMESTAMP NOT NULL,
+    owner          TEXT
+)
+"""
+
+# Terminal rows dominate the table; only PENDING/PROCESSING rows are ever
+# scanned by reservation time, so the index stays small.
+_OPEN_INDEX = """
+CREATE INDEX IF NOT EXISTS webhook_state_open_idx
+ON webhook_state (status, reserved_until)
+WHERE status IN (0, 1)
+"""
+
+_COLUMNS = "webhook_id, status, reserved_until, result, error, created_at, updated_at, owner"
+
+_SELECT = f"SELECT {_COLUMNS} FROM webhook_state WHERE webhook_id = %s"
+
+_SELECT_MANY = f"SELECT {_COLUMNS} FROM webhook_state WHERE webhook_id = ANY(%s)"
+
+# One ordered range scan of webhook_state_open_idx per open status, each
+# stopping after limit rows; the outer sort only sees 2 * limit rows.
+_FIND_EXPIRED = f"""
+SELECT * FROM (
+    (SELECT {_COLUMNS} FROM webhook_state
+     WHERE status = 0 AND reserved_until <= COALESCE(%(now)s::timestamp, {_NOW})
+     ORDER BY reserved_until LIMIT %(limit)s)
+    UNION ALL
+    (SELECT {_COLUMNS} FROM webhook_state
+     WHERE status = 1 AND reserved_until <= COALESCE(%(now)s::timestamp, {_NOW})
+     ORDER BY reserved_until LIMIT %(limit)s)
+) AS expired
+ORDER BY reserved_until
+LIMIT %(limit)s
+"""
+
+# One statement: insert, or return the existing row. A row committed
+# after the statement's snapshot yields nothing and is re-read.
+_RESERVE = f"""
+WITH inserted AS (
+    INSERT INTO webhook_state (webhook_id, status, reserved_until, created_at, updated_at)
+    VALUES (%(id)s, 0, {_NOW} + %(timeout)s * interval '1 second', {_NOW}, {_NOW})
+    ON CONFLICT (webhook_id) DO NOTHING
+    RETURNING webhook_id
+)
+SELECT TRUE, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL FROM inserted
+UNION ALL
+SELECT FALSE, {_COLUMNS} FROM webhook_state
+WHERE webhook_id = %(id)s AND NOT EXISTS (SELECT 1 FROM inserted)
+"""
+
+_RESERVE_MANY = f"""
+INSERT INTO webhook_state (webhook_id, status, reserved_until, created_at, updated_at)
+SELECT id, 0, {_NOW} + %s * interval '1 second', {_NOW}, {_NOW}
+FROM unnest(%s::text[]) AS id
+ON CONFLICT (webhook_id) DO NOTHING
+RETURNING webhook_id
+"""
+
+# New ids are inserted; PENDING/PROCESSING ids whose lease has passed are
+# taken over; live or terminal ids are left alone (no row returned).
+_BEGIN = f"""
+INSERT INTO webhook_state (webhook_id, status, reserved_until, created_at, updated_at, owner)
+VALUES (%s, 1, {_NOW} + %s * interval '1 second', {_NOW}, {_NOW}, %s)
+ON CONFLICT (webhook_id) DO UPDATE SET
+    status = 1,
+    reserved_until = excluded.reserved_until,
+    result = NULL,
+    error = NULL,
+    updated_at = excluded.updated_at,
+    owner = excluded.owner
+WHERE webhook_state.status IN (0, 1)
+  AND webhook_state.reserved_until <= excluded.updated_at
+RETURNING webhook_id
+"""
+
+_MARK_PROCESSING = f"""
+UPDATE webhook_state SET status = 1, updated_at = {_NOW}
+WHERE webhook_id = ANY(%s) AND status = 0
+RETURNING webhook_id
+"""
+
+_MARK_COMPLETE = f"""
+UPDATE webhook_state AS w SET status = 2, result = v.result, error = NULL, updated_at = {_NOW}
+FROM unnest(%s::text[], %s::bytea[]) AS v(webhook_id, result)
+WHERE w.webhook_id = v.webhook_id AND w.status = 1
+RETURNING w.webhook_id
+"""
+
+_MARK_FAILED = f"""
+UPDATE webhook_state AS w SET status = 3, result = NULL, error = v.error, updated_at = {_NOW}
+FROM unnest(%s::text[], %s::text[]) AS v(webhook_id, error)
+WHERE w.webhook_id = v.webhook_id AND w.status = 1
+RETURNING w.webhook_id
+"""
+
+# Owner-checked (compare-and-set) single-id variants
+_MARK_COMPLETE_OWNED = f"""
+UPDATE webhook_state SET status = 2, result = %s, error = NULL, updated_at = {_NOW}
+WHERE webhook_id = %s AND status = 1 AND owner = %s
+RETURNING webhook_id
+"""
+
+_MARK_FAILED_OWNED = f"""
+UPDATE webhook_state SET status = 3, result = NULL, error = %s, updated_at = {_NOW}
+WHERE webhook_id = %s AND status = 1 AND owner = %s
+RETURNING webhook_id
+"""
+
+
+class _Pin:
+    """A pooled connection pinned to one thread while locks are held on it."""
+
+    __slots__ = ("conn", "refs", "keys")
+
+    def __init__(self, conn: Any):
+        self.conn = conn
+        self.refs = 0
+        self.keys: Dict[int, str] = {}
+
+
+class PostgresStore:
+    """
+    Durable multi-host WebhookStore backed by PostgreSQL.
+
+    Guarantees (same as WebhookStore):
+    - Atomic reservation via INSERT ... ON CONFLICT DO NOTHING RETURNING
+    - Valid state transitions only (conditional UPDATE ... RETURNING)
+    - Terminal states are immutable
+    - Timestamps come from the server clock
+
+    Performance:
+    - Every operation is exactly one statement in autocommit mode: no
+      explicit transactions, one round trip
+    - Connections come from a bounded pool (min_size..max_size);
+      callers wait up to pool_timeout_seconds for a free one
+    - Implements begin() and the bulk operations (SupportsBegin,
+      SupportsBulk); each bulk call is one array-parameter statement
+    - Owner-checked terminal writes (SupportsOwnedTransitions) are one
+      conditional UPDATE
+    - While a thread holds a PostgresAdvisoryLock, its statements run
+      on the connection the lock is held on instead of a fresh checkout
+    - Partial index on non-terminal rows, so find_expired()
+      (SupportsFindExpired) does not slow down as completed webhooks
+      accumulate
+
+    Requires the `postgres` extra (psycopg 3 and psycopg_pool).
+
+    Results are encoded by serializer (pickle unless configured
+    otherwise; see ResultSerializer): with pickle, only point it at a
+    database you trust.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        pool_timeout_seconds: float = 30.0,
+        serializer: Optional[ResultSerializer] = None,
+    ):
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as exc:
+            raise ImportError(
+                "PostgresStore requires psycopg and psycopg_pool: "
+                "pip install 'production-webhook-idempotency-guard[postgres]'"
+            ) from exc
+
+        self._serializer = serializer if serializer is not None else ResultSerializer()
+        self._pool = ConnectionPool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            timeout=pool_timeout_seconds,
+            kwargs={"autocommit": True},
+            open=True,
+        )
+
+        self._local = threading.local()
+
+        with self._pool.connection() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_OPEN_INDEX)
+
+    @property
+    def pool(self) -> Any:
+        """The psycopg_pool.ConnectionPool every statement runs on."""
+        return self._pool
+
+    def close(self) -> None:
+        """Close the pool and every connection in it."""
+        self._pool.close()
+
+    def _fetch(self, sql: str, params: Any) -> List[Tuple[Any, ...]]:
+        pin = getattr(self._local, "pin", None)
+        if pin is not None and pin.refs:
+            return pin.conn.execute(sql, params).fetchall()
+        with self._pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    # ---------- connection pinning (see PostgresAdvisoryLock) ----------
+
+    def _pin(self) -> _Pin:
+        """Check out a connection for this thread, or share the one it has."""
+        pin = getattr(self._local, "pin", None)
+        if pin is None or not pin.refs:
+            # (a pin released from another thread has refs == 0)
+            pin = self._local.pin = _Pin(self._pool.getconn())
+        pin.refs += 1
+        return pin
+
+    def _unpin(self, pin: _Pin) -> None:
+        pin.refs -= 1
+        if pin.refs == 0:
+            if getattr(self._local, "pin", None) is pin:
+                self._local.pin = None
+            self._pool.putconn(pin.conn)
+
+    # ---------- WebhookStore ----------
+
+    def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        rows = self._fetch(_SELECT, (webhook_id,))
+        return _to_state(rows[0], self._serializer.loads) if rows else None
+
+    def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        """
+        Atomic reservation semantics.
+
+        Returns:
+            (True, None) if newly reserved
+            (False, existing_state) if already exists
+        """
+        rows = self._fetch(_RESERVE, {"id": webhook_id, "timeout": timeout_seconds})
+        if rows and rows[0][0]:
+            return True, None
+        if rows:
+            return False, _to_state(rows[0][1:], self._serializer.loads)
+        return False, self.get_state(webhook_id)
+
+    def begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        """Single-statement reservation into PROCESSING (see SupportsBegin)."""
+        if self._fetch(_BEGIN, (webhook_id, timeout_seconds, owner)):
+            return True, None
+        return False, self.get_state(webhook_id)
+
+    def mark_processing(self, webhook_id: str) -> None:
+        self.mark_processing_many([webhook_id])
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        self.mark_complete_many({webhook_id: result})
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        self.mark_failed_many({webhook_id: error})
+
+    # ---------- bulk operations (see SupportsBulk) ----------
+
+    def get_states(self, webhook_ids: Sequence[str]) -> Dict[str, WebhookState]:
+        rows = self._fetch(_SELECT_MANY, (list(webhook_ids),))
+        return {row[0]: _to_state(row, self._serializer.loads) for row in rows}
+
+    def reserve_many(
+        self, webhook_ids: Sequence[str], timeout_seconds: int
+    ) -> List[Tuple[bool, Optional[WebhookState]]]:
+        ids = list(webhook_ids)
+        reserved = {row[0] for row in self._fetch(_RESERVE_MANY, (timeout_seconds, ids))}
+        existing = self.get_states([webhook_id for webhook_id in ids if webhook_id not in reserved])
+
+        outcomes: List[Tuple[bool, Optional[WebhookState]]] = []
+        for webhook_id in ids:
+            if webhook_id in reserved:
+                # Repeated ids: only the first occurrence wins
+                reserved.discard(webhook_id)
+                outcomes.append((True, None))
+            else:
+                outcomes.append((False, existing.get(webhook_id) or self.get_state(webhook_id)))
+        return outcomes
+
+    def mark_processing_many(self, webhook_ids: Sequence[str]) -> None:
+        ids = list(webhook_ids)
+        self._check(ids, self._fetch(_MARK_PROCESSING, (ids,)), WebhookStatus.PROCESSING)
+
+    def mark_complete_many(self, results: Mapping[str, Any]) -> None:
+        ids = list(results)
+        blobs = [self._serializer.dumps(results[webhook_id]) for webhook_id in ids]
+        self._check(ids, self._fetch(_MARK_COMPLETE, (ids, blobs)), WebhookStatus.COMPLETE)
+
+    def mark_failed_many(self, errors: Mapping[str, str]) -> None:
+        ids = list(errors)
+        messages = [errors[webhook_id] for webhook_id in ids]
+        self._check(ids, self._fetch(_MARK_FAILED, (ids, messages)), WebhookStatus.FAILED)
+
+    # ---------- owner-checked transitions (see SupportsOwnedTransitions) ----------
+
+    def mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        rows = self._fetch(_MARK_COMPLETE_OWNED, (self._serializer.dumps(result), webhook_id, owner))
+        self._check([webhook_id], rows, WebhookStatus.COMPLETE, owner)
+
+    def mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        rows = self._fetch(_MARK_FAILED_OWNED, (error, webhook_id, owner))
+        self._check([webhook_id], rows, WebhookStatus.FAILED, owner)
+
+    # ---------- stale reservations (see SupportsFindExpired) ----------
+
+    def find_expired(self, now: Optional[datetime] = None, limit: int = 100) -> List[WebhookState]:
+        rows = self._fetch(_FIND_EXPIRED, {"now": now, "limit": limit})
+        return [_to_state(row, self._serializer.loads) for row in rows]
+
+    # ---------- internals ----------
+
+    def _check(
+        self, ids: List[str], rows: List[Tuple[Any, ...]], target: WebhookStatus, owner: Optional[str] = None
+    ) -> None:
+        # Valid rows are already written; the first rejected id is raised
+        updated = {row[0] for row in rows}
+        for webhook_id in ids:
+            if webhook_id not in updated:
+                state = self.get_state(webhook_id)
+                if state is None:
+                    raise ValueError(f"Webhook {webhook_id} does not exist")
+                if owner is not None and state.status == WebhookStatus.PROCESSING and state.owner != owner:
+                    raise ValueError(f"Webhook {webhook_id} is owned by another worker, cannot mark {target.value}")
+                raise ValueError(f"Webhook {webhook_id} is in {state.status} state, cannot mark {target.value}")
+
+
+def _to_state(row: Tuple[Any, ...], loads: Callable[[bytes], Any]) -> WebhookState:
+    webhook_id, status, reserved_until, result, error, created_at, updated_at, owner = row
+    return WebhookState(
+        webhook_id=webhook_id,
+        status=_STATUS_BY_CODE[status],
+        reserved_until=reserved_until,
+        result=loads(result) if result is not None else None,
+        error=error,
+        created_at=created_at,
+        updated_at=updated_at,
+        owner=owner,
+    )
@@ -0,0 +1,270 @@
+from typing import Dict, List, Optional, Sequence
+import secrets
+import threading
+import time
+
+from .redis_store import _Script, _eval_pipeline
+from .resp import RespConnection, RespError
+
+
+# KEYS[1] lock key; ARGV token. Deletes the key only for its holder.
+_RELEASE = _Script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+""")
+
+# KEYS[1] lock key; ARGV token, lease_ms. Extends the key only for its holder.
+_RENEW = _Script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+""")
+
+
+class RedisLockHandle:
+    """
+    Handle for a key held in RedisLock.
+
+    lost is set when the heartbeat found the key expired or taken over
+    before release(). It is informational: WebhookGuard does not read
+    it, since an owner-checked terminal write (SupportsOwnedTransitions)
+    is what rejects a worker whose record was taken over.
+    """
+
+    __slots__ = ("_lock", "key", "token", "deadline", "lost")
+
+    def __init__(self, lock: "RedisLock", key: str, token: str, deadline: float):
+        self._lock = lock
+        self.key = key
+        self.token = token
+        self.deadline = deadline
+        self.lost = False
+
+    def release(self) -> None:
+        self._lock._release(self)
+
+
+class RedisLock:
+    """
+    DistributedLock on Redis (or any server speaking its protocol).
+
+    Guarantees:
+    - One holder per key across all clients (SET key token NX PX)
+    - Non-blocking acquisition
+    - Every acquisition gets a random owner token; release deletes the
+      key only while it still holds that token (one script), so a
+      holder whose lease lapsed never frees another holder's lock
+    - Auto-release: the key expires if its holder stops renewing it
+
+    Lease renewal (lease_seconds, default 10):
+    - Keys are written with a short lease, and one background heartbeat
+      per RedisLock re-extends every held key each lease_seconds / 3 in
+      a single pipelined round trip; it runs only while a key is held
+    - Renewal stops at release() or timeout_seconds after acquisition,
+      so a lock never outlives the timeout the caller asked for
+    - A crashed holder frees its keys within lease_seconds instead of
+      timeout_seconds
+    - With lease_seconds=None, keys are written with a timeout_seconds
+      lease and never renewed
+
+    Performance:
+    - try_lock is one SET; try_lock_many pipelines the SETs for a whole
+      batch into one round trip (WebhookGuard.process_many uses it)
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        key_prefix: str = "webhook-lock:",
+        lease_seconds: Optional[float] = 10.0,
+        socket_timeout_seconds: Optional[float] = 5.0,
+    ):
+        if lease_seconds is not None and lease_seconds <= 0:
+            raise ValueError("lease_seconds must be positive")
+
+        self._address = (host, port, db, password, socket_timeout_seconds)
+        self._prefix = key_prefix
+        self._lease = lease_seconds
+        self._local = threading.local()
+        self._connections: List[RespConnection] = []
+        self._connections_mutex = threading.Lock()
+
+        self._held: Dict[str, RedisLockHandle] = {}
+        self._held_mutex = threading.Lock()
+        # One stop event per heartbeat thread, so close() can restart it
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    # ---------- connections ----------
+
+    def _connection(self) -> RespConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            host, port, db, password, timeout = self._address
+            conn = RespConnection(host, port, db=db, password=password, timeout_seconds=timeout)
+            self._local.conn = conn
+            with self._connections_mutex:
+                self._connections.append(conn)
+        return conn
+
+    def _discard_connection(self) -> None:
+        # A failed socket may hold unread replies: never reuse it
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            with self._connections_mutex:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            conn.close()
+
+    def close(self) -> None:
+        """
+        Stop the heartbeat and close every connection (held keys then expire).
+
+        The lock stays usable: the next try_lock reconnects and starts a
+        new heartbeat.
+        """
+        with self._held_mutex:
+            heartbeat, stop = self._heartbeat, self._stop
+            self._heartbeat, self._stop = None, threading.Event()
+            self._held.clear()
+        stop.set()
+        if heartbeat is not None:
+            heartbeat.join()
+        with self._connections_mutex:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _pipeline(self, commands: List[Sequence]) -> List:
+        try:
+            return self._connection().pipeline(commands)
+        except OSError:
+            self._discard_connection()
+            raise
+
+    # ---------- DistributedLock ----------
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[RedisLockHandle]:
+        return self.try_lock_many([key], timeout_seconds)[0]
+
+    def try_lock_many(self, keys: Sequence[str], timeout_seconds: int) -> List[Optional[RedisLockHandle]]:
+        """try_lock for every key in one round trip; None where held elsewhere."""
+        keys = list(keys)
+        if not keys:
+            return []
+        lease = timeout_seconds if self._lease is None else min(self._lease, timeout_seconds)
+        lease_ms = max(1, int(lease * 1000))
+        deadline = time.monotonic() + timeout_seconds
+        tokens = [secrets.token_hex(16) for _ in keys]
+
+        replies = self._pipeline([
+            ("SET", self._prefix + key, token, "NX", "PX", lease_ms)
+            for key, token in zip(keys, tokens)
+        ])
+
+        handles: List[Optional[RedisLockHandle]] = []
+        error: Optional[RespError] = None
+        for key, token, reply in zip(keys, tokens, replies):
+            if isinstance(reply, RespError):
+                error = error or reply
+                reply = None
+            handles.append(RedisLockHandle(self, key, token, deadline) if reply is not None else None)
+
+        if error is not None:
+            # Free the keys this batch did acquire before failing it
+            self._release_all([handle for handle in handles if handle is not None])
+            raise error
+
+        if self._lease is not None and any(handles):
+            with self._held_mutex:
+                for handle in handles:
+                    if handle is not None:
+                        self._held[handle.token] = handle
+                self._start_heartbeat()
+        return handles
+
+    def _release(self, handle: RedisLockHandle) -> None:
+        with self._held_mutex:
+            self._held.pop(handle.token, None)
+        try:
+            (reply,) = _eval_pipeline(self._connection(), [(_RELEASE, self._prefix + handle.key, (handle.token,))])
+        except OSError:
+            self._discard_connection()
+            raise
+        if isinstance(reply, RespError):
+            raise reply
+
+    def _release_all(self, handles: List[RedisLockHandle]) -> None:
+        # Best effort, one round trip: a key left behind expires with its lease
+        if not handles:
+            return
+        try:
+            _eval_pipeline(
+                self._connection(),
+                [(_RELEASE, self._prefix + handle.key, (handle.token,)) for handle in handles],
+            )
+        except OSError:
+            self._discard_connection()
+
+    # ---------- lease renewal ----------
+
+    def _start_heartbeat(self) -> None:
+        # Called with _held_mutex held
+        if self._heartbeat is None:
+            self._heartbeat = threading.Thread(
+                target=self._beat, args=(self._stop,), name="redis-lock-heartbeat", daemon=True
+            )
+            self._heartbeat.start()
+
+    def _beat(self, stop: threading.Event) -> None:
+        while not stop.wait(self._lease / 3):
+            with self._held_mutex:
+                if not self._held:
+                    # Nothing to renew: the next try_lock starts a new beat
+                    if self._heartbeat is threading.current_thread():
+                        self._heartbeat = None
+                    return
+            try:
+                self.renew()
+            except (OSError, RespError):
+                # Missed beat: the next one retries while leases last
+                pass
+
+    def renew(self) -> None:
+        """Extend every held lease now (the heartbeat calls this)."""
+        now = time.monotonic()
+        with self._held_mutex:
+            for token in [token for token, handle in self._held.items() if handle.deadline <= now]:
+                # Past its timeout: left to expire with its last lease
+                del self._held[token]
+            handles = list(self._held.values())
+        if not handles:
+            return
+
+        calls = [
+            (
+                _RENEW,
+                self._prefix + handle.key,
+                (handle.token, max(1, int(min(self._lease, handle.deadline - now) * 1000))),
+            )
+            for handle in handles
+        ]
+        try:
+            replies = _eval_pipeline(self._connection(), calls)
+        except OSError:
+            self._discard_connection()
+            raise
+
+        with self._held_mutex:
+            for handle, reply in zip(handles, replies):
+                if reply == 0:
+                    handle.lost = True
+                    self._held.pop(handle.token, None)
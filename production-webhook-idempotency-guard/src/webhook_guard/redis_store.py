@@ -0,0 +1,342 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+import hashlib
+import threading
+
+from .models import CompactRecord, STATUS_CODES, WebhookState, WebhookStatus, _STATUS_BY_CODE
+from .resp import Arg, RespConnection, RespError
+from .serialization import ResultSerializer
+
+
+_NS_PER_MS = 1_000_000
+
+# Server clock in integer milliseconds: Lua numbers are doubles, so
+# nanoseconds would lose precision.
+_NOW = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+"""
+
+
+class _Script:
+    __slots__ = ("source", "sha")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.sha = hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+# Each hash holds: s status code, r reserved_until, c created, u updated
+# (ms), res encoded result, err error, o owner.
+
+# KEYS[1] id; ARGV timeout_ms. Returns 1 if reserved, else the existing hash.
+_RESERVE = _Script("""
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('HGETALL', KEYS[1])
+end
+""" + _NOW + """
+redis.call('HSET', KEYS[1], 's', 0, 'r', now + tonumber(ARGV[1]), 'c', now, 'u', now)
+return 1
+""")
+
+# KEYS[1] id; ARGV timeout_ms, owner. New ids are inserted and expired
+# leases taken over (1); live or terminal ids return the existing hash.
+_BEGIN = _Script(_NOW + """
+local state = redis.call('HMGET', KEYS[1], 's', 'r')
+if state[1] then
+    if tonumber(state[1]) >= 2 or tonumber(state[2]) > now then
+        return redis.call('HGETALL', KEYS[1])
+    end
+    redis.call('HDEL', KEYS[1], 'res', 'err')
+else
+    redis.call('HSET', KEYS[1], 'c', now)
+end
+redis.call('HSET', KEYS[1], 's', 1, 'r', now + tonumber(ARGV[1]), 'u', now, 'o', ARGV[2])
+return 1
+""")
+
+# KEYS[1] id; ARGV expected, target, field, value, retention_ms, owner
+# ('' for any). Returns OK, nil if the id does not exist, the current
+# status code, or -1 if another owner holds it.
+_TRANSITION = _Script("""
+local state = redis.call('HMGET', KEYS[1], 's', 'o')
+if not state[1] then
+    return false
+end
+if tonumber(state[1]) ~= tonumber(ARGV[1]) then
+    return tonumber(state[1])
+end
+if ARGV[6] ~= '' and state[2] ~= ARGV[6] then
+    return -1
+end
+""" + _NOW + """
+redis.call('HSET', KEYS[1], 's', ARGV[2], 'u', now)
+if ARGV[3] ~= '' then
+    redis.call('HSET', KEYS[1], ARGV[3], ARGV[4])
+end
+if tonumber(ARGV[5]) > 0 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[5])
+end
+return redis.status_reply('OK')
+""")
+
+_PENDING = STATUS_CODES[WebhookStatus.PENDING]
+_PROCESSING = STATUS_CODES[WebhookStatus.PROCESSING]
+_COMPLETE = STATUS_CODES[WebhookStatus.COMPLETE]
+_FAILED = STATUS_CODES[WebhookStatus.FAILED]
+
+
+class RedisStore:
+    """
+    Networked WebhookStore on Redis (5.0+ for script effects replication).
+
+    Guarantees (same as WebhookStore):
+    - Every reservation and transition is one server-side Lua script,
+      so check-and-set is atomic across all clients
+    - Valid state transitions only (same rules as InMemoryStore)
+    - Terminal states are immutable
+    - Timestamps come from the server clock, so leases are comparable
+      across hosts
+
+    Performance:
+    - One round trip per operation via EVALSHA; scripts are loaded
+      (SCRIPT LOAD) on first use and after the server's cache is flushed
+    - Implements begin() and the bulk operations (SupportsBegin,
+      SupportsBulk); bulk calls are pipelined into one round trip
+    - Owner-checked terminal writes (SupportsOwnedTransitions) run in
+      the same transition script
+    - Retention (retention_seconds) is a native key TTL set by the
+      terminal write; nothing scans for expired records
+
+    Results are encoded by serializer (pickle unless configured
+    otherwise; see ResultSerializer): with pickle, only point it at a
+    server you trust.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        key_prefix: str = "webhook:",
+        retention_seconds: Optional[float] = None,
+        socket_timeout_seconds: Optional[float] = 5.0,
+        serializer: Optional[ResultSerializer] = None,
+    ):
+        if retention_seconds is not None and retention_seconds <= 0:
+            raise ValueError("retention_seconds must be positive")
+
+        self._address = (host, port, db, password, socket_timeout_seconds)
+        self._prefix = key_prefix
+        self._serializer = serializer if serializer is not None else ResultSerializer()
+        self._retention_ms = int(retention_seconds * 1000) if retention_seconds is not None else 0
+        self._local = threading.local()
+        self._connections: List[RespConnection] = []
+        self._connections_mutex = threading.Lock()
+
+    # ---------- connections ----------
+
+    def _connection(self) -> RespConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            host, port, db, password, timeout = self._address
+            conn = RespConnection(host, port, db=db, password=password, timeout_seconds=timeout)
+            self._local.conn = conn
+            with self._connections_mutex:
+                self._connections.append(conn)
+        return conn
+
+    def _discard_connection(self) -> None:
+        # A failed socket may hold unread replies: never reuse it
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            with self._connections_mutex:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            conn.close()
+
+    def close(self) -> None:
+        """Close every per-thread connection opened by this store."""
+        with self._connections_mutex:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _run(self, calls: Sequence[Tuple[_Script, str, Sequence[Arg]]]) -> List[Any]:
+        try:
+            replies = _eval_pipeline(
+                self._connection(),
+                [(script, self._prefix + webhook_id, args) for script, webhook_id, args in calls],
+            )
+        except OSError:
+            self._discard_connection()
+            raise
+
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    # ---------- WebhookStore ----------
+
+    def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        return self.get_states([webhook_id]).get(webhook_id)
+
+    def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        """
+        Atomic reservation semantics (one script, all clients).
+
+        Returns:
+            (True, None) if newly reserved
+            (False, existing_state) if already exists
+        """
+        return self.reserve_many([webhook_id], timeout_seconds)[0]
+
+    def begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        """Single-script reservation into PROCESSING (see SupportsBegin)."""
+        (reply,) = self._run([(_BEGIN, webhook_id, (timeout_seconds * 1000, owner))])
+        return _reservation(webhook_id, reply, self._serializer.loads)
+
+    def mark_processing(self, webhook_id: str) -> None:
+        self.mark_processing_many([webhook_id])
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        self.mark_complete_many({webhook_id: result})
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        self.mark_failed_many({webhook_id: error})
+
+    # ---------- bulk operations (see SupportsBulk) ----------
+
+    def get_states(self, webhook_ids: Sequence[str]) -> Dict[str, WebhookState]:
+        ids = list(webhook_ids)
+        try:
+            replies = self._connection().pipeline([("HGETALL", self._prefix + webhook_id) for webhook_id in ids])
+        except OSError:
+            self._discard_connection()
+            raise
+
+        states: Dict[str, WebhookState] = {}
+        for webhook_id, reply in zip(ids, replies):
+            if isinstance(reply, RespError):
+                raise reply
+            if reply:
+                states[webhook_id] = _to_state(webhook_id, reply, self._serializer.loads)
+        return states
+
+    def reserve_many(
+        self, webhook_ids: Sequence[str], timeout_seconds: int
+    ) -> List[Tuple[bool, Optional[WebhookState]]]:
+        ids = list(webhook_ids)
+        replies = self._run([(_RESERVE, webhook_id, (timeout_seconds * 1000,)) for webhook_id in ids])
+        return [_reservation(webhook_id, reply, self._serializer.loads) for webhook_id, reply in zip(ids, replies)]
+
+    def mark_processing_many(self, webhook_ids: Sequence[str]) -> None:
+        self._transition([
+            (webhook_id, (_PENDING, _PROCESSING, "", "", 0, "")) for webhook_id in webhook_ids
+        ])
+
+    def mark_complete_many(self, results: Mapping[str, Any]) -> None:
+        self._transition([
+            (
+                webhook_id,
+                (
+                    _PROCESSING,
+                    _COMPLETE,
+                    "res",
+                    self._serializer.dumps(result),
+                    self._retention_ms,
+                    "",
+                ),
+            )
+            for webhook_id, result in results.items()
+        ])
+
+    def mark_failed_many(self, errors: Mapping[str, str]) -> None:
+        self._transition([
+            (webhook_id, (_PROCESSING, _FAILED, "err", error, self._retention_ms, ""))
+            for webhook_id, error in errors.items()
+        ])
+
+    # ---------- owner-checked transitions (see SupportsOwnedTransitions) ----------
+
+    def mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        self._transition([(
+            webhook_id,
+            (_PROCESSING, _COMPLETE, "res", self._serializer.dumps(result), self._retention_ms, owner),
+        )])
+
+    def mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        self._transition([
+            (webhook_id, (_PROCESSING, _FAILED, "err", error, self._retention_ms, owner)),
+        ])
+
+    # ---------- internals ----------
+
+    def _transition(self, calls: List[Tuple[str, Tuple[Arg, ...]]]) -> None:
+        # Every call in the pipeline runs; the first rejection is raised
+        replies = self._run([(_TRANSITION, webhook_id, args) for webhook_id, args in calls])
+        for (webhook_id, args), reply in zip(calls, replies):
+            if reply is None:
+                raise ValueError(f"Webhook {webhook_id} does not exist")
+            if reply == -1:
+                raise ValueError(
+                    f"Webhook {webhook_id} is owned by another worker, "
+                    f"cannot mark {_STATUS_BY_CODE[args[1]].value}"
+                )
+            if isinstance(reply, int):
+                raise ValueError(
+                    f"Webhook {webhook_id} is in {_STATUS_BY_CODE[reply]} state, "
+                    f"cannot mark {_STATUS_BY_CODE[args[1]].value}"
+                )
+
+
+def _eval_pipeline(conn: RespConnection, calls: Sequence[Tuple[_Script, str, Sequence[Arg]]]) -> List[Any]:
+    """
+    Run single-key scripts in one pipeline. Calls rejected with NOSCRIPT
+    did not execute: the missing scripts are loaded once and those calls
+    resent in a second pipeline. Error replies are returned in place.
+    """
+    replies = conn.pipeline([("EVALSHA", script.sha, 1, key, *args) for script, key, args in calls])
+
+    missing = [
+        index for index, reply in enumerate(replies)
+        if isinstance(reply, RespError) and str(reply).startswith("NOSCRIPT")
+    ]
+    if missing:
+        scripts = {calls[index][0].sha: calls[index][0] for index in missing}
+        retried = conn.pipeline(
+            [("SCRIPT", "LOAD", script.source) for script in scripts.values()]
+            + [("EVALSHA", calls[index][0].sha, 1, calls[index][1], *calls[index][2]) for index in missing]
+        )
+        for index, reply in zip(missing, retried[len(scripts):]):
+            replies[index] = reply
+    return replies
+
+
+def _reservation(
+    webhook_id: str, reply: Any, loads: Callable[[bytes], Any]
+) -> Tuple[bool, Optional[WebhookState]]:
+    if reply == 1:
+        return True, None
+    return False, _to_state(webhook_id, reply, loads)
+
+
+def _to_state(webhook_id: str, flat: List[bytes], loads: Callable[[bytes], Any]) -> WebhookState:
+    fields = dict(zip(flat[::2], flat[1::2]))
+    result = fields.get(b"res")
+    error = fields.get(b"err")
+    owner = fields.get(b"o")
+    return CompactRecord(
+        status_code=int(fields[b"s"]),
+        reserved_until_ns=int(fields[b"r"]) * _NS_PER_MS,
+        result=loads(result) if result is not None else None,
+        error=error.decode("utf-8") if error is not None else None,
+        created_ns=int(fields[b"c"]) * _NS_PER_MS,
+        updated_ns=int(fields[b"u"]) * _NS_PER_MS,
+        owner=owner.decode("utf-8") if owner is not None else None,
+    ).to_state(webhook_id)
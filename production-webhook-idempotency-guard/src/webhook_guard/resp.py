@@ -0,0 +1,100 @@
+from typing import Any, List, Optional, Sequence, Union
+import socket
+
+
+Arg = Union[bytes, str, int, float]
+
+
+class RespError(Exception):
+    """Error reply returned by a Redis-protocol server."""
+
+
+class RespConnection:
+    """
+    Minimal blocking RESP2 client: enough for scripts and pipelines.
+
+    Replies:
+    - simple strings as str, bulk strings as bytes (None for nil)
+    - integers as int, arrays as lists
+    - error replies raise RespError (execute) or are returned as
+      RespError instances in place (pipeline)
+
+    One connection serves one thread at a time; stores keep one per
+    thread.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout_seconds: Optional[float] = 5.0,
+    ):
+        self._sock = socket.create_connection((host, port), timeout=timeout_seconds)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+
+        if password is not None:
+            self.execute("AUTH", password)
+        if db:
+            self.execute("SELECT", db)
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def execute(self, *args: Arg) -> Any:
+        """Send one command and return its reply."""
+        self._sock.sendall(_encode(args))
+        reply = self._read()
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def pipeline(self, commands: Sequence[Sequence[Arg]]) -> List[Any]:
+        """Send every command in one write, then read the replies in order."""
+        if not commands:
+            return []
+        self._sock.sendall(b"".join(_encode(command) for command in commands))
+        return [self._read() for _ in commands]
+
+    def _read(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by server")
+
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RespError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Connection closed by server")
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            if count < 0:
+                return None
+            return [self._read() for _ in range(count)]
+        raise ConnectionError(f"Invalid RESP reply type: {kind!r}")
+
+
+def _encode(args: Sequence[Arg]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode("utf-8")
+        else:
+            data = str(arg).encode("ascii")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
@@ -0,0 +1,263 @@
+from typing import Any, Dict, Iterable, Optional, Protocol, Tuple
+import json
+import lzma
+import pickle
+import struct
+import zlib
+
+
+class Codec(Protocol):
+    """
+    Encodes handler results to bytes for durable stores.
+
+    codec_id (1-15) is written into every record's header byte, so data
+    written with one codec stays readable after switching to another.
+    """
+
+    codec_id: int
+
+    def encode(self, value: Any) -> bytes:
+        ...
+
+    def decode(self, data: bytes) -> Any:
+        ...
+
+
+class JsonCodec:
+    """JSON: portable and safe to decode; tuples come back as lists."""
+
+    codec_id = 1
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class PickleCodec:
+    """Pickle: any Python object. Only decode data you trust."""
+
+    codec_id = 2
+
+    def encode(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+# ---------- compact binary codec ----------
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES, _LIST, _DICT = range(9)
+
+# Small non-negative ints are a single tag byte
+_SMALL_INT = 0x40
+_SMALL_INT_MAX = 0xFF - _SMALL_INT
+
+_DOUBLE = struct.Struct("<d")
+
+
+class BinaryCodec:
+    """
+    Compact tagged binary encoding of JSON-like values.
+
+    Supports None, bool, int (any size), float, str, bytes, list/tuple
+    (decoded as list) and dict. Smaller than JSON and safe to decode,
+    but pure Python: encoding and decoding cost more than the C-backed
+    json and pickle (see benchmarks/bench_serialization.py).
+
+    Format: one tag byte per value; lengths and ints as LEB128 varints
+    (ints zigzag-encoded); ints 0..191 fold into the tag byte.
+    """
+
+    codec_id = 3
+
+    def encode(self, value: Any) -> bytes:
+        out = bytearray()
+        _write(out, value)
+        return bytes(out)
+
+    def decode(self, data: bytes) -> Any:
+        value, position = _read(data, 0)
+        if position != len(data):
+            raise ValueError("Trailing bytes after binary-encoded value")
+        return value
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write(out: bytearray, value: Any) -> None:
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif type(value) is int:
+        if 0 <= value <= _SMALL_INT_MAX:
+            out.append(_SMALL_INT + value)
+        else:
+            out.append(_INT)
+            _write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+    elif type(value) is str:
+        data = value.encode("utf-8")
+        out.append(_STR)
+        _write_varint(out, len(data))
+        out += data
+    elif type(value) is float:
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif type(value) is dict:
+        out.append(_DICT)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            _write(out, key)
+            _write(out, item)
+    elif type(value) in (list, tuple):
+        out.append(_LIST)
+        _write_varint(out, len(value))
+        for item in value:
+            _write(out, item)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        out.append(_BYTES)
+        _write_varint(out, len(data))
+        out += data
+    else:
+        raise TypeError(f"BinaryCodec cannot encode {type(value).__name__}")
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+def _read(data: bytes, position: int) -> Tuple[Any, int]:
+    tag = data[position]
+    position += 1
+
+    if tag >= _SMALL_INT:
+        return tag - _SMALL_INT, position
+    if tag == _STR:
+        length, position = _read_varint(data, position)
+        return data[position:position + length].decode("utf-8"), position + length
+    if tag == _DICT:
+        count, position = _read_varint(data, position)
+        result: Dict[Any, Any] = {}
+        for _ in range(count):
+            key, position = _read(data, position)
+            result[key], position = _read(data, position)
+        return result, position
+    if tag == _INT:
+        zigzag, position = _read_varint(data, position)
+        return (zigzag >> 1) if not zigzag & 1 else -((zigzag + 1) >> 1), position
+    if tag == _NONE:
+        return None, position
+    if tag == _TRUE:
+        return True, position
+    if tag == _FALSE:
+        return False, position
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, position)[0], position + _DOUBLE.size
+    if tag == _LIST:
+        count, position = _read_varint(data, position)
+        items = []
+        for _ in range(count):
+            item, position = _read(data, position)
+            items.append(item)
+        return items, position
+    if tag == _BYTES:
+        length, position = _read_varint(data, position)
+        return bytes(data[position:position + length]), position + length
+    raise ValueError(f"Invalid binary codec tag: {tag}")
+
+
+# ---------- per-record framing ----------
+
+_COMPRESSIONS = {None: 0, "zlib": 1, "lzma": 2}
+
+# Records written before the header existed are bare pickles, which
+# always start with the PROTO opcode; header bytes never reach it.
+_LEGACY_PICKLE = 0x80
+
+
+class ResultSerializer:
+    """
+    Result encoding shared by the durable stores.
+
+    Every record starts with one header byte: codec id (low 4 bits) and
+    compression (bits 4-5: none, zlib, lzma). Reads follow the header,
+    not the current configuration, so mixed data stays readable.
+
+    Compression is applied when the encoded result is at least
+    compress_min_bytes long and actually shrinks.
+
+    Decoding is limited to codec plus `readable` (default: every
+    built-in). Exclude PickleCodec from both to read untrusted data
+    safely.
+    """
+
+    def __init__(
+        self,
+        codec: Optional[Codec] = None,
+        compression: Optional[str] = None,
+        compress_min_bytes: int = 1024,
+        readable: Optional[Iterable[Codec]] = None,
+    ):
+        if compression not in _COMPRESSIONS:
+            raise ValueError(f"Invalid compression: {compression}")
+
+        self._codec = codec if codec is not None else PickleCodec()
+        if not 1 <= self._codec.codec_id <= 15:
+            raise ValueError("codec_id must be between 1 and 15")
+
+        self._compression = compression
+        self._compress_min_bytes = compress_min_bytes
+        self._codecs: Dict[int, Codec] = {
+            c.codec_id: c
+            for c in (readable if readable is not None else (JsonCodec(), PickleCodec(), BinaryCodec()))
+        }
+        self._codecs[self._codec.codec_id] = self._codec
+
+    def dumps(self, value: Any) -> bytes:
+        data = self._codec.encode(value)
+        compression = None
+
+        if self._compression is not None and len(data) >= self._compress_min_bytes:
+            packed = zlib.compress(data) if self._compression == "zlib" else lzma.compress(data)
+            if len(packed) < len(data):
+                data, compression = packed, self._compression
+
+        return bytes((self._codec.codec_id | (_COMPRESSIONS[compression] << 4),)) + data
+
+    def loads(self, data: bytes) -> Any:
+        header = data[0]
+        if header == _LEGACY_PICKLE and PickleCodec.codec_id in self._codecs:
+            return pickle.loads(data)
+
+        codec = self._codecs.get(header & 0x0F)
+        if codec is None:
+            raise ValueError(f"Codec {header & 0x0F} is not readable by this serializer")
+
+        payload = memoryview(data)[1:]
+        compression = header >> 4
+        if compression == 1:
+            payload = zlib.decompress(payload)
+        elif compression == 2:
+            payload = lzma.decompress(payload)
+        elif compression != 0:
+            raise ValueError(f"Invalid compression in header: {compression}")
+        return codec.decode(bytes(payload))
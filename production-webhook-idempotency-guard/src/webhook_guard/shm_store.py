@@ -0,0 +1,398 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+
+from .models import CompactRecord, STATUS_CODES, WebhookState, WebhookStatus
+from .serialization import ResultSerializer
+
+
+_PENDING = STATUS_CODES[WebhookStatus.PENDING]
+_PROCESSING = STATUS_CODES[WebhookStatus.PROCESSING]
+_COMPLETE = STATUS_CODES[WebhookStatus.COMPLETE]
+_FAILED = STATUS_CODES[WebhookStatus.FAILED]
+_STATUS_BY_CODE = {code: status for status, code in STATUS_CODES.items()}
+
+_MAGIC = b"WHGSHM01"
+
+# magic, capacity, payload area offset, payload area size, payload bump pointer
+_FILE_HEADER = struct.Struct("<8sQQQQ")
+_HEADER_BYTES = 64
+_BUMP_OFFSET = 32
+
+# key digest, state byte (0 = empty, else status code + 1),
+# reserved_until_ns, created_ns, updated_ns, payload offset, payload length
+_SLOT = struct.Struct("<16sB7xqqqQI4x")
+
+_THREAD_STRIPES = 64
+
+# Byte-range locks: slot i locks one byte inside its own slot; the
+# payload allocator locks one byte inside the file header.
+_ALLOCATOR_LOCK = _BUMP_OFFSET
+_INIT_LOCK = 0
+
+
+class _Table:
+    """One process's mapping of a table file, shared by its stores."""
+
+    __slots__ = (
+        "key", "fd", "mm", "capacity", "payload_offset", "payload_bytes",
+        "thread_locks", "allocator_mutex", "refs",
+    )
+
+    def __init__(self, key: Tuple[int, int], fd: int, mm: mmap.mmap, header: Tuple[Any, ...]):
+        self.key = key
+        self.fd = fd
+        self.mm = mm
+        _, self.capacity, self.payload_offset, self.payload_bytes, _ = header
+        self.thread_locks = [threading.Lock() for _ in range(_THREAD_STRIPES)]
+        self.allocator_mutex = threading.Lock()
+        self.refs = 0
+
+
+# fcntl locks belong to the process, and closing ANY descriptor of a
+# file drops all of them: every store on one file in this process
+# shares a single descriptor and mapping, keyed by (st_dev, st_ino)
+_TABLES: Dict[Tuple[int, int], _Table] = {}
+_TABLES_MUTEX = threading.Lock()
+
+
+class SharedMemoryStore:
+    """
+    WebhookStore shared by every process on a host through one mmap'd file.
+
+    For pre-forked workers: duplicates that land on different workers are
+    deduplicated without any IPC round trip. Put the file on /dev/shm for
+    a RAM-backed table, or on disk to survive restarts.
+
+    Layout:
+    - Fixed-capacity open-addressing hash table (linear probing) of
+      64-byte slots: key digest, status byte, int-ns timestamps and the
+      location of the slot's payload
+    - Payload area: append-only region holding encoded (result, error,
+      owner) tuples, allocated with a bump pointer
+
+    Concurrency:
+    - Each slot is guarded by an fcntl byte-range lock on its own bytes
+      (released by the kernel if the holder dies) plus an in-process
+      striped lock, since fcntl locks do not exclude threads
+    - Slots are never freed, so concurrent inserters of the same key
+      always probe the same sequence and meet in the same slot
+
+    Limits:
+    - Keys are 128-bit blake2b digests of webhook_id
+    - No deletion or retention: size capacity and payload_bytes for the
+      retention window and recreate the file to reset
+    - Create the store before forking, with no operation in flight
+    - Stores opened on the same file in one process share its
+      descriptor and mapping (closing one would otherwise drop the
+      other's fcntl locks); it is closed with the last of them
+
+    Payloads are encoded by serializer (pickle unless configured
+    otherwise; see ResultSerializer): with pickle, only map files you
+    trust.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = 1 << 20,
+        payload_bytes: int = 256 * 1024 * 1024,
+        serializer: Optional[ResultSerializer] = None,
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self._serializer = serializer if serializer is not None else ResultSerializer()
+        with _TABLES_MUTEX:
+            table = _attach(path, capacity, payload_bytes)
+            table.refs += 1
+
+        self._table: Optional[_Table] = table
+        self._fd = table.fd
+        self._mm = table.mm
+        self._capacity = table.capacity
+        self._payload_offset = table.payload_offset
+        self._payload_bytes = table.payload_bytes
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def close(self) -> None:
+        """Detach; the file is closed once no store in this process uses it."""
+        with _TABLES_MUTEX:
+            table, self._table = self._table, None
+            if table is None:
+                return
+            table.refs -= 1
+            if table.refs == 0:
+                del _TABLES[table.key]
+                table.mm.close()
+                os.close(table.fd)
+
+    # ---------- WebhookStore ----------
+
+    def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        with self._slot(webhook_id, claim=False) as (_, record):
+            return record.to_state(webhook_id) if record is not None else None
+
+    def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        """
+        Atomic reservation semantics (across every attached process).
+
+        Returns:
+            (True, None) if newly reserved
+            (False, existing_state) if already exists
+        """
+        with self._slot(webhook_id, claim=True) as (index, record):
+            if record is not None:
+                return False, record.to_state(webhook_id)
+
+            now = time.time_ns()
+            self._write(index, CompactRecord(
+                status_code=_PENDING,
+                reserved_until_ns=now + timeout_seconds * 1_000_000_000,
+                result=None,
+                error=None,
+                created_ns=now,
+                updated_ns=now,
+            ))
+            return True, None
+
+    def begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        """Single-step reservation into PROCESSING (see SupportsBegin)."""
+        with self._slot(webhook_id, claim=True) as (index, existing):
+            now = time.time_ns()
+
+            if existing is not None:
+                if existing.is_terminal:
+                    return False, existing.to_state(webhook_id)
+
+                if existing.reserved_until_ns is not None and existing.reserved_until_ns > now:
+                    return False, existing.to_state(webhook_id)
+
+            self._write(index, CompactRecord(
+                status_code=_PROCESSING,
+                reserved_until_ns=now + timeout_seconds * 1_000_000_000,
+                result=None,
+                error=None,
+                created_ns=existing.created_ns if existing is not None else now,
+                updated_ns=now,
+                owner=owner,
+            ))
+            return True, None
+
+    def mark_processing(self, webhook_id: str) -> None:
+        self._transition(webhook_id, _PENDING, _PROCESSING, None, None)
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        self._transition(webhook_id, _PROCESSING, _COMPLETE, result, None)
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        self._transition(webhook_id, _PROCESSING, _FAILED, None, error)
+
+    # ---------- owner-checked transitions (see SupportsOwnedTransitions) ----------
+
+    def mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        self._transition(webhook_id, _PROCESSING, _COMPLETE, result, None, owner)
+
+    def mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        self._transition(webhook_id, _PROCESSING, _FAILED, None, error, owner)
+
+    # ---------- internals ----------
+
+    def _transition(
+        self,
+        webhook_id: str,
+        expected: int,
+        target: int,
+        result: Any,
+        error: Optional[str],
+        owner: Optional[str] = None,
+    ) -> None:
+        with self._slot(webhook_id, claim=False) as (index, record):
+            if record is None:
+                raise ValueError(f"Webhook {webhook_id} does not exist")
+
+            if record.status_code != expected:
+                raise ValueError(
+                    f"Webhook {webhook_id} is in {record.status} state, cannot mark {_STATUS_BY_CODE[target].value}"
+                )
+
+            if owner is not None and record.owner != owner:
+                raise ValueError(
+                    f"Webhook {webhook_id} is owned by another worker, cannot mark {_STATUS_BY_CODE[target].value}"
+                )
+
+            self._write(index, CompactRecord(
+                status_code=target,
+                reserved_until_ns=record.reserved_until_ns,
+                result=result,
+                error=error,
+                created_ns=record.created_ns,
+                updated_ns=time.time_ns(),
+                owner=record.owner,
+            ), keep_payload=target == _PROCESSING)
+
+    @contextmanager
+    def _slot(self, webhook_id: str, claim: bool) -> Iterator[Tuple[int, Optional[CompactRecord]]]:
+        """
+        Find (or, with claim=True, claim) the slot for webhook_id and hold
+        its lock for the duration of the block.
+        """
+        digest = hashlib.blake2b(webhook_id.encode("utf-8"), digest_size=16).digest()
+        home = int.from_bytes(digest[:8], "little") % self._capacity
+
+        for probe in range(self._capacity):
+            index = (home + probe) % self._capacity
+            self._lock(index)
+            try:
+                key, state, *_ = _SLOT.unpack_from(self._mm, self._slot_offset(index))
+                if state == 0:
+                    if not claim:
+                        yield index, None
+                        return
+                    self._mm[self._slot_offset(index):self._slot_offset(index) + 16] = digest
+                    yield index, None
+                    return
+
+                if key == digest:
+                    yield index, self._record(index)
+                    return
+            finally:
+                self._unlock(index)
+
+        if not claim:
+            yield -1, None
+            return
+        raise RuntimeError("Shared-memory webhook table is full")
+
+    def _record(self, index: int) -> CompactRecord:
+        _, state, reserved_until_ns, created_ns, updated_ns, offset, length = _SLOT.unpack_from(
+            self._mm, self._slot_offset(index)
+        )
+        result, error, owner = None, None, None
+        if length:
+            result, error, owner = self._serializer.loads(self._mm[offset:offset + length])
+
+        return CompactRecord(
+            status_code=state - 1,
+            reserved_until_ns=reserved_until_ns,
+            result=result,
+            error=error,
+            created_ns=created_ns,
+            updated_ns=updated_ns,
+            owner=owner,
+        )
+
+    def _write(self, index: int, record: CompactRecord, keep_payload: bool = False) -> None:
+        slot_offset = self._slot_offset(index)
+        key, _, _, _, _, offset, length = _SLOT.unpack_from(self._mm, slot_offset)
+
+        if not keep_payload:
+            offset, length = 0, 0
+            if record.result is not None or record.error is not None or record.owner is not None:
+                offset, length = self._allocate(
+                    self._serializer.dumps((record.result, record.error, record.owner))
+                )
+
+        _SLOT.pack_into(
+            self._mm,
+            slot_offset,
+            key,
+            record.status_code + 1,
+            record.reserved_until_ns,
+            record.created_ns,
+            record.updated_ns,
+            offset,
+            length,
+        )
+
+    def _allocate(self, payload: bytes) -> Tuple[int, int]:
+        with self._table.allocator_mutex:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, _ALLOCATOR_LOCK)
+            try:
+                (bump,) = struct.unpack_from("<Q", self._mm, _BUMP_OFFSET)
+                if bump + len(payload) > self._payload_bytes:
+                    raise RuntimeError("Shared-memory webhook payload area is full")
+
+                offset = self._payload_offset + bump
+                self._mm[offset:offset + len(payload)] = payload
+                struct.pack_into("<Q", self._mm, _BUMP_OFFSET, bump + len(payload))
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, _ALLOCATOR_LOCK)
+        return offset, len(payload)
+
+    def _slot_offset(self, index: int) -> int:
+        return _HEADER_BYTES + index * _SLOT.size
+
+    def _lock(self, index: int) -> None:
+        mutex = self._table.thread_locks[index % _THREAD_STRIPES]
+        mutex.acquire()
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, self._slot_offset(index))
+        except BaseException:
+            mutex.release()
+            raise
+
+    def _unlock(self, index: int) -> None:
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, self._slot_offset(index))
+        finally:
+            self._table.thread_locks[index % _THREAD_STRIPES].release()
+
+
+def _attach(path: str, capacity: int, payload_bytes: int) -> _Table:
+    # Caller holds _TABLES_MUTEX. Look the file up before opening it: a
+    # second descriptor, once closed, would drop this process's locks.
+    try:
+        st = os.stat(path)
+        table = _TABLES.get((st.st_dev, st.st_ino))
+        if table is not None:
+            return table
+    except FileNotFoundError:
+        pass
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX, 1, _INIT_LOCK)
+        try:
+            if os.fstat(fd).st_size == 0:
+                payload_offset = _HEADER_BYTES + capacity * _SLOT.size
+                os.ftruncate(fd, payload_offset + payload_bytes)
+                os.pwrite(fd, _FILE_HEADER.pack(_MAGIC, capacity, payload_offset, payload_bytes, 0), 0)
+            header = _FILE_HEADER.unpack(os.pread(fd, _FILE_HEADER.size, 0))
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN, 1, _INIT_LOCK)
+
+        if header[0] != _MAGIC:
+            raise ValueError(f"{path} is not a webhook shared-memory table")
+
+        mm = mmap.mmap(fd, header[2] + header[3])
+    except BaseException:
+        os.close(fd)
+        raise
+
+    st = os.fstat(fd)
+    table = _TABLES[(st.st_dev, st.st_ino)] = _Table((st.st_dev, st.st_ino), fd, mm, header)
+    return table
+
+
+def _after_fork() -> None:
+    # A lock held by another thread at fork time would never be released
+    global _TABLES_MUTEX
+    _TABLES_MUTEX = threading.Lock()
+    for table in _TABLES.values():
+        table.thread_locks = [threading.Lock() for _ in range(_THREAD_STRIPES)]
+        table.allocator_mutex = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,468 @@
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+import functools
+import sqlite3
+import threading
+import time
+import weakref
+
+from .group_commit import GroupCommitWriter
+from .models import CompactRecord, ResultRef, STATUS_CODES, WebhookState, WebhookStatus, _STATUS_BY_CODE, to_epoch_ns
+from .serialization import ResultSerializer
+
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER on old builds
+_IN_CHUNK = 500
+
+# status holds models.STATUS_CODES: 0 PENDING, 1 PROCESSING, 2 COMPLETE, 3 FAILED
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_state (
+    webhook_id        TEXT PRIMARY KEY,
+    status            INTEGER NOT NULL,
+    reserved_until_ns INTEGER,
+    result            BLOB,
+    error             TEXT,
+    created_ns        INTEGER NOT NULL,
+    updated_ns        INTEGER NOT NULL,
+    owner             TEXT
+) WITHOUT ROWID
+"""
+
+# Results above the inline limit live here; their state row keeps
+# result NULL (an inline result is never NULL: None encodes to bytes).
+_RESULT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_result (
+    webhook_id TEXT PRIMARY KEY,
+    result     BLOB NOT NULL
+)
+"""
+
+# Partial index: only open (PENDING/PROCESSING) rows are indexed, so
+# terminal history does not grow it and find_expired reads k entries.
+_OPEN_INDEX = """
+CREATE INDEX IF NOT EXISTS webhook_state_open_idx
+ON webhook_state (reserved_until_ns) WHERE status IN (0, 1)
+"""
+
+# begin() taking over an expired reservation (its owner changes while
+# PROCESSING) drops any blob left behind, in the same statement
+_TAKEOVER_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS webhook_state_takeover
+AFTER UPDATE OF owner ON webhook_state WHEN NEW.status = 1
+BEGIN
+    DELETE FROM webhook_result WHERE webhook_id = NEW.webhook_id;
+END
+"""
+
+_PUT_RESULT = "INSERT OR REPLACE INTO webhook_result (webhook_id, result) VALUES (?, ?)"
+
+_GET_RESULT = "SELECT result FROM webhook_result WHERE webhook_id = ?"
+
+_COMPLETE = STATUS_CODES[WebhookStatus.COMPLETE]
+
+_COLUMNS = "webhook_id, status, reserved_until_ns, result, error, created_ns, updated_ns, owner"
+
+_SELECT = f"SELECT {_COLUMNS} FROM webhook_state WHERE webhook_id = ?"
+
+# Served by webhook_state_open_idx, already in reserved_until order
+_FIND_EXPIRED = f"""
+SELECT {_COLUMNS} FROM webhook_state
+WHERE status IN (0, 1) AND reserved_until_ns <= ?
+ORDER BY reserved_until_ns
+LIMIT ?
+"""
+
+_RESERVE = """
+INSERT INTO webhook_state (webhook_id, status, reserved_until_ns, created_ns, updated_ns)
+VALUES (?, 0, ?, ?, ?)
+ON CONFLICT (webhook_id) DO NOTHING
+RETURNING webhook_id
+"""
+
+# New ids are inserted; PENDING/PROCESSING ids whose lease has passed are
+# taken over; live or terminal ids are left alone (no row returned).
+_BEGIN = """
+INSERT INTO webhook_state (webhook_id, status, reserved_until_ns, created_ns, updated_ns, owner)
+VALUES (?, 1, ?, ?, ?, ?)
+ON CONFLICT (webhook_id) DO UPDATE SET
+    status = 1,
+    reserved_until_ns = excluded.reserved_until_ns,
+    result = NULL,
+    error = NULL,
+    updated_ns = excluded.updated_ns,
+    owner = excluded.owner
+WHERE webhook_state.status IN (0, 1)
+  AND webhook_state.reserved_until_ns <= excluded.updated_ns
+RETURNING webhook_id
+"""
+
+_MARK_PROCESSING = """
+UPDATE webhook_state SET status = 1, updated_ns = ?
+WHERE webhook_id = ? AND status = 0
+RETURNING webhook_id
+"""
+
+# The last parameter is the expected owner; NULL matches any owner
+_MARK_COMPLETE = """
+UPDATE webhook_state SET status = 2, result = ?, error = NULL, updated_ns = ?
+WHERE webhook_id = ? AND status = 1 AND owner IS COALESCE(?, owner)
+RETURNING webhook_id
+"""
+
+_MARK_FAILED = """
+UPDATE webhook_state SET status = 3, result = NULL, error = ?, updated_ns = ?
+WHERE webhook_id = ? AND status = 1 AND owner IS COALESCE(?, owner)
+RETURNING webhook_id
+"""
+
+
+class SqliteStore:
+    """
+    Durable single-host WebhookStore backed by SQLite.
+
+    Guarantees (same as WebhookStore):
+    - Atomic reservation via INSERT ... ON CONFLICT DO NOTHING RETURNING
+    - Valid state transitions only (conditional UPDATE ... RETURNING)
+    - Terminal states are immutable
+
+    Performance:
+    - WAL journaling: readers never block the single writer
+    - synchronous=NORMAL by default (durable across process crashes;
+      the last transactions may roll back on power loss)
+    - One connection per thread, each with a prepared-statement cache,
+      closed when its thread exits
+    - Implements begin() and the bulk operations (SupportsBegin,
+      SupportsBulk); bulk writes share one transaction
+    - Owner-checked terminal writes (SupportsOwnedTransitions) are the
+      same single conditional UPDATE
+    - find_expired() (SupportsFindExpired) walks a partial index over
+      open rows only, oldest reservation first
+    - Optional group commit (group_commit_window_seconds): concurrent
+      mark_complete/mark_failed calls share one transaction; each
+      caller returns once its batch is committed
+    - Results larger than inline_result_max_bytes (encoded) are kept
+      out of line in a side table: state reads return a ResultRef and
+      the blob is read only when the result is used
+
+    Results are encoded by serializer (pickle unless configured
+    otherwise; see ResultSerializer): with pickle, only point it at a
+    database you trust.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        busy_timeout_seconds: float = 30.0,
+        cached_statements: int = 128,
+        synchronous: str = "NORMAL",
+        group_commit_window_seconds: Optional[float] = None,
+        group_commit_max_batch: int = 64,
+        inline_result_max_bytes: int = 8192,
+        serializer: Optional[ResultSerializer] = None,
+    ):
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Invalid synchronous mode: {synchronous}")
+
+        self._path = path
+        self._busy_timeout = busy_timeout_seconds
+        self._cached_statements = cached_statements
+        self._synchronous = synchronous.upper()
+        self._inline_limit = inline_result_max_bytes
+        self._serializer = serializer if serializer is not None else ResultSerializer()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_mutex = threading.Lock()
+
+        self._terminal_writer: Optional[GroupCommitWriter[Tuple[str, WebhookStatus, Any, Optional[str]]]] = None
+        if group_commit_window_seconds is not None:
+            self._terminal_writer = GroupCommitWriter(
+                self._commit_terminal_batch,
+                window_seconds=group_commit_window_seconds,
+                max_batch=group_commit_max_batch,
+            )
+
+        self._connection().execute(_SCHEMA)
+        self._connection().execute(_RESULT_SCHEMA)
+        self._connection().execute(_OPEN_INDEX)
+        self._connection().execute(_TAKEOVER_TRIGGER)
+
+    # ---------- connections ----------
+
+    def _connection(self) -> sqlite3.Connection:
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            conn = sqlite3.connect(
+                self._path,
+                timeout=self._busy_timeout,
+                isolation_level=None,  # autocommit; explicit BEGIN for batches
+                check_same_thread=False,
+                cached_statements=self._cached_statements,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self._synchronous}")
+            holder = self._local.holder = _ThreadConnection(conn)
+            with self._connections_mutex:
+                self._connections.append(conn)
+            # The thread-local holder dies with its thread: close then
+            weakref.finalize(holder, _close_connection, conn, self._connections, self._connections_mutex)
+        return holder.conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close every per-thread connection opened by this store."""
+        with self._connections_mutex:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    # ---------- WebhookStore ----------
+
+    def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        row = self._connection().execute(_SELECT, (webhook_id,)).fetchone()
+        return self._to_state(row) if row is not None else None
+
+    def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        """
+        Atomic reservation semantics.
+
+        Returns:
+            (True, None) if newly reserved
+            (False, existing_state) if already exists
+        """
+        return self._reserve(self._connection(), webhook_id, timeout_seconds)
+
+    def begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        """Single-statement reservation into PROCESSING (see SupportsBegin)."""
+        conn = self._connection()
+        now = time.time_ns()
+        row = conn.execute(
+            _BEGIN,
+            (webhook_id, now + timeout_seconds * 1_000_000_000, now, now, owner),
+        ).fetchone()
+        if row is not None:
+            return True, None
+        return False, self.get_state(webhook_id)
+
+    def mark_processing(self, webhook_id: str) -> None:
+        self._mark_processing(self._connection(), webhook_id)
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        self._terminal(webhook_id, WebhookStatus.COMPLETE, result, None)
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        self._terminal(webhook_id, WebhookStatus.FAILED, error, None)
+
+    # ---------- owner-checked transitions (see SupportsOwnedTransitions) ----------
+
+    def mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        self._terminal(webhook_id, WebhookStatus.COMPLETE, result, owner)
+
+    def mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        self._terminal(webhook_id, WebhookStatus.FAILED, error, owner)
+
+    def _terminal(self, webhook_id: str, status: WebhookStatus, value: Any, owner: Optional[str]) -> None:
+        if status == WebhookStatus.COMPLETE:
+            # Encode in the caller: a result that cannot be serialized
+            # fails this call only, never a shared group-commit batch
+            value = self._serializer.dumps(value)
+        if self._terminal_writer is not None:
+            self._terminal_writer.submit((webhook_id, status, value, owner))
+        elif status == WebhookStatus.COMPLETE:
+            self._mark_complete(self._connection(), webhook_id, value, owner)
+        else:
+            self._mark_failed(self._connection(), webhook_id, value, owner)
+
+    # ---------- bulk operations (see SupportsBulk) ----------
+
+    def get_states(self, webhook_ids: Sequence[str]) -> Dict[str, WebhookState]:
+        conn = self._connection()
+        ids = list(webhook_ids)
+        states: Dict[str, WebhookState] = {}
+        for offset in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[offset:offset + _IN_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM webhook_state WHERE webhook_id IN ({placeholders})",
+                chunk,
+            )
+            for row in rows:
+                states[row[0]] = self._to_state(row)
+        return states
+
+    def reserve_many(
+        self, webhook_ids: Sequence[str], timeout_seconds: int
+    ) -> List[Tuple[bool, Optional[WebhookState]]]:
+        with self._transaction() as conn:
+            return [self._reserve(conn, webhook_id, timeout_seconds) for webhook_id in webhook_ids]
+
+    def mark_processing_many(self, webhook_ids: Sequence[str]) -> None:
+        with self._transaction() as conn:
+            for webhook_id in webhook_ids:
+                self._mark_processing(conn, webhook_id)
+
+    def mark_complete_many(self, results: Mapping[str, Any]) -> None:
+        blobs = {webhook_id: self._serializer.dumps(result) for webhook_id, result in results.items()}
+        with self._transaction() as conn:
+            for webhook_id, blob in blobs.items():
+                self._mark_complete(conn, webhook_id, blob)
+
+    def mark_failed_many(self, errors: Mapping[str, str]) -> None:
+        with self._transaction() as conn:
+            for webhook_id, error in errors.items():
+                self._mark_failed(conn, webhook_id, error)
+
+    # ---------- stale reservations (see SupportsFindExpired) ----------
+
+    def find_expired(self, now: Optional[datetime] = None, limit: int = 100) -> List[WebhookState]:
+        cutoff = time.time_ns() if now is None else to_epoch_ns(now)
+        rows = self._connection().execute(_FIND_EXPIRED, (cutoff, limit))
+        return [self._to_state(row) for row in rows]
+
+    # ---------- group commit ----------
+
+    def _commit_terminal_batch(
+        self, writes: List[Tuple[str, WebhookStatus, Any, Optional[str]]]
+    ) -> List[Optional[BaseException]]:
+        # Each write gets its own savepoint: whatever fails (an invalid
+        # transition or anything else) fails only its own caller
+        errors: List[Optional[BaseException]] = []
+        with self._transaction() as conn:
+            for webhook_id, status, value, owner in writes:
+                conn.execute("SAVEPOINT terminal_write")
+                try:
+                    if status == WebhookStatus.COMPLETE:
+                        self._mark_complete(conn, webhook_id, value, owner)
+                    else:
+                        self._mark_failed(conn, webhook_id, value, owner)
+                    errors.append(None)
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO terminal_write")
+                    errors.append(exc)
+                conn.execute("RELEASE terminal_write")
+        return errors
+
+    def _load_result(self, webhook_id: str) -> Any:
+        row = self._connection().execute(_GET_RESULT, (webhook_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Result for webhook {webhook_id} is missing")
+        return self._serializer.loads(row[0])
+
+    def _to_state(self, row: Tuple[Any, ...]) -> WebhookState:
+        webhook_id, status, reserved_until_ns, result, error, created_ns, updated_ns, owner = row
+        if result is not None:
+            value = self._serializer.loads(result)
+        elif status == _COMPLETE:
+            value = ResultRef(functools.partial(self._load_result, webhook_id))
+        else:
+            value = None
+
+        return CompactRecord(
+            status_code=status,
+            reserved_until_ns=reserved_until_ns,
+            result=value,
+            error=error,
+            created_ns=created_ns,
+            updated_ns=updated_ns,
+            owner=owner,
+        ).to_state(webhook_id)
+
+    # ---------- statements ----------
+
+    def _reserve(
+        self, conn: sqlite3.Connection, webhook_id: str, timeout_seconds: int
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        now = time.time_ns()
+        row = conn.execute(
+            _RESERVE,
+            (webhook_id, now + timeout_seconds * 1_000_000_000, now, now),
+        ).fetchone()
+        if row is not None:
+            return True, None
+
+        existing = conn.execute(_SELECT, (webhook_id,)).fetchone()
+        return False, self._to_state(existing) if existing is not None else None
+
+    def _mark_processing(self, conn: sqlite3.Connection, webhook_id: str) -> None:
+        row = conn.execute(_MARK_PROCESSING, (time.time_ns(), webhook_id)).fetchone()
+        if row is None:
+            raise _transition_error(conn, webhook_id, WebhookStatus.PROCESSING)
+
+    def _mark_complete(
+        self, conn: sqlite3.Connection, webhook_id: str, blob: bytes, owner: Optional[str] = None
+    ) -> None:
+        # blob is the result already encoded by the serializer
+        if len(blob) <= self._inline_limit:
+            self._complete_row(conn, webhook_id, blob, owner)
+        elif conn.in_transaction:
+            self._complete_out_of_line(conn, webhook_id, blob, owner)
+        else:
+            # The state row and its blob must commit together
+            with self._transaction() as tx:
+                self._complete_out_of_line(tx, webhook_id, blob, owner)
+
+    def _complete_out_of_line(
+        self, conn: sqlite3.Connection, webhook_id: str, blob: bytes, owner: Optional[str]
+    ) -> None:
+        # Transition first: a rejected id never leaves a blob behind
+        self._complete_row(conn, webhook_id, None, owner)
+        conn.execute(_PUT_RESULT, (webhook_id, blob))
+
+    def _complete_row(
+        self, conn: sqlite3.Connection, webhook_id: str, blob: Optional[bytes], owner: Optional[str]
+    ) -> None:
+        row = conn.execute(_MARK_COMPLETE, (blob, time.time_ns(), webhook_id, owner)).fetchone()
+        if row is None:
+            raise _transition_error(conn, webhook_id, WebhookStatus.COMPLETE, owner)
+
+    def _mark_failed(
+        self, conn: sqlite3.Connection, webhook_id: str, error: str, owner: Optional[str] = None
+    ) -> None:
+        row = conn.execute(_MARK_FAILED, (error, time.time_ns(), webhook_id, owner)).fetchone()
+        if row is None:
+            raise _transition_error(conn, webhook_id, WebhookStatus.FAILED, owner)
+
+
+class _ThreadConnection:
+    """One thread's connection, held in the store's threading.local."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _close_connection(
+    conn: sqlite3.Connection, connections: List[sqlite3.Connection], mutex: threading.Lock
+) -> None:
+    with mutex:
+        if conn in connections:
+            connections.remove(conn)
+    conn.close()
+
+
+def _transition_error(
+    conn: sqlite3.Connection, webhook_id: str, target: WebhookStatus, owner: Optional[str] = None
+) -> ValueError:
+    row = conn.execute("SELECT status, owner FROM webhook_state WHERE webhook_id = ?", (webhook_id,)).fetchone()
+    if row is None:
+        return ValueError(f"Webhook {webhook_id} does not exist")
+    if row[0] == 1 and owner is not None and row[1] != owner:
+        return ValueError(f"Webhook {webhook_id} is owned by another worker, cannot mark {target.value}")
+    return ValueError(
+        f"Webhook {webhook_id} is in {_STATUS_BY_CODE[row[0]]} state, cannot mark {target.value}"
+    )
@@ -1,7 +1,17 @@
-from typing import Optional, Tuple, Any, Protocol
+from typing import Optional, Tuple, Any, Protocol, Dict, List, Sequence, Mapping, Callable
 from datetime import datetime, timedelta
+import heapq
+import threading
+import time
 
-from .models import WebhookState, WebhookStatus
+from .models import CompactRecord, STATUS_CODES, WebhookState, WebhookStatus, to_epoch_ns
+from .wheel import TimingWheel
+
+
+_PENDING = STATUS_CODES[WebhookStatus.PENDING]
+_PROCESSING = STATUS_CODES[WebhookStatus.PROCESSING]
+_COMPLETE = STATUS_CODES[WebhookStatus.COMPLETE]
+_FAILED = STATUS_CODES[WebhookStatus.FAILED]
 
 
 class WebhookStore(Protocol):
@@ -30,6 +40,139 @@ class WebhookStore(Protocol):
         ...
 
 
+class SupportsBegin(Protocol):
+    """
+    Optional store capability: single-round-trip begin.
+
+    Merges get_state, reserve and mark_processing. WebhookGuard detects
+    it and uses it instead of the three separate calls.
+    """
+
+    def begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        """
+        Atomically move a new or expired webhook_id into PROCESSING.
+
+        "Expired" means a PENDING/PROCESSING record whose reserved_until
+        has passed (its worker is presumed crashed).
+
+        Returns:
+            (True, None) if now PROCESSING under owner
+            (False, existing_state) if terminal or reserved by a live worker
+        """
+        ...
+
+
+class SupportsBulk(Protocol):
+    """
+    Optional store capability: bulk operations.
+
+    Each call is a single round trip regardless of batch size.
+    WebhookGuard.process_many uses them when all are present.
+    """
+
+    def get_states(self, webhook_ids: Sequence[str]) -> Dict[str, WebhookState]:
+        """Return states for the ids that exist; missing ids are omitted."""
+        ...
+
+    def reserve_many(
+        self, webhook_ids: Sequence[str], timeout_seconds: int
+    ) -> List[Tuple[bool, Optional[WebhookState]]]:
+        """reserve() for each id, results in input order."""
+        ...
+
+    def mark_processing_many(self, webhook_ids: Sequence[str]) -> None:
+        ...
+
+    def mark_complete_many(self, results: Mapping[str, Any]) -> None:
+        ...
+
+    def mark_failed_many(self, errors: Mapping[str, str]) -> None:
+        ...
+
+
+class SupportsOwnedTransitions(Protocol):
+    """
+    Optional store capability: terminal writes conditioned on the owner
+    token recorded by begin() (compare-and-set).
+
+    A worker whose lease expired and was taken over can no longer
+    overwrite the new owner's record. With begin(), this makes the
+    store alone sufficient for concurrency control: WebhookGuard can
+    run with lock=None.
+    """
+
+    def mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        """
+        mark_complete(), only while PROCESSING under owner.
+
+        Raises:
+            ValueError if missing, not PROCESSING, or owned by another worker
+        """
+        ...
+
+    def mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        """mark_failed(), only while PROCESSING under owner."""
+        ...
+
+
+class SupportsPeekTerminal(Protocol):
+    """
+    Optional store capability: terminal states already held in process
+    memory, read without a round trip.
+
+    The guard checks it before taking the lock, so retries of finished
+    webhooks never pay for the lock. Only COMPLETE/FAILED states are
+    returned (they are immutable); anything else returns None. Never
+    does I/O, so it is a plain method on async stores too.
+    """
+
+    def peek_terminal(self, webhook_id: str) -> Optional[WebhookState]:
+        ...
+
+
+class SupportsFindExpired(Protocol):
+    """
+    Optional store capability: stale-reservation discovery for crash
+    recovery, backed by an index over non-terminal records.
+    """
+
+    def find_expired(self, now: Optional[datetime] = None, limit: int = 100) -> List[WebhookState]:
+        """
+        PENDING/PROCESSING records whose reserved_until is at or before
+        now (naive UTC, default: current time), oldest first, at most limit.
+        """
+        ...
+
+
+class AsyncWebhookStore(Protocol):
+    """
+    Asyncio variant of WebhookStore.
+
+    Same guarantees and transition rules as WebhookStore; every method is
+    a coroutine so network-backed stores never block the event loop.
+    """
+
+    async def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        ...
+
+    async def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        ...
+
+    async def mark_processing(self, webhook_id: str) -> None:
+        ...
+
+    # Optional: async def begin(webhook_id, timeout_seconds, owner), see SupportsBegin
+    # Optional: def peek_terminal(webhook_id), see SupportsPeekTerminal
+
+    async def mark_complete(self, webhook_id: str, result: Any) -> None:
+        ...
+
+    async def mark_failed(self, webhook_id: str, error: str) -> None:
+        ...
+
+
 class InMemoryStore:
     """
     In-memory reference implementation.
@@ -39,14 +182,59 @@ class InMemoryStore:
     - Local experiments
     - Demonstrating state transition rules
 
+    Not thread-safe; see StripedInMemoryStore for threaded workers.
+
+    Records are held as CompactRecord (slotted, integer timestamps) and
+    converted to WebhookState snapshots on read.
+
+    Retention:
+    - With retention_seconds, terminal records are dropped that long
+      after they became terminal (provider retry windows are finite)
+    - Expiry is driven by a timing wheel advanced on each call:
+      O(1) per record, no table scans
+    - PENDING/PROCESSING records never expire
+
+    Stale reservations:
+    - A min-heap of (reserved_until, webhook_id) covers non-terminal
+      records only; find_expired() pops the k oldest in O(k log n)
+    - Entries are invalidated lazily (checked against the live record
+      when popped) and the heap is rebuilt once most of it is stale
+
     NOT for production.
     """
 
-    def __init__(self):
-        self._data: dict[str, WebhookState] = {}
+    def __init__(
+        self,
+        retention_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._data: dict[str, CompactRecord] = {}
+        self._open: List[Tuple[int, str]] = []
+        self._stale = 0
+        self._retention = retention_seconds
+        self._clock = clock
+        self._expiry: Optional[TimingWheel[Tuple[str, CompactRecord]]] = None
+        if retention_seconds is not None:
+            if retention_seconds <= 0:
+                raise ValueError("retention_seconds must be positive")
+            self._expiry = TimingWheel(tick_seconds=min(1.0, retention_seconds), start=clock())
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._data)
 
     def get_state(self, webhook_id: str) -> Optional[WebhookState]:
-        return self._data.get(webhook_id)
+        self._expire()
+        record = self._data.get(webhook_id)
+        return record.to_state(webhook_id) if record is not None else None
+
+    def peek_terminal(self, webhook_id: str) -> Optional[WebhookState]:
+        # Everything here is local (see SupportsPeekTerminal)
+        self._expire()
+        record = self._data.get(webhook_id)
+        if record is None or record.status_code not in (_COMPLETE, _FAILED):
+            return None
+        return record.to_state(webhook_id)
 
     def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
         """
@@ -56,79 +244,415 @@ class InMemoryStore:
             (True, None) if newly reserved
             (False, existing_state) if already exists
         """
+        self._expire()
         existing = self._data.get(webhook_id)
         if existing is not None:
-            return False, existing
+            return False, existing.to_state(webhook_id)
 
-        now = datetime.utcnow()
-        state = WebhookState(
-            webhook_id=webhook_id,
-            status=WebhookStatus.PENDING,
-            reserved_until=now + timedelta(seconds=timeout_seconds),
+        now = time.time_ns()
+        self._set(webhook_id, CompactRecord(
+            status_code=_PENDING,
+            reserved_until_ns=now + timeout_seconds * 1_000_000_000,
             result=None,
             error=None,
-            created_at=now,
-            updated_at=now,
-        )
-        self._data[webhook_id] = state
+            created_ns=now,
+            updated_ns=now,
+        ))
         return True, None
 
-    def mark_processing(self, webhook_id: str) -> None:
-        state = self._data.get(webhook_id)
-        if state is None:
-            raise ValueError(f"Webhook {webhook_id} does not exist")
+    def begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        """
+        Single-step reservation into PROCESSING (see SupportsBegin).
 
-        if state.status != WebhookStatus.PENDING:
-            raise ValueError(
-                f"Webhook {webhook_id} is in {state.status} state, cannot mark PROCESSING"
-            )
+        Returns:
+            (True, None) if now PROCESSING under owner
+            (False, existing_state) if terminal or reserved by a live worker
+        """
+        self._expire()
+        existing = self._data.get(webhook_id)
+        now = time.time_ns()
 
-        self._data[webhook_id] = WebhookState(
-            webhook_id=state.webhook_id,
-            status=WebhookStatus.PROCESSING,
-            reserved_until=state.reserved_until,
-            result=state.result,
-            error=state.error,
-            created_at=state.created_at,
-            updated_at=datetime.utcnow(),
-        )
+        if existing is not None:
+            if existing.is_terminal:
+                return False, existing.to_state(webhook_id)
+
+            if existing.reserved_until_ns is not None and existing.reserved_until_ns > now:
+                return False, existing.to_state(webhook_id)
+
+        self._set(webhook_id, CompactRecord(
+            status_code=_PROCESSING,
+            reserved_until_ns=now + timeout_seconds * 1_000_000_000,
+            result=None,
+            error=None,
+            created_ns=existing.created_ns if existing is not None else now,
+            updated_ns=now,
+            owner=owner,
+        ))
+        return True, None
+
+    def mark_processing(self, webhook_id: str) -> None:
+        record = self._require(webhook_id, _PENDING, WebhookStatus.PROCESSING)
+
+        self._set(webhook_id, CompactRecord(
+            status_code=_PROCESSING,
+            reserved_until_ns=record.reserved_until_ns,
+            result=record.result,
+            error=record.error,
+            created_ns=record.created_ns,
+            updated_ns=time.time_ns(),
+            owner=record.owner,
+        ))
 
     def mark_complete(self, webhook_id: str, result: Any) -> None:
-        state = self._data.get(webhook_id)
-        if state is None:
-            raise ValueError(f"Webhook {webhook_id} does not exist")
+        self._complete(webhook_id, result, None)
 
-        if state.status != WebhookStatus.PROCESSING:
-            raise ValueError(
-                f"Webhook {webhook_id} is in {state.status} state, cannot mark COMPLETE"
-            )
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        self._fail(webhook_id, error, None)
 
-        self._data[webhook_id] = WebhookState(
-            webhook_id=state.webhook_id,
-            status=WebhookStatus.COMPLETE,
-            reserved_until=state.reserved_until,
+    # ---------- owner-checked transitions (see SupportsOwnedTransitions) ----------
+
+    def mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        self._complete(webhook_id, result, owner)
+
+    def mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        self._fail(webhook_id, error, owner)
+
+    def _complete(self, webhook_id: str, result: Any, owner: Optional[str]) -> None:
+        record = self._require(webhook_id, _PROCESSING, WebhookStatus.COMPLETE, owner)
+
+        terminal = CompactRecord(
+            status_code=_COMPLETE,
+            reserved_until_ns=record.reserved_until_ns,
             result=result,
             error=None,
-            created_at=state.created_at,
-            updated_at=datetime.utcnow(),
+            created_ns=record.created_ns,
+            updated_ns=time.time_ns(),
+            owner=record.owner,
         )
+        self._set(webhook_id, terminal)
+        self._schedule_expiry(webhook_id, terminal)
 
-    def mark_failed(self, webhook_id: str, error: str) -> None:
-        state = self._data.get(webhook_id)
-        if state is None:
+    def _fail(self, webhook_id: str, error: str, owner: Optional[str]) -> None:
+        record = self._require(webhook_id, _PROCESSING, WebhookStatus.FAILED, owner)
+
+        terminal = CompactRecord(
+            status_code=_FAILED,
+            reserved_until_ns=record.reserved_until_ns,
+            result=None,
+            error=error,
+            created_ns=record.created_ns,
+            updated_ns=time.time_ns(),
+            owner=record.owner,
+        )
+        self._set(webhook_id, terminal)
+        self._schedule_expiry(webhook_id, terminal)
+
+    def put(self, state: WebhookState) -> None:
+        """
+        Store a snapshot taken from another store as-is (tier promotion).
+
+        Bypasses the transition rules; terminal snapshots get retention.
+        """
+        self._expire()
+        record = CompactRecord.from_state(state)
+        self._set(state.webhook_id, record)
+        if record.is_terminal:
+            self._schedule_expiry(state.webhook_id, record)
+
+    def discard(self, webhook_id: str) -> None:
+        """Drop webhook_id if present (tier eviction)."""
+        self._reindex(webhook_id, self._data.pop(webhook_id, None), None)
+
+    def _require(
+        self, webhook_id: str, expected: int, target: WebhookStatus, owner: Optional[str] = None
+    ) -> CompactRecord:
+        self._expire()
+        record = self._data.get(webhook_id)
+        if record is None:
             raise ValueError(f"Webhook {webhook_id} does not exist")
 
-        if state.status != WebhookStatus.PROCESSING:
+        if record.status_code != expected:
             raise ValueError(
-                f"Webhook {webhook_id} is in {state.status} state, cannot mark FAILED"
+                f"Webhook {webhook_id} is in {record.status} state, cannot mark {target.value}"
             )
 
-        self._data[webhook_id] = WebhookState(
-            webhook_id=state.webhook_id,
-            status=WebhookStatus.FAILED,
-            reserved_until=state.reserved_until,
-            result=None,
-            error=error,
-            created_at=state.created_at,
-            updated_at=datetime.utcnow(),
-        )
+        if owner is not None and record.owner != owner:
+            raise ValueError(f"Webhook {webhook_id} is owned by another worker, cannot mark {target.value}")
+
+        return record
+
+    # ---------- bulk operations (see SupportsBulk) ----------
+
+    def get_states(self, webhook_ids: Sequence[str]) -> Dict[str, WebhookState]:
+        self._expire()
+        return {
+            webhook_id: self._data[webhook_id].to_state(webhook_id)
+            for webhook_id in webhook_ids
+            if webhook_id in self._data
+        }
+
+    def reserve_many(
+        self, webhook_ids: Sequence[str], timeout_seconds: int
+    ) -> List[Tuple[bool, Optional[WebhookState]]]:
+        return [self.reserve(webhook_id, timeout_seconds) for webhook_id in webhook_ids]
+
+    def mark_processing_many(self, webhook_ids: Sequence[str]) -> None:
+        for webhook_id in webhook_ids:
+            self.mark_processing(webhook_id)
+
+    def mark_complete_many(self, results: Mapping[str, Any]) -> None:
+        for webhook_id, result in results.items():
+            self.mark_complete(webhook_id, result)
+
+    def mark_failed_many(self, errors: Mapping[str, str]) -> None:
+        for webhook_id, error in errors.items():
+            self.mark_failed(webhook_id, error)
+
+    # ---------- stale reservations (see SupportsFindExpired) ----------
+
+    def find_expired(self, now: Optional[datetime] = None, limit: int = 100) -> List[WebhookState]:
+        self._expire()
+        cutoff = time.time_ns() if now is None else to_epoch_ns(now)
+        found: List[WebhookState] = []
+        live = set()
+
+        while self._open and len(found) < limit and self._open[0][0] <= cutoff:
+            entry = heapq.heappop(self._open)
+            if self._is_live(entry) and entry not in live:
+                live.add(entry)
+                found.append(self._data[entry[1]].to_state(entry[1]))
+            else:
+                self._stale -= 1
+
+        # Still stale-but-open: they stay discoverable until they move on
+        for entry in live:
+            heapq.heappush(self._open, entry)
+        return found
+
+    def _set(self, webhook_id: str, record: CompactRecord) -> None:
+        previous = self._data.get(webhook_id)
+        self._data[webhook_id] = record
+        self._reindex(webhook_id, previous, record)
+
+    def _reindex(
+        self, webhook_id: str, previous: Optional[CompactRecord], record: Optional[CompactRecord]
+    ) -> None:
+        old_key = previous.reserved_until_ns if previous is not None and not previous.is_terminal else None
+        new_key = record.reserved_until_ns if record is not None and not record.is_terminal else None
+        if old_key == new_key:
+            return
+
+        if new_key is not None:
+            heapq.heappush(self._open, (new_key, webhook_id))
+        if old_key is not None:
+            self._stale += 1
+            if self._stale > 1024 and self._stale * 2 > len(self._open):
+                self._open = [entry for entry in set(self._open) if self._is_live(entry)]
+                heapq.heapify(self._open)
+                self._stale = 0
+
+    def _is_live(self, entry: Tuple[int, str]) -> bool:
+        record = self._data.get(entry[1])
+        return record is not None and not record.is_terminal and record.reserved_until_ns == entry[0]
+
+    # ---------- retention ----------
+
+    def _schedule_expiry(self, webhook_id: str, record: CompactRecord) -> None:
+        if self._expiry is not None:
+            self._expiry.schedule(self._clock() + self._retention, (webhook_id, record))
+
+    def _expire(self) -> None:
+        if self._expiry is None:
+            return
+
+        for webhook_id, record in self._expiry.advance(self._clock()):
+            # Only drop the exact terminal record that was scheduled
+            if self._data.get(webhook_id) is record:
+                del self._data[webhook_id]
+
+
+class StripedInMemoryStore:
+    """
+    Thread-safe in-memory store for multi-threaded workers.
+
+    Keys are partitioned across N shards, each an InMemoryStore guarded
+    by its own lock, so reserve/begin are truly atomic under threads
+    while operations on different shards proceed in parallel.
+
+    Same transition rules and retention as InMemoryStore (each shard IS
+    one). Single-host only: state is not shared between processes.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        retention_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+
+        self._shards = [
+            (threading.Lock(), InMemoryStore(retention_seconds=retention_seconds, clock=clock))
+            for _ in range(shards)
+        ]
+
+    def _shard(self, webhook_id: str) -> Tuple[threading.Lock, InMemoryStore]:
+        return self._shards[hash(webhook_id) % len(self._shards)]
+
+    def _group(self, webhook_ids: Sequence[str]) -> Dict[int, List[str]]:
+        groups: Dict[int, List[str]] = {}
+        for webhook_id in webhook_ids:
+            groups.setdefault(hash(webhook_id) % len(self._shards), []).append(webhook_id)
+        return groups
+
+    def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            return shard.get_state(webhook_id)
+
+    def peek_terminal(self, webhook_id: str) -> Optional[WebhookState]:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            return shard.peek_terminal(webhook_id)
+
+    def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            return shard.reserve(webhook_id, timeout_seconds)
+
+    def begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            return shard.begin(webhook_id, timeout_seconds, owner)
+
+    def mark_processing(self, webhook_id: str) -> None:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            shard.mark_processing(webhook_id)
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            shard.mark_complete(webhook_id, result)
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            shard.mark_failed(webhook_id, error)
+
+    def mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            shard.mark_complete_owned(webhook_id, owner, result)
+
+    def mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            shard.mark_failed_owned(webhook_id, owner, error)
+
+    def put(self, state: WebhookState) -> None:
+        mutex, shard = self._shard(state.webhook_id)
+        with mutex:
+            shard.put(state)
+
+    def discard(self, webhook_id: str) -> None:
+        mutex, shard = self._shard(webhook_id)
+        with mutex:
+            shard.discard(webhook_id)
+
+    # ---------- bulk operations (see SupportsBulk) ----------
+
+    def get_states(self, webhook_ids: Sequence[str]) -> Dict[str, WebhookState]:
+        states: Dict[str, WebhookState] = {}
+        for index, group in self._group(webhook_ids).items():
+            mutex, shard = self._shards[index]
+            with mutex:
+                states.update(shard.get_states(group))
+        return states
+
+    def reserve_many(
+        self, webhook_ids: Sequence[str], timeout_seconds: int
+    ) -> List[Tuple[bool, Optional[WebhookState]]]:
+        outcomes: Dict[str, Tuple[bool, Optional[WebhookState]]] = {}
+        for index, group in self._group(webhook_ids).items():
+            mutex, shard = self._shards[index]
+            with mutex:
+                outcomes.update(zip(group, shard.reserve_many(group, timeout_seconds)))
+        return [outcomes[webhook_id] for webhook_id in webhook_ids]
+
+    def mark_processing_many(self, webhook_ids: Sequence[str]) -> None:
+        for index, group in self._group(webhook_ids).items():
+            mutex, shard = self._shards[index]
+            with mutex:
+                shard.mark_processing_many(group)
+
+    def mark_complete_many(self, results: Mapping[str, Any]) -> None:
+        for index, group in self._group(list(results)).items():
+            mutex, shard = self._shards[index]
+            with mutex:
+                shard.mark_complete_many({webhook_id: results[webhook_id] for webhook_id in group})
+
+    def mark_failed_many(self, errors: Mapping[str, str]) -> None:
+        for index, group in self._group(list(errors)).items():
+            mutex, shard = self._shards[index]
+            with mutex:
+                shard.mark_failed_many({webhook_id: errors[webhook_id] for webhook_id in group})
+
+    # ---------- stale reservations (see SupportsFindExpired) ----------
+
+    def find_expired(self, now: Optional[datetime] = None, limit: int = 100) -> List[WebhookState]:
+        # Each shard yields its own oldest-first run; merge and keep the head
+        runs = []
+        for mutex, shard in self._shards:
+            with mutex:
+                runs.append(shard.find_expired(now, limit))
+        merged = heapq.merge(*runs, key=lambda state: state.reserved_until)
+        return [state for state, _ in zip(merged, range(limit))]
+
+
+class AsyncInMemoryStore:
+    """
+    Asyncio adapter over InMemoryStore.
+
+    Shares the synchronous transition rules; each call completes without
+    yielding, which keeps reserve atomic on a single event loop.
+
+    NOT for production.
+    """
+
+    def __init__(self, store: Optional[InMemoryStore] = None):
+        self._store = store if store is not None else InMemoryStore()
+
+    async def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        return self._store.get_state(webhook_id)
+
+    def peek_terminal(self, webhook_id: str) -> Optional[WebhookState]:
+        return self._store.peek_terminal(webhook_id)
+
+    async def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        return self._store.reserve(webhook_id, timeout_seconds)
+
+    async def begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        return self._store.begin(webhook_id, timeout_seconds, owner)
+
+    async def mark_processing(self, webhook_id: str) -> None:
+        self._store.mark_processing(webhook_id)
+
+    async def mark_complete(self, webhook_id: str, result: Any) -> None:
+        self._store.mark_complete(webhook_id, result)
+
+    async def mark_failed(self, webhook_id: str, error: str) -> None:
+        self._store.mark_failed(webhook_id, error)
+
+    async def mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        self._store.mark_complete_owned(webhook_id, owner, result)
+
+    async def mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        self._store.mark_failed_owned(webhook_id, owner, error)
@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import threading
+
+from .models import WebhookState, WebhookStatus
+from .store import WebhookStore
+
+
+_TERMINAL = (WebhookStatus.COMPLETE, WebhookStatus.FAILED)
+
+
+class TieredStore:
+    """
+    Durable WebhookStore with a bounded in-memory hot tier in front.
+
+    cold is the source of truth: every reservation and transition goes
+    to it first, so atomicity is exactly cold's. hot holds recent states:
+    - Writes are mirrored into hot after cold accepts them
+    - Terminal states read from cold on a hot miss are promoted
+    - At most max_hot_entries ids are kept (LRU); hot's own retention
+      may drop them earlier
+
+    Reads are served from hot only for terminal states, which are
+    immutable by contract. Non-terminal states can move on another host,
+    so those reads always go to cold. The guard's retry fast path
+    (get_state on a finished webhook) therefore rarely reaches cold.
+
+    hot must be thread-safe if the store is shared between threads and
+    must support put() and discard() (InMemoryStore,
+    StripedInMemoryStore). begin(), get_states() and the owner-checked
+    transitions are offered when cold supports them; every other method is forwarded to cold.
+    peek_terminal() reads hot alone (see SupportsPeekTerminal).
+    """
+
+    def __init__(self, hot: WebhookStore, cold: WebhookStore, max_hot_entries: int = 100_000):
+        if max_hot_entries <= 0:
+            raise ValueError("max_hot_entries must be positive")
+        if not (hasattr(hot, "put") and hasattr(hot, "discard")):
+            raise ValueError("hot store must support put() and discard()")
+
+        self._hot = hot
+        self._cold = cold
+        self._max_hot_entries = max_hot_entries
+        self._resident: "OrderedDict[str, None]" = OrderedDict()
+        self._mutex = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Only advertise optional capabilities the durable store has
+        if hasattr(cold, "begin"):
+            self.begin = self._begin
+        if hasattr(cold, "get_states"):
+            self.get_states = self._get_states
+        if hasattr(cold, "mark_complete_owned") and hasattr(cold, "mark_failed_owned"):
+            self.mark_complete_owned = self._mark_complete_owned
+            self.mark_failed_owned = self._mark_failed_owned
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "_cold":
+            raise AttributeError(name)
+        return getattr(self._cold, name)
+
+    def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        state = self._hot_terminal(webhook_id)
+        if state is not None:
+            return state
+
+        state = self._cold.get_state(webhook_id)
+        self._promote(state)
+        return state
+
+    def peek_terminal(self, webhook_id: str) -> Optional[WebhookState]:
+        # A miss is counted by the get_state()/begin() that follows
+        return self._hot_terminal(webhook_id, count_miss=False)
+
+    def reserve(self, webhook_id: str, timeout_seconds: int) -> Tuple[bool, Optional[WebhookState]]:
+        reserved, existing = self._cold.reserve(webhook_id, timeout_seconds)
+        if reserved:
+            self._mirror(webhook_id, self._hot.reserve, timeout_seconds, fresh=True)
+        else:
+            self._promote(existing)
+        return reserved, existing
+
+    def mark_processing(self, webhook_id: str) -> None:
+        self._cold.mark_processing(webhook_id)
+        self._mirror(webhook_id, self._hot.mark_processing)
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        self._cold.mark_complete(webhook_id, result)
+        self._mirror(webhook_id, self._hot.mark_complete, result)
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        self._cold.mark_failed(webhook_id, error)
+        self._mirror(webhook_id, self._hot.mark_failed, error)
+
+    def _begin(
+        self, webhook_id: str, timeout_seconds: int, owner: str
+    ) -> Tuple[bool, Optional[WebhookState]]:
+        state = self._hot_terminal(webhook_id)
+        if state is not None:
+            return False, state
+
+        begun, existing = self._cold.begin(webhook_id, timeout_seconds, owner)
+        if begun:
+            self._mirror(webhook_id, self._hot.begin, timeout_seconds, owner, fresh=True)
+        else:
+            self._promote(existing)
+        return begun, existing
+
+    def _mark_complete_owned(self, webhook_id: str, owner: str, result: Any) -> None:
+        # cold checked the owner; hot only mirrors the accepted write
+        self._cold.mark_complete_owned(webhook_id, owner, result)
+        self._mirror(webhook_id, self._hot.mark_complete, result)
+
+    def _mark_failed_owned(self, webhook_id: str, owner: str, error: str) -> None:
+        self._cold.mark_failed_owned(webhook_id, owner, error)
+        self._mirror(webhook_id, self._hot.mark_failed, error)
+
+    def _get_states(self, webhook_ids: Sequence[str]) -> Dict[str, WebhookState]:
+        states: Dict[str, WebhookState] = {}
+        missing: List[str] = []
+        for webhook_id in webhook_ids:
+            state = self._hot_terminal(webhook_id)
+            if state is not None:
+                states[webhook_id] = state
+            else:
+                missing.append(webhook_id)
+
+        if missing:
+            fetched = self._cold.get_states(missing)
+            for state in fetched.values():
+                self._promote(state)
+            states.update(fetched)
+        return states
+
+    # ---------- hot tier ----------
+
+    def _hot_terminal(self, webhook_id: str, count_miss: bool = True) -> Optional[WebhookState]:
+        state = self._hot.get_state(webhook_id)
+        with self._mutex:
+            if state is not None and state.status in _TERMINAL:
+                if webhook_id in self._resident:
+                    self._resident.move_to_end(webhook_id)
+                self.hits += 1
+                return state
+            if count_miss:
+                self.misses += 1
+        return None
+
+    def _promote(self, state: Optional[WebhookState]) -> None:
+        if state is None or state.status not in _TERMINAL:
+            return
+        self._hot.put(state)
+        self._admit(state.webhook_id)
+
+    def _mirror(self, webhook_id: str, operation: Callable[..., Any], *args: Any, fresh: bool = False) -> None:
+        # cold already accepted the write; hot is best effort. A new lease
+        # replaces whatever hot held, and a mirror hot rejects (evicted or
+        # expired there) just leaves the id to cold.
+        if fresh:
+            self._hot.discard(webhook_id)
+        elif webhook_id not in self._resident:
+            return
+
+        try:
+            operation(webhook_id, *args)
+        except ValueError:
+            self._evict(webhook_id)
+            return
+        self._admit(webhook_id)
+
+    def _admit(self, webhook_id: str) -> None:
+        with self._mutex:
+            self._resident[webhook_id] = None
+            self._resident.move_to_end(webhook_id)
+            overflow = [
+                self._resident.popitem(last=False)[0]
+                for _ in range(len(self._resident) - self._max_hot_entries)
+            ]
+        for evicted in overflow:
+            self._hot.discard(evicted)
+
+    def _evict(self, webhook_id: str) -> None:
+        with self._mutex:
+            self._resident.pop(webhook_id, None)
+        self._hot.discard(webhook_id)
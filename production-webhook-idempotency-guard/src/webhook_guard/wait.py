@@ -0,0 +1,123 @@
+from collections import deque
+from typing import Any, Callable, Deque, Iterator, Protocol
+import random
+import statistics
+import threading
+import time
+
+
+class WaitStrategy(Protocol):
+    """
+    How a contended delivery waits for the worker already processing it.
+
+    delays() yields successive waits. After each one the guard re-reads
+    the state (a same-process completion wakes it early); once the
+    iterator is exhausted the delivery returns "currently being
+    processed".
+
+    Strategies may also define observe(duration_seconds): the guard
+    then reports the duration of every handler it runs.
+    """
+
+    def delays(self) -> Iterator[float]:
+        ...
+
+
+class FixedWait:
+    """One wait of `seconds`, then one re-read (the original behaviour)."""
+
+    def __init__(self, seconds: float = 1.0):
+        if seconds < 0:
+            raise ValueError("seconds must not be negative")
+        self._seconds = seconds
+
+    def delays(self) -> Iterator[float]:
+        yield self._seconds
+
+
+class BackoffWait:
+    """
+    Poll with capped exponential backoff plus jitter, up to a deadline.
+
+    Waits start at initial_seconds and grow by `multiplier` up to
+    max_delay_seconds. Each wait is shortened by a random fraction of
+    at most `jitter`, so duplicates delivered together do not re-read
+    in lockstep. The last wait is trimmed so the total never exceeds
+    deadline_seconds.
+
+    Fast handlers are picked up within a few tens of milliseconds; slow
+    ones cost one read per max_delay_seconds.
+    """
+
+    def __init__(
+        self,
+        initial_seconds: float = 0.05,
+        max_delay_seconds: float = 2.0,
+        deadline_seconds: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        rand: Callable[[], float] = random.random,
+    ):
+        if initial_seconds <= 0 or max_delay_seconds <= 0:
+            raise ValueError("initial_seconds and max_delay_seconds must be positive")
+        if deadline_seconds < 0:
+            raise ValueError("deadline_seconds must not be negative")
+        if multiplier < 1:
+            raise ValueError("multiplier must be at least 1")
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be in [0, 1)")
+
+        self._initial = initial_seconds
+        self._max_delay = max_delay_seconds
+        self._deadline = deadline_seconds
+        self._multiplier = multiplier
+        self._jitter = jitter
+        self._clock = clock
+        self._rand = rand
+
+    def delays(self) -> Iterator[float]:
+        start = self._clock()
+        delay = min(self._first_delay(), self._max_delay)
+        while True:
+            remaining = self._deadline - (self._clock() - start)
+            if remaining <= 0:
+                return
+            yield min(delay * (1 - self._jitter * self._rand()), remaining)
+            delay = min(delay * self._multiplier, self._max_delay)
+
+    def _first_delay(self) -> float:
+        return self._initial
+
+
+class AdaptiveWait(BackoffWait):
+    """
+    BackoffWait whose first wait is sized from recent handler durations.
+
+    The guard reports every handler it runs (observe()); the first wait
+    is half the median of the last `window` durations, since a duplicate
+    arrives on average halfway through the original's run. Until
+    anything has been observed it starts at initial_seconds.
+
+    Sharing one instance between guards pools their observations.
+    """
+
+    def __init__(self, window: int = 64, min_delay_seconds: float = 0.005, **backoff: Any):
+        super().__init__(**backoff)
+        if window <= 0:
+            raise ValueError("window must be positive")
+
+        self._min_delay = min_delay_seconds
+        self._durations: Deque[float] = deque(maxlen=window)
+        self._mutex = threading.Lock()
+
+    def observe(self, duration_seconds: float) -> None:
+        with self._mutex:
+            self._durations.append(duration_seconds)
+
+    def _first_delay(self) -> float:
+        with self._mutex:
+            if not self._durations:
+                return self._initial
+            median = statistics.median(self._durations)
+        return max(self._min_delay, median / 2)
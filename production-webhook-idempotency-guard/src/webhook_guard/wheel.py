@@ -0,0 +1,102 @@
+from typing import Any, Generic, List, Tuple, TypeVar
+import math
+
+
+T = TypeVar("T")
+
+_SLOT_BITS = 6
+_SLOTS = 1 << _SLOT_BITS
+_SLOT_MASK = _SLOTS - 1
+
+
+class TimingWheel(Generic[T]):
+    """
+    Hierarchical timing wheel for bulk expiry.
+
+    O(1) schedule; advancing costs O(1) per elapsed tick plus O(1) per
+    expired (or cascaded) item. No scans over pending items.
+
+    Layout:
+    - `levels` wheels of 64 slots each
+    - level l slot covers 64**l ticks
+    - deadlines beyond the top level are parked in it and re-cascaded
+
+    Timers cannot be cancelled: callers check validity when an item
+    fires (see InMemoryStore retention). Not thread-safe.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, levels: int = 4, start: float = 0.0):
+        if tick_seconds <= 0:
+            raise ValueError("tick_seconds must be positive")
+        if levels <= 0:
+            raise ValueError("levels must be positive")
+
+        self._tick = tick_seconds
+        self._levels = levels
+        self._span = _SLOTS ** levels
+        self._wheels: List[List[List[Tuple[int, T]]]] = [
+            [[] for _ in range(_SLOTS)] for _ in range(levels)
+        ]
+        self._current = int(start // tick_seconds)
+        self._count = 0
+        self._due: List[T] = []
+
+    def __len__(self) -> int:
+        return self._count + len(self._due)
+
+    def schedule(self, deadline: float, item: T) -> None:
+        """Schedule item to be returned by the first advance() at or after deadline."""
+        self._insert(math.ceil(deadline / self._tick), item)
+
+    def advance(self, now: float) -> List[T]:
+        """Move time forward to now and return every item that is due."""
+        target = int(now // self._tick)
+
+        if self._count == 0:
+            # Nothing scheduled: jump instead of walking idle ticks
+            self._current = max(self._current, target)
+
+        while self._current < target:
+            self._current += 1
+            current = self._current
+
+            # Cascade top-down so re-inserted items reach the lowest level
+            for level in range(self._levels - 1, 0, -1):
+                if current & ((1 << (_SLOT_BITS * level)) - 1) == 0:
+                    slot = (current >> (_SLOT_BITS * level)) & _SLOT_MASK
+                    bucket = self._wheels[level][slot]
+                    self._wheels[level][slot] = []
+                    self._count -= len(bucket)
+                    for tick, item in bucket:
+                        self._insert(tick, item)
+
+            bucket = self._wheels[0][current & _SLOT_MASK]
+            if bucket:
+                self._wheels[0][current & _SLOT_MASK] = []
+                self._count -= len(bucket)
+                self._due.extend(item for _, item in bucket)
+
+            if self._count == 0:
+                self._current = max(self._current, target)
+
+        due, self._due = self._due, []
+        return due
+
+    def _insert(self, tick: int, item: Any) -> None:
+        if tick <= self._current:
+            self._due.append(item)
+            return
+
+        # Park far-future deadlines in the top level; they re-cascade
+        placement = min(tick, self._current + self._span - 1)
+
+        # Lowest level whose higher digits already match the current tick
+        level = 0
+        while level < self._levels - 1 and (placement >> (_SLOT_BITS * (level + 1))) != (
+            self._current >> (_SLOT_BITS * (level + 1))
+        ):
+            level += 1
+
+        slot = (placement >> (_SLOT_BITS * level)) & _SLOT_MASK
+        self._wheels[level][slot].append((tick, item))
+        self._count += 1
@@ -0,0 +1,206 @@
+"""
+In-process stand-in for a Redis server, for RedisStore tests.
+
+Speaks RESP2 over a real socket and implements just the commands
+RedisStore and RedisLock send. Lua is not interpreted: each script SHA maps to a
+Python equivalent, run under one mutex so scripts stay atomic like on
+a real server. Commands are executed one at a time, as Redis does.
+
+The scripts themselves only run in test_redis_server.py, against a
+real server.
+"""
+
+import hashlib
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from webhook_guard.redis_lock import _RELEASE, _RENEW
+from webhook_guard.redis_store import _BEGIN, _RESERVE, _TRANSITION
+
+
+class _Error(str):
+    pass
+
+
+class _Status(str):
+    pass
+
+
+class RespStandin:
+    def __init__(self):
+        self._hashes: Dict[bytes, Dict[bytes, bytes]] = {}
+        self._strings: Dict[bytes, bytes] = {}
+        self._expires_ms: Dict[bytes, int] = {}
+        self._mutex = threading.Lock()
+        self._loaded = set()
+        self._scripts: Dict[str, Callable[[bytes, List[bytes]], Any]] = {
+            _RESERVE.sha: self._reserve,
+            _BEGIN.sha: self._begin,
+            _TRANSITION.sha: self._transition,
+            _RELEASE.sha: self._release,
+            _RENEW.sha: self._renew,
+        }
+        self.commands: List[bytes] = []
+
+        standin = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    args = _read_command(self.rfile)
+                    if args is None:
+                        return
+                    self.wfile.write(_encode(standin.execute(args)))
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def flush_scripts(self) -> None:
+        with self._mutex:
+            self._loaded.clear()
+
+    def pttl(self, key: str) -> int:
+        with self._mutex:
+            expires = self._expires_ms.get(key.encode())
+            return -1 if expires is None else expires - _now_ms()
+
+    # ---------- commands ----------
+
+    def execute(self, args: List[bytes]) -> Any:
+        name = args[0].upper()
+        with self._mutex:
+            self.commands.append(name)
+            if name in (b"PING",):
+                return _Status("PONG")
+            if name in (b"SELECT", b"AUTH"):
+                return _Status("OK")
+            if name == b"HGETALL":
+                fields = self._get(args[1]) or {}
+                return [item for pair in fields.items() for item in pair]
+            if name == b"SET":
+                # Only the SET key value NX PX ms form RedisLock uses
+                if self._get_string(args[1]) is not None:
+                    return None
+                self._strings[args[1]] = args[2]
+                self._expires_ms[args[1]] = _now_ms() + int(args[5])
+                return _Status("OK")
+            if name == b"GET":
+                return self._get_string(args[1])
+            if name == b"SCRIPT" and args[1].upper() == b"LOAD":
+                sha = hashlib.sha1(args[2]).hexdigest()
+                if sha not in self._scripts:
+                    return _Error("ERR unknown script in stand-in")
+                self._loaded.add(sha)
+                return sha.encode()
+            if name == b"EVALSHA":
+                sha = args[1].decode()
+                if sha not in self._loaded:
+                    return _Error("NOSCRIPT No matching script. Please use EVAL.")
+                return self._scripts[sha](args[3], args[4:])
+            return _Error(f"ERR unknown command '{name.decode()}'")
+
+    def _get(self, key: bytes) -> Optional[Dict[bytes, bytes]]:
+        self._expire(key)
+        return self._hashes.get(key)
+
+    def _get_string(self, key: bytes) -> Optional[bytes]:
+        self._expire(key)
+        return self._strings.get(key)
+
+    def _expire(self, key: bytes) -> None:
+        expires = self._expires_ms.get(key)
+        if expires is not None and expires <= _now_ms():
+            del self._expires_ms[key]
+            self._hashes.pop(key, None)
+            self._strings.pop(key, None)
+
+    # ---------- script equivalents ----------
+
+    def _reserve(self, key: bytes, argv: List[bytes]) -> Any:
+        existing = self._get(key)
+        if existing is not None:
+            return [item for pair in existing.items() for item in pair]
+        now = _now_ms()
+        self._hashes[key] = {
+            b"s": b"0", b"r": b"%d" % (now + int(argv[0])), b"c": b"%d" % now, b"u": b"%d" % now,
+        }
+        return 1
+
+    def _begin(self, key: bytes, argv: List[bytes]) -> Any:
+        now = _now_ms()
+        existing = self._get(key)
+        if existing is not None:
+            if int(existing[b"s"]) >= 2 or int(existing[b"r"]) > now:
+                return [item for pair in existing.items() for item in pair]
+            existing.pop(b"res", None)
+            existing.pop(b"err", None)
+        else:
+            existing = self._hashes[key] = {b"c": b"%d" % now}
+        existing.update({b"s": b"1", b"r": b"%d" % (now + int(argv[0])), b"u": b"%d" % now, b"o": argv[1]})
+        return 1
+
+    def _transition(self, key: bytes, argv: List[bytes]) -> Any:
+        existing = self._get(key)
+        if existing is None:
+            return None
+        if int(existing[b"s"]) != int(argv[0]):
+            return int(existing[b"s"])
+        if argv[5] and existing.get(b"o") != argv[5]:
+            return -1
+        existing.update({b"s": argv[1], b"u": b"%d" % _now_ms()})
+        if argv[2]:
+            existing[argv[2]] = argv[3]
+        if int(argv[4]) > 0:
+            self._expires_ms[key] = _now_ms() + int(argv[4])
+        return _Status("OK")
+
+    def _release(self, key: bytes, argv: List[bytes]) -> Any:
+        if self._get_string(key) != argv[0]:
+            return 0
+        del self._strings[key]
+        self._expires_ms.pop(key, None)
+        return 1
+
+    def _renew(self, key: bytes, argv: List[bytes]) -> Any:
+        if self._get_string(key) != argv[0]:
+            return 0
+        self._expires_ms[key] = _now_ms() + int(argv[1])
+        return 1
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def _read_command(rfile) -> Optional[List[bytes]]:
+    line = rfile.readline()
+    if not line:
+        return None
+    count = int(line[1:-2])
+    args = []
+    for _ in range(count):
+        length = int(rfile.readline()[1:-2])
+        args.append(rfile.read(length + 2)[:-2])
+    return args
+
+
+def _encode(reply: Any) -> bytes:
+    if isinstance(reply, _Error):
+        return b"-%s\r\n" % reply.encode()
+    if isinstance(reply, _Status):
+        return b"+%s\r\n" % reply.encode()
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(_encode(item) for item in reply)
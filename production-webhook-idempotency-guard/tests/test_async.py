@@ -0,0 +1,177 @@
+"""
+Tests proving the asyncio guard keeps the same safety guarantees.
+
+Validates that:
+- Concurrent coroutines on one event loop execute the handler once
+- Coroutine and plain handlers are both supported
+- Cached failures are returned after permanent failure
+- A lapsed lease is not taken over while its holder keeps the lock
+- Contended deliveries wait as the wait strategy says
+"""
+
+import asyncio
+from typing import Optional, List
+
+from webhook_guard.async_guard import AsyncWebhookGuard
+from webhook_guard.models import ProcessingResult, WebhookStatus
+from webhook_guard.store import AsyncInMemoryStore
+from webhook_guard.wait import AdaptiveWait, BackoffWait, FixedWait
+
+
+# -------- fake async distributed lock --------
+
+class FakeAsyncLockHandle:
+    def __init__(self, lock, key: str):
+        self._lock = lock
+        self._key = key
+
+    async def release(self) -> None:
+        self._lock._held.discard(self._key)
+
+
+class FakeAsyncDistributedLock:
+    def __init__(self):
+        self._held = set()
+        self.attempts = 0
+
+    async def try_lock(self, key: str, timeout_seconds: int) -> Optional[FakeAsyncLockHandle]:
+        self.attempts += 1
+        if key in self._held:
+            return None
+        self._held.add(key)
+        return FakeAsyncLockHandle(self, key)
+
+
+# -------- tests --------
+
+def test_concurrent_coroutines_execute_once():
+    """
+    Scenario:
+    50 coroutines on one event loop process the same webhook_id.
+
+    Expectation:
+    - Coroutine handler executes EXACTLY once
+    - Every other delivery returns the cached output
+    """
+
+    guard = AsyncWebhookGuard(store=AsyncInMemoryStore(), lock=FakeAsyncDistributedLock())
+    execution_count = 0
+
+    async def handler():
+        nonlocal execution_count
+        execution_count += 1
+        await asyncio.sleep(0.01)  # yield while holding the lock
+        return {"execution": execution_count}
+
+    async def run() -> List[ProcessingResult]:
+        return await asyncio.gather(
+            *(guard.process("async-webhook-1", handler, 60) for _ in range(50))
+        )
+
+    results = asyncio.run(run())
+
+    assert execution_count == 1
+    fresh = [r for r in results if r.success and not r.cached]
+    assert len(fresh) == 1
+    for r in results:
+        assert r.output == {"execution": 1}
+
+
+def test_plain_handler_and_cached_failure():
+    """
+    Scenario:
+    A synchronous handler fails, then the webhook is retried.
+
+    Expectation:
+    - Plain callables are accepted
+    - Retry returns cached failure without re-executing or locking
+    """
+
+    lock = FakeAsyncDistributedLock()
+    guard = AsyncWebhookGuard(store=AsyncInMemoryStore(), lock=lock)
+    execution_count = 0
+
+    def failing_handler():
+        nonlocal execution_count
+        execution_count += 1
+        raise ValueError("invalid payload")
+
+    async def run():
+        first = await guard.process("async-failure-1", failing_handler, 60)
+        second = await guard.process("async-failure-1", failing_handler, 60)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.success is False and first.cached is False
+    assert second.success is False and second.cached is True
+    assert "invalid payload" in second.error
+    assert execution_count == 1
+    assert lock.attempts == 1
+
+
+def test_lapsed_lease_is_not_taken_over_while_locked():
+    """
+    Scenario:
+    The handler outlives its 1-second lease; a duplicate arrives after
+    the lease expired but while the first coroutine still holds the lock.
+
+    Expectation:
+    - The duplicate backs off without touching the record
+    - The original coroutine's result is persisted
+    """
+
+    store = AsyncInMemoryStore()
+    guard = AsyncWebhookGuard(store=store, lock=FakeAsyncDistributedLock(), wait_timeout_seconds=0.1)
+
+    async def run():
+        duplicate_done = asyncio.Event()
+
+        async def slow_handler():
+            await duplicate_done.wait()
+            return "original"
+
+        first = asyncio.create_task(guard.process("async-lapsed-1", slow_handler, 1))
+        await asyncio.sleep(0.1)
+        owner = (await store.get_state("async-lapsed-1")).owner
+        await asyncio.sleep(1.1)
+
+        duplicate = await guard.process("async-lapsed-1", lambda: "duplicate", 1)
+        duplicate_done.set()
+        await first
+        return duplicate, owner
+
+    duplicate, owner = asyncio.run(run())
+
+    assert duplicate.success is False and duplicate.error == "Webhook is currently being processed"
+    state = asyncio.run(store.get_state("async-lapsed-1"))
+    assert state.status == WebhookStatus.COMPLETE and state.result == "original"
+    assert state.owner == owner
+
+
+def _contended(wait_strategy):
+    store = AsyncInMemoryStore()
+    guard = AsyncWebhookGuard(store=store, lock=FakeAsyncDistributedLock(), wait_strategy=wait_strategy)
+
+    async def run():
+        # Another host is processing; it finishes without notifying this one
+        await store.begin("evt-1", 60, "other-host")
+        asyncio.get_running_loop().call_later(0.15, store._store.mark_complete, "evt-1", "done")
+        result = await guard.process("evt-1", lambda: "duplicate")
+        await asyncio.sleep(0.2)
+        return result
+
+    return asyncio.run(run())
+
+
+def test_contended_delivery_follows_the_wait_strategy():
+    result = _contended(BackoffWait(initial_seconds=0.02, max_delay_seconds=0.1, deadline_seconds=5.0))
+    assert result.success and result.cached and result.output == "done"
+
+    result = _contended(FixedWait(0.01))
+    assert not result.success and result.error == "Webhook is currently being processed"
+
+    strategy = AdaptiveWait()
+    guard = AsyncWebhookGuard(store=AsyncInMemoryStore(), lock=FakeAsyncDistributedLock(), wait_strategy=strategy)
+    asyncio.run(guard.process("evt-2", lambda: "ok"))
+    assert len(strategy._durations) == 1
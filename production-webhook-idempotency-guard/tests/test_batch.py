@@ -0,0 +1,112 @@
+"""
+Tests proving batch processing keeps per-item idempotency.
+
+Validates that:
+- A batch costs a constant number of store calls
+- Results come back in input order
+- Repeated ids within a batch execute once
+- Previously processed ids return cached results
+"""
+
+from typing import Optional, Any, List
+
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.store import InMemoryStore
+
+
+# -------- fakes --------
+
+class FakeLockHandle:
+    def __init__(self, lock, key: str):
+        self._lock = lock
+        self._key = key
+
+    def release(self) -> None:
+        self._lock._held.discard(self._key)
+
+
+class FakeDistributedLock:
+    def __init__(self):
+        self._held = set()
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[FakeLockHandle]:
+        if key in self._held:
+            return None
+        self._held.add(key)
+        return FakeLockHandle(self, key)
+
+
+class CountingStore:
+    """Proxy over InMemoryStore that records every call by name."""
+
+    def __init__(self):
+        self._inner = InMemoryStore()
+        self.calls: List[str] = []
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._inner, name)
+
+        def counted(*args, **kwargs):
+            self.calls.append(name)
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+# -------- tests --------
+
+def test_batch_uses_constant_store_calls():
+    store = CountingStore()
+    guard = WebhookGuard(store=store, lock=FakeDistributedLock())
+    executed: List[str] = []
+
+    def make_handler(webhook_id: str):
+        def handler():
+            executed.append(webhook_id)
+            if webhook_id == "evt-13":
+                raise ValueError("bad event")
+            return webhook_id.upper()
+        return handler
+
+    guard.process("evt-0", make_handler("evt-0"), 60)
+    store.calls.clear()
+    executed.clear()
+
+    ids = [f"evt-{i}" for i in range(20)] + ["evt-3", "evt-0"]
+    results = guard.process_many([(webhook_id, make_handler(webhook_id)) for webhook_id in ids], 60)
+
+    assert store.calls == [
+        "get_states",
+        "reserve_many",
+        "mark_processing_many",
+        "mark_complete_many",
+        "mark_failed_many",
+    ]
+    assert sorted(executed) == sorted(f"evt-{i}" for i in range(1, 20))
+
+    assert len(results) == len(ids)
+    assert results[0].cached is True and results[0].output == "EVT-0"
+    assert results[5].cached is False and results[5].output == "EVT-5"
+    assert results[13].success is False and "bad event" in results[13].error
+    assert results[20].cached is True and results[20].output == "EVT-3"
+    assert results[21].cached is True and results[21].output == "EVT-0"
+
+
+def test_batch_retry_is_fully_cached():
+    store = InMemoryStore()
+    guard = WebhookGuard(store=store, lock=FakeDistributedLock())
+    count = 0
+
+    def handler():
+        nonlocal count
+        count += 1
+        return count
+
+    batch = [("a", handler), ("b", handler), ("c", handler)]
+    first = guard.process_many(batch, 60)
+    retry = guard.process_many(batch, 60)
+
+    assert [r.output for r in first] == [1, 2, 3]
+    assert [r.output for r in retry] == [1, 2, 3]
+    assert all(r.cached for r in retry)
+    assert count == 3
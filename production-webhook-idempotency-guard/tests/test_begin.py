@@ -0,0 +1,185 @@
+"""
+Tests proving the single-round-trip begin path is used and is safe.
+
+Validates that:
+- A fresh delivery costs begin + one terminal write
+- With a seen_filter, retries are answered before taking the lock
+- Stores without begin() keep the original five-step path
+- Expired reservations (crashed worker) are taken over by begin
+- A lapsed lease whose holder still has the lock is never taken over
+"""
+
+import threading
+import time
+from typing import Optional, Any, List
+
+from webhook_guard.bloom import RotatingBloomFilter
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.models import WebhookStatus, WebhookState
+from webhook_guard.store import InMemoryStore
+
+
+# -------- fakes --------
+
+class FakeLockHandle:
+    def __init__(self, lock, key: str):
+        self._lock = lock
+        self._key = key
+
+    def release(self) -> None:
+        self._lock._held.discard(self._key)
+
+
+class FakeDistributedLock:
+    def __init__(self):
+        self._held = set()
+        self.attempts = 0
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[FakeLockHandle]:
+        self.attempts += 1
+        if key in self._held:
+            return None
+        self._held.add(key)
+        return FakeLockHandle(self, key)
+
+
+class RecordingStore:
+    """Forwards the five protocol methods and records every call."""
+
+    def __init__(self, inner: InMemoryStore):
+        self._inner = inner
+        self.calls: List[str] = []
+
+    def get_state(self, webhook_id: str) -> Optional[WebhookState]:
+        self.calls.append("get_state")
+        return self._inner.get_state(webhook_id)
+
+    def reserve(self, webhook_id: str, timeout_seconds: int):
+        self.calls.append("reserve")
+        return self._inner.reserve(webhook_id, timeout_seconds)
+
+    def mark_processing(self, webhook_id: str) -> None:
+        self.calls.append("mark_processing")
+        self._inner.mark_processing(webhook_id)
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        self.calls.append("mark_complete")
+        self._inner.mark_complete(webhook_id, result)
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        self.calls.append("mark_failed")
+        self._inner.mark_failed(webhook_id, error)
+
+
+class RecordingBeginStore(RecordingStore):
+    def begin(self, webhook_id: str, timeout_seconds: int, owner: str):
+        self.calls.append("begin")
+        return self._inner.begin(webhook_id, timeout_seconds, owner)
+
+
+# -------- tests --------
+
+def test_fresh_delivery_uses_begin():
+    store = RecordingBeginStore(InMemoryStore())
+    guard = WebhookGuard(store=store, lock=FakeDistributedLock())
+
+    result = guard.process("begin-webhook-1", lambda: "ok", 60)
+
+    assert result.success is True and result.cached is False
+    assert store.calls == ["begin", "mark_complete"]
+
+    store.calls.clear()
+    retry = guard.process("begin-webhook-1", lambda: "again", 60)
+
+    assert retry.cached is True and retry.output == "ok"
+    assert store.calls == ["begin"]
+
+
+def test_seen_filter_answers_retries_before_the_lock():
+    store = RecordingBeginStore(InMemoryStore())
+    lock = FakeDistributedLock()
+    guard = WebhookGuard(store=store, lock=lock, seen_filter=RotatingBloomFilter(expected_items=1000))
+
+    guard.process("seen-webhook-1", lambda: "ok", 60)
+    assert store.calls == ["begin", "mark_complete"]
+    assert lock.attempts == 1
+
+    store.calls.clear()
+    retry = guard.process("seen-webhook-1", lambda: "again", 60)
+
+    assert retry.cached is True and retry.output == "ok"
+    assert store.calls == ["get_state"]
+    assert lock.attempts == 1
+
+
+def test_store_without_begin_keeps_original_path():
+    store = RecordingStore(InMemoryStore())
+    guard = WebhookGuard(store=store, lock=FakeDistributedLock())
+
+    result = guard.process("legacy-webhook-1", lambda: "ok", 60)
+
+    assert result.success is True
+    assert store.calls == ["get_state", "reserve", "mark_processing", "mark_complete"]
+
+
+def test_begin_takes_over_expired_reservation():
+    """
+    Scenario:
+    A worker crashed after marking PROCESSING; its reservation expired.
+
+    Expectation:
+    - A live reservation is NOT taken over
+    - An expired one is, and the handler runs to completion
+    """
+
+    inner = InMemoryStore()
+    assert inner.begin("crashed-webhook-1", 60, "worker-a") == (True, None)
+
+    begun, existing = inner.begin("crashed-webhook-1", 60, "worker-b")
+    assert begun is False
+    assert existing.status == WebhookStatus.PROCESSING
+    assert existing.owner == "worker-a"
+
+    # Zero-second lease: expired as soon as it is written
+    assert inner.begin("crashed-webhook-2", 0, "worker-a") == (True, None)
+
+    guard = WebhookGuard(store=inner, lock=FakeDistributedLock())
+    result = guard.process("crashed-webhook-2", lambda: "recovered", 60)
+
+    assert result.success is True and result.cached is False
+    assert inner.get_state("crashed-webhook-2").status == WebhookStatus.COMPLETE
+    assert inner.get_state("crashed-webhook-2").owner != "worker-a"
+
+
+def test_lapsed_lease_is_not_taken_over_while_locked():
+    """
+    Scenario:
+    The handler outlives its 1-second lease; a duplicate arrives after
+    the lease expired but while the first worker still holds the lock.
+
+    Expectation:
+    - The duplicate backs off without touching the record
+    - The original worker's result is persisted
+    """
+
+    store = InMemoryStore()
+    guard = WebhookGuard(store=store, lock=FakeDistributedLock(), wait_timeout_seconds=0.1, coalesce=False)
+    duplicate_done = threading.Event()
+
+    def slow_handler():
+        duplicate_done.wait(5)
+        return "original"
+
+    first = threading.Thread(target=guard.process, args=("lapsed-webhook-1", slow_handler, 1))
+    first.start()
+    time.sleep(1.2)
+
+    duplicate = guard.process("lapsed-webhook-1", lambda: "duplicate", 1)
+    owner = store.get_state("lapsed-webhook-1").owner
+    duplicate_done.set()
+    first.join()
+
+    assert duplicate.success is False and duplicate.error == "Webhook is currently being processed"
+    state = store.get_state("lapsed-webhook-1")
+    assert state.status == WebhookStatus.COMPLETE and state.result == "original"
+    assert state.owner == owner
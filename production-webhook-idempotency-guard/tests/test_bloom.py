@@ -0,0 +1,109 @@
+"""
+Tests proving the "never seen" pre-filter removes the guaranteed-miss read.
+
+Validates that:
+- First deliveries skip get_state and go straight to reserve
+- Retries still hit the fast path
+- The filter has no false negatives within a window and rotates out old ids
+"""
+
+from typing import Optional, Any, List
+
+from webhook_guard.bloom import RotatingBloomFilter
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.store import InMemoryStore
+
+
+# -------- fakes --------
+
+class FakeLockHandle:
+    def __init__(self, lock, key: str):
+        self._lock = lock
+        self._key = key
+
+    def release(self) -> None:
+        self._lock._held.discard(self._key)
+
+
+class FakeDistributedLock:
+    def __init__(self):
+        self._held = set()
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[FakeLockHandle]:
+        if key in self._held:
+            return None
+        self._held.add(key)
+        return FakeLockHandle(self, key)
+
+
+class RecordingStore:
+    """Forwards the five protocol methods (no begin) and records calls."""
+
+    def __init__(self):
+        self._inner = InMemoryStore()
+        self.calls: List[str] = []
+
+    def get_state(self, webhook_id: str):
+        self.calls.append("get_state")
+        return self._inner.get_state(webhook_id)
+
+    def reserve(self, webhook_id: str, timeout_seconds: int):
+        self.calls.append("reserve")
+        return self._inner.reserve(webhook_id, timeout_seconds)
+
+    def mark_processing(self, webhook_id: str) -> None:
+        self._inner.mark_processing(webhook_id)
+
+    def mark_complete(self, webhook_id: str, result: Any) -> None:
+        self._inner.mark_complete(webhook_id, result)
+
+    def mark_failed(self, webhook_id: str, error: str) -> None:
+        self._inner.mark_failed(webhook_id, error)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# -------- tests --------
+
+def test_first_delivery_skips_fast_path_read():
+    store = RecordingStore()
+    guard = WebhookGuard(
+        store=store,
+        lock=FakeDistributedLock(),
+        seen_filter=RotatingBloomFilter(expected_items=1000),
+    )
+
+    guard.process("new-webhook-1", lambda: "ok", 60)
+    assert store.calls == ["reserve"]
+
+    store.calls.clear()
+    retry = guard.process("new-webhook-1", lambda: "again", 60)
+    assert retry.cached is True and retry.output == "ok"
+    assert store.calls == ["get_state"]
+
+
+def test_filter_sizing_and_rotation():
+    clock = FakeClock()
+    seen = RotatingBloomFilter(expected_items=1000, false_positive_rate=0.01, window_seconds=10, clock=clock)
+
+    assert seen.size_bits >= 9585
+    assert seen.hash_count == 7
+
+    for i in range(1000):
+        seen.add(f"id-{i}")
+    assert all(f"id-{i}" in seen for i in range(1000))
+
+    false_positives = sum(f"other-{i}" in seen for i in range(10_000))
+    assert false_positives < 300
+
+    clock.now = 15
+    assert "id-1" in seen
+
+    clock.now = 25
+    assert "id-1" not in seen
@@ -0,0 +1,106 @@
+"""
+Tests proving the terminal-state cache is safe and bounded.
+
+Validates that:
+- Terminal states are served locally after the first read, without
+  taking the lock
+- Non-terminal states are never cached
+- LRU and TTL bounds are enforced
+"""
+
+from typing import Optional
+
+from webhook_guard.cache import CachingStore
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.models import WebhookStatus
+from webhook_guard.store import InMemoryStore
+
+
+# -------- fake distributed lock --------
+
+class FakeLockHandle:
+    def __init__(self, lock, key: str):
+        self._lock = lock
+        self._key = key
+
+    def release(self) -> None:
+        self._lock._held.discard(self._key)
+
+
+class FakeDistributedLock:
+    def __init__(self):
+        self._held = set()
+        self.attempts = 0
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[FakeLockHandle]:
+        self.attempts += 1
+        if key in self._held:
+            return None
+        self._held.add(key)
+        return FakeLockHandle(self, key)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# -------- tests --------
+
+def test_retries_are_served_from_cache():
+    inner = InMemoryStore()
+    store = CachingStore(inner, max_entries=100)
+    lock = FakeDistributedLock()
+    guard = WebhookGuard(store=store, lock=lock)
+
+    guard.process("cached-webhook-1", lambda: "ok", 60)
+    assert store.misses == 1 and store.hits == 0
+
+    for _ in range(5):
+        result = guard.process("cached-webhook-1", lambda: "again", 60)
+        assert result.cached is True and result.output == "ok"
+
+    assert store.hits == 4
+    # Only the first retry (cache not yet filled) reached the lock
+    assert lock.attempts == 2
+    assert len(store) == 1
+
+
+def test_non_terminal_states_are_not_cached():
+    inner = InMemoryStore()
+    store = CachingStore(inner)
+
+    store.reserve("pending-webhook-1", 60)
+    assert store.get_state("pending-webhook-1").status == WebhookStatus.PENDING
+    assert len(store) == 0
+
+    store.mark_processing("pending-webhook-1")
+    store.mark_complete("pending-webhook-1", "done")
+    assert store.get_state("pending-webhook-1").status == WebhookStatus.COMPLETE
+    assert len(store) == 1
+
+
+def test_lru_and_ttl_bounds():
+    clock = FakeClock()
+    inner = InMemoryStore()
+    store = CachingStore(inner, max_entries=2, ttl_seconds=10, clock=clock)
+
+    for webhook_id in ("a", "b", "c"):
+        inner.reserve(webhook_id, 60)
+        inner.mark_processing(webhook_id)
+        inner.mark_complete(webhook_id, webhook_id)
+        store.get_state(webhook_id)
+
+    assert len(store) == 2
+    store.get_state("a")
+    assert store.hits == 0
+
+    store.get_state("c")
+    assert store.hits == 1
+
+    clock.now = 11
+    store.get_state("c")
+    assert store.hits == 1
@@ -158,3 +158,117 @@ def test_concurrent_side_effect_not_duplicated():
 
     for r in successes:
         assert r.output == {"payment_id": "PAY-1"}
+
+
+def test_contended_duplicates_wake_on_completion():
+    """
+    Scenario:
+    Handler runs longer than the legacy 1-second contention sleep.
+
+    Expectation:
+    - Waiters are woken by the holder's terminal write
+    - Every duplicate returns the cached output, none "in progress"
+    - Nobody waits for the full deadline
+    """
+
+    store = InMemoryStore()
+    lock = FakeDistributedLock()
+    guard = WebhookGuard(store=store, lock=lock, wait_timeout_seconds=10, coalesce=False)
+
+    def handler():
+        time.sleep(1.5)
+        return {"status": "done"}
+
+    webhook_id = "slow-webhook-1"
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(guard.process, webhook_id, handler, 60)
+            for _ in range(5)
+        ]
+        results = [future.result() for future in futures]
+
+    elapsed = time.monotonic() - started
+
+    assert all(r.success for r in results)
+    assert all(r.output == {"status": "done"} for r in results)
+    assert len([r for r in results if not r.cached]) == 1
+    assert elapsed < 5
+
+
+def test_in_process_duplicates_are_single_flighted():
+    """
+    Scenario:
+    10 threads in one process deliver the same webhook_id at once.
+
+    Expectation:
+    - Only the leader touches the lock
+    - Followers share the leader's output flagged cached=True
+    """
+
+    store = InMemoryStore()
+    lock = FakeDistributedLock()
+    lock_attempts = []
+    original_try_lock = lock.try_lock
+
+    def counting_try_lock(key, timeout_seconds):
+        lock_attempts.append(key)
+        return original_try_lock(key, timeout_seconds)
+
+    lock.try_lock = counting_try_lock
+    guard = WebhookGuard(store=store, lock=lock)
+
+    def handler():
+        time.sleep(0.3)
+        return {"status": "done"}
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        futures = [
+            executor.submit(guard.process, "coalesced-webhook-1", handler, 60)
+            for _ in range(10)
+        ]
+        results = [future.result() for future in futures]
+
+    assert lock_attempts == ["coalesced-webhook-1"]
+    assert len([r for r in results if not r.cached]) == 1
+    assert all(r.output == {"status": "done"} for r in results)
+
+
+def test_single_flight_followers_respect_the_wait_deadline():
+    """
+    Scenario:
+    The leader's handler hangs; later, a leader is itself contended.
+
+    Expectation:
+    - Followers give up after the wait deadline instead of blocking
+    - A leader's "currently being processed" is not relabelled cached
+    """
+
+    store = InMemoryStore()
+    guard = WebhookGuard(store=store, lock=FakeDistributedLock(), wait_timeout_seconds=0.3)
+    release = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(guard.process, "hung-webhook-1", release.wait, 60)
+        time.sleep(0.1)
+        started = time.monotonic()
+        follower = guard.process("hung-webhook-1", lambda: "duplicate", 60)
+        elapsed = time.monotonic() - started
+        release.set()
+        assert leader.result().success
+
+    assert not follower.success and not follower.cached
+    assert follower.error == "Webhook is currently being processed"
+    assert elapsed < 1
+
+    # Another host holds the reservation: the leader waits it out
+    store.begin("contended-webhook-1", 60, "other-host")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(guard.process, "contended-webhook-1", lambda: "duplicate", 60)
+        time.sleep(0.1)
+        follower = guard.process("contended-webhook-1", lambda: "duplicate", 60)
+
+    for result in (leader.result(), follower):
+        assert not result.success and not result.cached
+        assert result.error == "Webhook is currently being processed"
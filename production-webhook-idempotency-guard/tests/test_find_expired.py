@@ -0,0 +1,91 @@
+"""
+Tests proving find_expired() discovers stale reservations from an index.
+
+Validates that:
+- Only PENDING/PROCESSING records past reserved_until are returned
+- Results are ordered oldest reservation first and capped at limit
+- Records that move on (complete, taken over) drop out of the index
+- The in-memory heap does not grow without bound under churn
+- SQLite answers from the partial index rather than a table scan
+"""
+
+import time
+
+import pytest
+
+from webhook_guard.models import WebhookStatus, from_epoch_ns
+from webhook_guard.sqlite_store import SqliteStore
+from webhook_guard.store import InMemoryStore, StripedInMemoryStore
+
+
+def _in(seconds: float):
+    return from_epoch_ns(time.time_ns() + int(seconds * 1_000_000_000))
+
+
+@pytest.fixture(params=["memory", "striped", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryStore()
+    elif request.param == "striped":
+        yield StripedInMemoryStore(shards=4)
+    else:
+        sqlite = SqliteStore(str(tmp_path / "webhooks.db"))
+        yield sqlite
+        sqlite.close()
+
+
+def test_returns_open_records_oldest_first(store):
+    store.reserve("evt-10", 10)
+    store.reserve("evt-5", 5)
+    store.reserve("evt-20", 20)
+    store.reserve("evt-done", 1)
+    store.mark_processing("evt-done")
+    store.mark_complete("evt-done", {"ok": True})
+    store.mark_processing("evt-5")
+
+    assert store.find_expired(_in(0)) == []
+
+    expired = store.find_expired(_in(15))
+    assert [state.webhook_id for state in expired] == ["evt-5", "evt-10"]
+    assert expired[0].status == WebhookStatus.PROCESSING
+    assert expired[1].status == WebhookStatus.PENDING
+
+    # Nothing is consumed: the same records are found again until they move on
+    assert [state.webhook_id for state in store.find_expired(_in(30), limit=2)] == ["evt-5", "evt-10"]
+
+
+def test_finished_and_taken_over_records_drop_out(store):
+    for webhook_id in ("evt-1", "evt-2", "evt-3"):
+        store.reserve(webhook_id, 0)
+
+    store.mark_processing("evt-1")
+    store.mark_failed("evt-1", "boom")
+    store.begin("evt-2", 60, "worker-b")
+
+    assert [state.webhook_id for state in store.find_expired(_in(1))] == ["evt-3"]
+    assert [state.webhook_id for state in store.find_expired(_in(120))] == ["evt-3", "evt-2"]
+
+
+def test_heap_is_rebuilt_under_churn():
+    store = InMemoryStore()
+    # Every round takes over every lapsed lease, invalidating its old entry
+    for _ in range(10):
+        for index in range(2_000):
+            assert store.begin(f"evt-{index}", 0, "worker")[0]
+
+    assert len(store._open) <= 3 * 2_000
+    assert len(store.find_expired(_in(5), limit=5_000)) == 2_000
+
+
+def test_sqlite_uses_the_partial_index(tmp_path):
+    store = SqliteStore(str(tmp_path / "webhooks.db"))
+    plan = store._connection().execute(
+        "EXPLAIN QUERY PLAN SELECT webhook_id FROM webhook_state "
+        "WHERE status IN (0, 1) AND reserved_until_ns <= ? ORDER BY reserved_until_ns LIMIT ?",
+        (0, 10),
+    ).fetchall()
+    store.close()
+
+    detail = " ".join(row[-1] for row in plan)
+    assert "webhook_state_open_idx" in detail
+    assert "TEMP B-TREE" not in detail
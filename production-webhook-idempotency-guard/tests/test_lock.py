@@ -0,0 +1,185 @@
+"""
+Tests proving the single-host DistributedLock implementations.
+
+Validates that:
+- Each key has exactly one holder; release frees it
+- StripedThreadLock leases expire and a stale release is a no-op
+- FileRangeLock excludes other processes and is freed when one dies
+- FileRangeLock leases expire for other processes too
+- Keys sharing a byte offset never share ownership
+- Neither lock grows with the number of keys seen
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from webhook_guard import local_lock
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.local_lock import FileRangeLock, StripedThreadLock
+from webhook_guard.store import StripedInMemoryStore
+
+
+@pytest.fixture(params=["threads", "file"])
+def lock(request, tmp_path):
+    if request.param == "threads":
+        yield StripedThreadLock()
+    else:
+        file_lock = FileRangeLock(str(tmp_path / "webhooks.lock"))
+        yield file_lock
+        file_lock.close()
+
+
+def test_one_holder_per_key(lock):
+    handle = lock.try_lock("evt-1", 60)
+    assert handle is not None
+    assert lock.try_lock("evt-1", 60) is None
+    assert lock.try_lock("evt-2", 60) is not None
+
+    handle.release()
+    handle.release()
+    assert lock.try_lock("evt-1", 60) is not None
+
+
+def test_guard_runs_handler_once_under_threads(lock):
+    guard = WebhookGuard(store=StripedInMemoryStore(), lock=lock, coalesce=False)
+    executions = []
+    barrier = threading.Barrier(16)
+
+    def worker(_):
+        barrier.wait()
+        return guard.process("evt-1", lambda: executions.append(1) or "ok")
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(worker, range(16)))
+
+    assert len(executions) == 1
+    assert sum(not result.cached and result.success for result in results) == 1
+
+
+def test_thread_lock_lease_expires():
+    lock = StripedThreadLock()
+    stale = lock.try_lock("evt-1", 0)
+    time.sleep(0.01)
+
+    fresh = lock.try_lock("evt-1", 60)
+    assert fresh is not None
+
+    # The expired holder cannot release the new holder's lease
+    stale.release()
+    assert lock.try_lock("evt-1", 60) is None
+    fresh.release()
+    assert lock.try_lock("evt-1", 60) is not None
+
+
+def _hold(path, key, held, done):
+    lock = FileRangeLock(path)
+    handle = lock.try_lock(key, 60)
+    held.put(handle is not None)
+    done.wait(30)
+
+
+def _try(path, key, results):
+    results.put(FileRangeLock(path).try_lock(key, 60) is not None)
+
+
+def test_file_lock_excludes_processes_and_frees_on_death(tmp_path):
+    path = str(tmp_path / "webhooks.lock")
+    ctx = multiprocessing.get_context("fork")
+    held, results, done = ctx.Queue(), ctx.Queue(), ctx.Event()
+
+    holder = ctx.Process(target=_hold, args=(path, "evt-1", held, done))
+    holder.start()
+    assert held.get(timeout=30) is True
+
+    lock = FileRangeLock(path)
+    assert lock.try_lock("evt-1", 60) is None
+    assert lock.try_lock("evt-2", 60) is not None
+
+    # Killed without releasing: the kernel drops its locks
+    holder.kill()
+    holder.join(timeout=30)
+    handle = lock.try_lock("evt-1", 60)
+    assert handle is not None
+
+    other = ctx.Process(target=_try, args=(path, "evt-1", results))
+    other.start()
+    assert results.get(timeout=30) is False
+    other.join(timeout=30)
+
+    handle.release()
+    other = ctx.Process(target=_try, args=(path, "evt-1", results))
+    other.start()
+    assert results.get(timeout=30) is True
+    other.join(timeout=30)
+
+    lock.close()
+    assert os.path.getsize(path) == 0
+
+
+def test_file_lock_lease_expires(tmp_path):
+    path = str(tmp_path / "webhooks.lock")
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    lock = FileRangeLock(path)
+
+    stale = lock.try_lock("evt-1", 0.3)
+    child = ctx.Process(target=_try, args=(path, "evt-1", results))
+    child.start()
+    assert results.get(timeout=30) is False
+    child.join(timeout=30)
+
+    # A hung holder does not keep the key: its byte is unlocked
+    time.sleep(0.6)
+    child = ctx.Process(target=_try, args=(path, "evt-1", results))
+    child.start()
+    assert results.get(timeout=30) is True
+    child.join(timeout=30)
+
+    fresh = lock.try_lock("evt-1", 60)
+    assert fresh is not None
+    stale.release()
+    assert lock.try_lock("evt-1", 60) is None
+
+    # Expired but not yet swept: taken over in process
+    lapsed = lock.try_lock("evt-2", 0)
+    taken = lock.try_lock("evt-2", 60)
+    assert lapsed is not None and taken is not None
+
+    # The expiry thread stops once nothing is held
+    fresh.release()
+    taken.release()
+    for _ in range(100):
+        if lock._sweeper is None:
+            break
+        time.sleep(0.01)
+    assert lock._sweeper is None
+    lock.close()
+
+
+def test_colliding_keys_never_share_ownership(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_lock, "_offset", lambda key: 7)
+    path = str(tmp_path / "webhooks.lock")
+    lock = FileRangeLock(path)
+
+    first = lock.try_lock("evt-a", 60)
+    second = lock.try_lock("evt-b", 60)
+    assert first is not None and second is not None
+    assert lock.try_lock("evt-a", 60) is None
+
+    # The shared byte stays locked until both holders release
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    first.release()
+    child = ctx.Process(target=_try, args=(path, "evt-c", results))
+    child.start()
+    assert results.get(timeout=30) is False
+    child.join(timeout=30)
+
+    second.release()
+    assert lock._keys == {} and lock._refs == {}
+    lock.close()
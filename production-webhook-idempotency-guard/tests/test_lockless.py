@@ -0,0 +1,116 @@
+"""
+Tests proving lockless mode: owner-checked transitions replace the lock.
+
+Validates that:
+- Terminal writes land only while PROCESSING under the given owner
+- A worker whose lease was taken over cannot overwrite the new owner
+- WebhookGuard(lock=None) still executes a handler exactly once
+- lock=None is rejected for stores without the capability
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from resp_standin import RespStandin
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.log_store import LogStructuredStore
+from webhook_guard.models import WebhookStatus
+from webhook_guard.redis_store import RedisStore
+from webhook_guard.shm_store import SharedMemoryStore
+from webhook_guard.sqlite_store import SqliteStore
+from webhook_guard.store import InMemoryStore, StripedInMemoryStore
+from webhook_guard.tiered_store import TieredStore
+
+
+@pytest.fixture(params=["memory", "striped", "sqlite", "log", "shm", "redis", "tiered"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryStore()
+    elif request.param == "striped":
+        yield StripedInMemoryStore()
+    elif request.param == "sqlite":
+        sqlite = SqliteStore(str(tmp_path / "webhooks.db"))
+        yield sqlite
+        sqlite.close()
+    elif request.param == "log":
+        log = LogStructuredStore(str(tmp_path / "log"), fsync=False)
+        yield log
+        log.close()
+    elif request.param == "shm":
+        shm = SharedMemoryStore(str(tmp_path / "webhooks.shm"), capacity=1024)
+        yield shm
+        shm.close()
+    elif request.param == "redis":
+        server = RespStandin()
+        redis = RedisStore(server.host, server.port)
+        yield redis
+        redis.close()
+        server.close()
+    else:
+        sqlite = SqliteStore(str(tmp_path / "webhooks.db"))
+        yield TieredStore(StripedInMemoryStore(), sqlite)
+        sqlite.close()
+
+
+def test_owner_checked_transitions(store):
+    store.begin("evt-1", 60, "worker-a")
+
+    with pytest.raises(ValueError, match="owned by another worker, cannot mark COMPLETE"):
+        store.mark_complete_owned("evt-1", "worker-b", "stolen")
+    with pytest.raises(ValueError, match="does not exist"):
+        store.mark_failed_owned("missing", "worker-a", "boom")
+
+    store.mark_complete_owned("evt-1", "worker-a", {"ok": True})
+    state = store.get_state("evt-1")
+    assert state.status == WebhookStatus.COMPLETE and state.result == {"ok": True}
+
+    with pytest.raises(ValueError, match="COMPLETE state, cannot mark FAILED"):
+        store.mark_failed_owned("evt-1", "worker-a", "late")
+
+
+def test_taken_over_worker_cannot_write(store):
+    store.begin("evt-1", 0, "worker-a")
+    begun, _ = store.begin("evt-1", 60, "worker-b")
+    assert begun
+
+    with pytest.raises(ValueError, match="owned by another worker"):
+        store.mark_failed_owned("evt-1", "worker-a", "timed out")
+
+    store.mark_failed_owned("evt-1", "worker-b", "boom")
+    assert store.get_state("evt-1").error == "boom"
+
+
+def test_guard_without_lock_executes_once(tmp_path):
+    guard = WebhookGuard(store=SqliteStore(str(tmp_path / "webhooks.db")), lock=None, coalesce=False)
+    executions = []
+    barrier = threading.Barrier(16)
+
+    def worker(_):
+        barrier.wait()
+        return guard.process("evt-1", lambda: executions.append(1) or "ok")
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(worker, range(16)))
+
+    assert len(executions) == 1
+    assert sum(not result.cached and result.success for result in results) == 1
+
+    batch = guard.process_many([("evt-1", lambda: "again"), ("evt-2", lambda: "new")])
+    assert [result.output for result in batch] == ["ok", "new"]
+    assert batch[0].cached and not batch[1].cached
+
+
+def test_lock_is_required_without_the_capability():
+    class PlainStore:
+        def __init__(self):
+            self._inner = InMemoryStore()
+            self.get_state = self._inner.get_state
+            self.reserve = self._inner.reserve
+            self.mark_processing = self._inner.mark_processing
+            self.mark_complete = self._inner.mark_complete
+            self.mark_failed = self._inner.mark_failed
+
+    with pytest.raises(ValueError, match="lock=None requires"):
+        WebhookGuard(store=PlainStore())
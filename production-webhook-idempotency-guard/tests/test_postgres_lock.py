@@ -0,0 +1,116 @@
+"""
+Tests proving PostgresAdvisoryLock shares the store's connections.
+
+Needs a running server: set WEBHOOK_GUARD_PG_DSN and install the
+postgres extra. Skipped otherwise.
+
+Validates that:
+- One holder per key across sessions; release frees it
+- Store calls made while holding a lock run on the lock's connection
+- A session never stacks a hash it already holds
+- Closing the holding connection releases its locks
+- A connection goes back to the pool only once it holds no lock
+"""
+
+import os
+import threading
+import uuid
+
+import pytest
+
+pytest.importorskip("psycopg_pool")
+
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.postgres_lock import PostgresAdvisoryLock
+from webhook_guard.postgres_store import PostgresStore
+
+
+DSN = os.environ.get("WEBHOOK_GUARD_PG_DSN")
+
+pytestmark = pytest.mark.skipif(DSN is None, reason="WEBHOOK_GUARD_PG_DSN not set")
+
+
+@pytest.fixture
+def store():
+    pg = PostgresStore(DSN, max_size=4)
+    yield pg
+    pg.close()
+
+
+def _in_thread(fn):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()))
+    thread.start()
+    thread.join(timeout=30)
+    return result[0]
+
+
+def test_one_holder_across_sessions(store):
+    lock = PostgresAdvisoryLock(store)
+    key = uuid.uuid4().hex
+
+    handle = lock.try_lock(key, 60)
+    assert handle is not None
+    assert lock.try_lock(key, 60) is None
+    assert _in_thread(lambda: lock.try_lock(key, 60)) is None
+
+    handle.release()
+    other = _in_thread(lambda: lock.try_lock(key, 60))
+    assert other is not None
+    other.release()
+
+
+def test_store_calls_reuse_the_lock_connection(store):
+    lock = PostgresAdvisoryLock(store)
+    guard = WebhookGuard(store=store, lock=lock)
+    assert guard.process(uuid.uuid4().hex, lambda: "ok").success
+
+    handle = lock.try_lock(uuid.uuid4().hex, 60)
+    locked_on = handle._pin.conn.execute("SELECT pg_backend_pid()").fetchone()[0]
+    assert store._fetch("SELECT pg_backend_pid()", ())[0][0] == locked_on
+
+    # A second lock on the same thread shares the pinned connection
+    second = lock.try_lock(uuid.uuid4().hex, 60)
+    assert second._pin is handle._pin
+    second.release()
+    handle.release()
+    assert store._local.pin.refs == 0
+
+
+def test_disconnect_releases_locks(store):
+    lock = PostgresAdvisoryLock(store)
+    key = uuid.uuid4().hex
+
+    held = _in_thread(lambda: lock.try_lock(key, 60))
+    assert held is not None
+    assert lock.try_lock(key, 60) is None
+
+    # The session ends with its connection; the pool replaces it
+    held._pin.conn.close()
+    assert lock.try_lock(key, 60) is not None
+
+
+_ADVISORY_LOCKS = "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND pid = %s"
+
+
+def test_pooled_connections_hold_no_advisory_locks(store, monkeypatch):
+    lock = PostgresAdvisoryLock(store)
+    handle = lock.try_lock(uuid.uuid4().hex, 60)
+    pid = handle._pin.conn.execute("SELECT pg_backend_pid()").fetchone()[0]
+    assert store._fetch(_ADVISORY_LOCKS, (pid,))[0][0] == 1
+
+    handle.release()
+    assert store._fetch(_ADVISORY_LOCKS, (pid,))[0][0] == 0
+
+    # A failed unlock may leave the lock held: the session is closed
+    # instead of being returned to the pool
+    handle = lock.try_lock(uuid.uuid4().hex, 60)
+    conn = handle._pin.conn
+
+    def failing_execute(*args, **kwargs):
+        raise RuntimeError("unlock failed")
+
+    monkeypatch.setattr(conn, "execute", failing_execute)
+    with pytest.raises(RuntimeError, match="unlock failed"):
+        handle.release()
+    assert conn.closed
@@ -0,0 +1,99 @@
+"""
+Tests proving PostgresStore follows the WebhookStore contract.
+
+Needs a running server: set WEBHOOK_GUARD_PG_DSN (e.g.
+"postgresql://postgres@localhost/webhooks") and install the postgres
+extra. Skipped otherwise.
+
+Validates that:
+- Reservation and transitions follow the InMemoryStore rules
+- Bulk calls agree with the single-id calls
+- Reservation is atomic across pooled connections
+"""
+
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("psycopg_pool")
+
+from webhook_guard.models import WebhookStatus
+from webhook_guard.postgres_store import PostgresStore
+
+
+DSN = os.environ.get("WEBHOOK_GUARD_PG_DSN")
+
+pytestmark = pytest.mark.skipif(DSN is None, reason="WEBHOOK_GUARD_PG_DSN not set")
+
+
+@pytest.fixture
+def store():
+    pg = PostgresStore(DSN, max_size=8)
+    yield pg
+    pg.close()
+
+
+def _ids(count: int):
+    # Unique per run: the table is shared and never truncated
+    prefix = uuid.uuid4().hex
+    return [f"{prefix}-{i}" for i in range(count)]
+
+
+def test_transitions(store):
+    (webhook_id,) = _ids(1)
+
+    assert store.reserve(webhook_id, 60) == (True, None)
+    reserved, existing = store.reserve(webhook_id, 60)
+    assert reserved is False and existing.status == WebhookStatus.PENDING
+
+    with pytest.raises(ValueError, match="cannot mark COMPLETE"):
+        store.mark_complete(webhook_id, "early")
+    with pytest.raises(ValueError, match="does not exist"):
+        store.mark_processing(f"{webhook_id}-missing")
+
+    store.mark_processing(webhook_id)
+    store.mark_complete(webhook_id, {"charge": "ch_1"})
+
+    with pytest.raises(ValueError, match="cannot mark FAILED"):
+        store.mark_failed(webhook_id, "late")
+
+    state = store.get_state(webhook_id)
+    assert state.status == WebhookStatus.COMPLETE
+    assert state.result == {"charge": "ch_1"}
+    assert state.created_at <= state.updated_at
+
+
+def test_begin_and_bulk_operations(store):
+    ids = _ids(10)
+
+    outcomes = store.reserve_many(ids + ids[:1], 60)
+    assert [reserved for reserved, _ in outcomes] == [True] * 10 + [False]
+
+    store.mark_processing_many(ids)
+    store.mark_complete_many({webhook_id: i for i, webhook_id in enumerate(ids[:5])})
+    store.mark_failed_many({webhook_id: "boom" for webhook_id in ids[5:]})
+
+    states = store.get_states(ids)
+    assert [states[webhook_id].status for webhook_id in ids] == (
+        [WebhookStatus.COMPLETE] * 5 + [WebhookStatus.FAILED] * 5
+    )
+
+    (fresh,) = _ids(1)
+    assert store.begin(fresh, 60, "worker-a") == (True, None)
+    taken, live = store.begin(fresh, 60, "worker-b")
+    assert taken is False and live.owner == "worker-a"
+
+
+def test_concurrent_reservation_is_atomic(store):
+    ids = _ids(50)
+    barrier = threading.Barrier(8)
+
+    def worker(_):
+        barrier.wait()
+        return sum(store.reserve(webhook_id, 60)[0] for webhook_id in ids)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert sum(pool.map(worker, range(8))) == 50
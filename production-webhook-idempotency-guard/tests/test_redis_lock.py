@@ -0,0 +1,161 @@
+"""
+Tests proving RedisLock holds keys safely and renews their leases.
+
+Runs against an in-process stand-in server (resp_standin.py); the
+Lua scripts are exercised by test_redis_server.py.
+
+Validates that:
+- One holder per key; release only frees the caller's own lock
+- The heartbeat keeps a short lease alive while the lock is held
+- A holder that stops renewing frees the key within its lease
+- close() does not leave later leases unrenewed
+- The heartbeat stops while nothing is held
+- A batch failing on an error reply frees the keys it did acquire
+- Batch acquisition is one pipelined round trip, used by process_many
+"""
+
+import time
+
+import pytest
+
+from resp_standin import RespStandin
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.redis_lock import RedisLock
+from webhook_guard.resp import RespConnection, RespError
+from webhook_guard.store import InMemoryStore
+
+
+@pytest.fixture
+def server():
+    standin = RespStandin()
+    yield standin
+    standin.close()
+
+
+def test_one_holder_and_token_checked_release(server):
+    lock = RedisLock(server.host, server.port, lease_seconds=None)
+    other = RedisLock(server.host, server.port, lease_seconds=None)
+
+    handle = lock.try_lock("evt-1", 60)
+    assert handle is not None
+    assert other.try_lock("evt-1", 60) is None
+    assert 0 < server.pttl("webhook-lock:evt-1") <= 60_000
+
+    handle.release()
+    taken = other.try_lock("evt-1", 60)
+    assert taken is not None
+
+    # A stale handle cannot free the new holder's lock
+    handle.release()
+    assert lock.try_lock("evt-1", 60) is None
+
+    lock.close()
+    other.close()
+
+
+def test_heartbeat_renews_short_leases(server):
+    lock = RedisLock(server.host, server.port, lease_seconds=0.3)
+    handle = lock.try_lock("evt-1", 60)
+    assert 0 < server.pttl("webhook-lock:evt-1") <= 300
+
+    time.sleep(0.8)
+    assert handle.lost is False
+    assert RedisLock(server.host, server.port).try_lock("evt-1", 60) is None
+
+    handle.release()
+    assert server.pttl("webhook-lock:evt-1") == -1
+    lock.close()
+
+
+def test_stopped_holder_frees_key_within_lease(server):
+    crashed = RedisLock(server.host, server.port, lease_seconds=0.2)
+    assert crashed.try_lock("evt-1", 300) is not None
+    crashed.close()
+
+    time.sleep(0.3)
+    assert RedisLock(server.host, server.port).try_lock("evt-1", 300) is not None
+
+
+def test_heartbeat_restarts_after_close(server):
+    lock = RedisLock(server.host, server.port, lease_seconds=0.3)
+    lock.try_lock("evt-1", 60).release()
+    lock.close()
+
+    handle = lock.try_lock("evt-2", 60)
+    time.sleep(0.8)
+    assert handle.lost is False
+    assert RedisLock(server.host, server.port).try_lock("evt-2", 60) is None
+    lock.close()
+
+
+def test_heartbeat_stops_while_nothing_is_held(server):
+    lock = RedisLock(server.host, server.port, lease_seconds=0.15)
+    lock.try_lock("evt-1", 60).release()
+    time.sleep(0.3)
+    assert lock._heartbeat is None
+
+    handle = lock.try_lock("evt-2", 60)
+    assert lock._heartbeat is not None
+    time.sleep(0.5)
+    assert handle.lost is False
+    assert RedisLock(server.host, server.port).try_lock("evt-2", 60) is None
+    lock.close()
+
+
+def test_failed_batch_releases_acquired_keys(server, monkeypatch):
+    lock = RedisLock(server.host, server.port)
+    pipeline = RespConnection.pipeline
+
+    def failing_second_set(conn, commands):
+        replies = pipeline(conn, commands)
+        if commands and commands[0][0] == "SET":
+            replies[1] = RespError("OOM command not allowed when used memory > 'maxmemory'")
+        return replies
+
+    monkeypatch.setattr(RespConnection, "pipeline", failing_second_set)
+    with pytest.raises(RespError, match="OOM"):
+        lock.try_lock_many(["evt-1", "evt-2", "evt-3"], 60)
+    monkeypatch.undo()
+
+    assert lock._held == {}
+    other = RedisLock(server.host, server.port)
+    assert other.try_lock("evt-1", 60) is not None
+    assert other.try_lock("evt-3", 60) is not None
+    lock.close()
+    other.close()
+
+
+def test_renewal_stops_at_timeout_and_flags_lost_leases(server):
+    lock = RedisLock(server.host, server.port, lease_seconds=10)
+    bounded = lock.try_lock("evt-1", 0)
+    stolen = lock.try_lock("evt-2", 60)
+
+    time.sleep(0.01)
+    with server._mutex:
+        server._strings[b"webhook-lock:evt-2"] = b"someone-else"
+
+    lock.renew()
+    assert bounded.lost is False and stolen.lost is True
+    assert lock._held == {}
+    lock.close()
+
+
+def test_process_many_acquires_locks_in_one_round_trip(server, monkeypatch):
+    lock = RedisLock(server.host, server.port)
+    guard = WebhookGuard(store=InMemoryStore(), lock=lock)
+
+    batches = []
+    pipeline = RespConnection.pipeline
+
+    def recording(conn, commands):
+        if commands and commands[0][0] == "SET":
+            batches.append(len(commands))
+        return pipeline(conn, commands)
+
+    monkeypatch.setattr(RespConnection, "pipeline", recording)
+    results = guard.process_many([(f"evt-{i}", lambda i=i: i) for i in range(20)])
+
+    assert [result.output for result in results] == list(range(20))
+    assert batches == [20]
+    assert server.commands.count(b"SET") == 20
+    lock.close()
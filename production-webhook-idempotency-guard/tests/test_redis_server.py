@@ -0,0 +1,143 @@
+"""
+Tests proving the RedisStore and RedisLock Lua scripts on a real server.
+
+The stand-in used by test_redis_store.py and test_redis_lock.py runs
+Python copies of the scripts; these tests run the scripts themselves.
+Needs a running server: set WEBHOOK_GUARD_REDIS (e.g.
+"localhost:6379"). Skipped otherwise.
+
+Validates that:
+- Reservation, begin and transitions follow the InMemoryStore rules
+- Owner-checked transitions reject a worker that was taken over
+- Bulk calls agree with the single-id calls; retention is a key TTL
+- Lock release and renewal only act for the token holder
+"""
+
+import os
+import uuid
+
+import pytest
+
+from webhook_guard.models import WebhookStatus
+from webhook_guard.redis_lock import RedisLock
+from webhook_guard.redis_store import RedisStore
+from webhook_guard.resp import RespConnection
+
+
+ADDRESS = os.environ.get("WEBHOOK_GUARD_REDIS")
+
+pytestmark = pytest.mark.skipif(ADDRESS is None, reason="WEBHOOK_GUARD_REDIS not set")
+
+
+def _address():
+    host, _, port = ADDRESS.partition(":")
+    return host, int(port or 6379)
+
+
+@pytest.fixture
+def prefix():
+    # Unique per test: the server is shared and never flushed
+    return f"webhook-guard-test:{uuid.uuid4().hex}:"
+
+
+@pytest.fixture
+def store(prefix):
+    host, port = _address()
+    redis = RedisStore(host, port, key_prefix=prefix, retention_seconds=30)
+    yield redis
+    redis.close()
+
+
+@pytest.fixture
+def conn():
+    host, port = _address()
+    raw = RespConnection(host, port)
+    yield raw
+    raw.close()
+
+
+def test_transitions(store):
+    assert store.reserve("evt-1", 60) == (True, None)
+    reserved, existing = store.reserve("evt-1", 60)
+    assert reserved is False and existing.status == WebhookStatus.PENDING
+
+    with pytest.raises(ValueError, match="cannot mark COMPLETE"):
+        store.mark_complete("evt-1", "early")
+    with pytest.raises(ValueError, match="does not exist"):
+        store.mark_processing("missing")
+
+    store.mark_processing("evt-1")
+    store.mark_complete("evt-1", {"charge": "ch_1", "amount": 1200})
+
+    with pytest.raises(ValueError, match="cannot mark FAILED"):
+        store.mark_failed("evt-1", "late")
+
+    state = store.get_state("evt-1")
+    assert state.status == WebhookStatus.COMPLETE
+    assert state.result == {"charge": "ch_1", "amount": 1200}
+    assert state.created_at <= state.updated_at
+
+
+def test_begin_and_owned_transitions(store):
+    assert store.begin("evt-1", 60, "worker-a") == (True, None)
+    taken, live = store.begin("evt-1", 60, "worker-b")
+    assert taken is False and live.owner == "worker-a"
+
+    # Zero-second lease: expired as soon as it is written
+    assert store.begin("evt-2", 0, "worker-a") == (True, None)
+    assert store.begin("evt-2", 60, "worker-b") == (True, None)
+    assert store.get_state("evt-2").owner == "worker-b"
+
+    with pytest.raises(ValueError, match="owned by another worker, cannot mark COMPLETE"):
+        store.mark_complete_owned("evt-2", "worker-a", "stale")
+    store.mark_complete_owned("evt-2", "worker-b", "fresh")
+    assert store.get_state("evt-2").result == "fresh"
+
+    store.mark_failed_owned("evt-1", "worker-a", "boom")
+    assert store.get_state("evt-1").error == "boom"
+    with pytest.raises(ValueError, match="FAILED state, cannot mark COMPLETE"):
+        store.mark_complete_owned("evt-1", "worker-a", "late")
+
+
+def test_bulk_and_retention(store, prefix, conn):
+    ids = [f"evt-{i}" for i in range(20)]
+
+    assert all(reserved for reserved, _ in store.reserve_many(ids, 60))
+    assert store.reserve_many(["evt-0"], 60)[0][0] is False
+    assert conn.execute("PTTL", prefix + "evt-0") == -1
+
+    store.mark_processing_many(ids)
+    store.mark_complete_many({webhook_id: i for i, webhook_id in enumerate(ids[:10])})
+    store.mark_failed_many({webhook_id: "boom" for webhook_id in ids[10:]})
+
+    states = store.get_states(ids + ["missing"])
+    assert sorted(states) == sorted(ids)
+    assert states["evt-3"].result == 3
+    assert states["evt-15"].status == WebhookStatus.FAILED
+    assert 0 < conn.execute("PTTL", prefix + "evt-0") <= 30_000
+
+
+def test_lock_release_and_renewal_check_the_token(prefix, conn):
+    host, port = _address()
+    lock = RedisLock(host, port, key_prefix=prefix, lease_seconds=10)
+    other = RedisLock(host, port, key_prefix=prefix, lease_seconds=10)
+
+    handle = lock.try_lock("evt-1", 60)
+    assert handle is not None and other.try_lock("evt-1", 60) is None
+
+    handle.release()
+    taken = other.try_lock("evt-1", 60)
+    assert taken is not None
+
+    # A stale handle neither frees nor renews the new holder's lock
+    handle.release()
+    assert lock.try_lock("evt-1", 60) is None
+
+    conn.execute("SET", prefix + "evt-1", "someone-else")
+    other.renew()
+    assert taken.lost is True
+    assert conn.execute("PTTL", prefix + "evt-1") == -1
+
+    conn.execute("DEL", prefix + "evt-1")
+    lock.close()
+    other.close()
@@ -0,0 +1,91 @@
+"""
+Tests proving RedisStore follows the WebhookStore contract over RESP.
+
+Runs against an in-process stand-in server (resp_standin.py); the
+Lua scripts are exercised by test_redis_server.py.
+
+Validates that:
+- Reservation and transitions follow the InMemoryStore rules
+- Bulk calls are pipelined and recover from a flushed script cache
+- Terminal writes set the retention TTL
+- Reservation is atomic across concurrent clients
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from resp_standin import RespStandin
+from webhook_guard.models import WebhookStatus
+from webhook_guard.redis_store import RedisStore
+
+
+@pytest.fixture
+def server():
+    standin = RespStandin()
+    yield standin
+    standin.close()
+
+
+def test_transitions(server):
+    store = RedisStore(server.host, server.port)
+
+    assert store.reserve("redis-1", 60) == (True, None)
+    reserved, existing = store.reserve("redis-1", 60)
+    assert reserved is False and existing.status == WebhookStatus.PENDING
+
+    with pytest.raises(ValueError, match="cannot mark COMPLETE"):
+        store.mark_complete("redis-1", "early")
+    with pytest.raises(ValueError, match="does not exist"):
+        store.mark_processing("missing")
+
+    store.mark_processing("redis-1")
+    store.mark_complete("redis-1", {"charge": "ch_1", "amount": 1200})
+
+    with pytest.raises(ValueError, match="cannot mark FAILED"):
+        store.mark_failed("redis-1", "late")
+
+    state = store.get_state("redis-1")
+    assert state.status == WebhookStatus.COMPLETE
+    assert state.result == {"charge": "ch_1", "amount": 1200}
+    assert state.created_at <= state.updated_at
+    assert store.get_state("missing") is None
+
+    assert store.begin("redis-2", 60, "worker-a") == (True, None)
+    taken, live = store.begin("redis-2", 60, "worker-b")
+    assert taken is False and live.owner == "worker-a"
+    store.close()
+
+
+def test_bulk_is_pipelined_and_survives_script_flush(server):
+    store = RedisStore(server.host, server.port, retention_seconds=30)
+    ids = [f"evt-{i}" for i in range(20)]
+
+    assert all(reserved for reserved, _ in store.reserve_many(ids, 60))
+    server.flush_scripts()
+    store.mark_processing_many(ids)
+    store.mark_complete_many({webhook_id: i for i, webhook_id in enumerate(ids)})
+
+    states = store.get_states(ids + ["missing"])
+    assert sorted(states) == sorted(ids)
+    assert all(states[webhook_id].result == i for i, webhook_id in enumerate(ids))
+
+    # Retention is a native TTL on terminal records only
+    assert 0 < server.pttl("webhook:evt-0") <= 30_000
+    # Loaded on first use and once more after the flush, not per call
+    assert server.commands.count(b"SCRIPT") == 2
+    store.close()
+
+
+def test_concurrent_clients_reserve_once(server):
+    store = RedisStore(server.host, server.port)
+    barrier = threading.Barrier(8)
+
+    def worker(_):
+        barrier.wait()
+        return sum(store.reserve(f"evt-{i}", 60)[0] for i in range(50))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert sum(pool.map(worker, range(8))) == 50
+    store.close()
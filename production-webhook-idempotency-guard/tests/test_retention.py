@@ -0,0 +1,74 @@
+"""
+Tests proving terminal records expire after the retention window.
+
+Validates that:
+- The timing wheel fires every item exactly once, never early
+- Terminal records are dropped after retention_seconds
+- PENDING/PROCESSING records are never expired
+"""
+
+import random
+
+from webhook_guard.store import InMemoryStore
+from webhook_guard.wheel import TimingWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_timing_wheel_fires_on_time_across_levels():
+    wheel = TimingWheel(tick_seconds=1.0, levels=3)
+    rng = random.Random(7)
+    deadlines = {i: rng.randint(1, 400_000) for i in range(2000)}
+    for item, deadline in deadlines.items():
+        wheel.schedule(deadline, item)
+
+    fired = {}
+    now = 0
+    while len(fired) < len(deadlines):
+        now += rng.randint(1, 5000)
+        for item in wheel.advance(now):
+            assert item not in fired
+            fired[item] = now
+
+    for item, deadline in deadlines.items():
+        assert fired[item] >= deadline
+        # Fired by the first advance() at or after the deadline
+        assert fired[item] - deadline < 5000
+
+    assert len(wheel) == 0
+
+
+def test_terminal_records_expire_after_retention():
+    clock = FakeClock()
+    store = InMemoryStore(retention_seconds=3600, clock=clock)
+
+    store.reserve("done-1", 60)
+    store.mark_processing("done-1")
+    store.mark_complete("done-1", "ok")
+
+    store.reserve("failed-1", 60)
+    store.mark_processing("failed-1")
+    store.mark_failed("failed-1", "boom")
+
+    store.reserve("pending-1", 60)
+    store.reserve("processing-1", 60)
+    store.mark_processing("processing-1")
+
+    clock.now = 3599
+    assert store.get_state("done-1") is not None
+    assert len(store) == 4
+
+    clock.now = 3601
+    assert store.get_state("done-1") is None
+    assert store.get_state("failed-1") is None
+
+    clock.now = 10 * 86400
+    assert store.get_state("pending-1") is not None
+    assert store.get_state("processing-1") is not None
+    assert len(store) == 2
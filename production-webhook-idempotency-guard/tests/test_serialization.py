@@ -0,0 +1,99 @@
+"""
+Tests proving result serialization round-trips and stays readable.
+
+Validates that:
+- Every codec round-trips typical handler outputs
+- Compression is recorded per record and applied only when it helps
+- Data written with one configuration is readable after switching
+- Durable stores use the configured serializer
+"""
+
+import pickle
+
+import pytest
+
+from webhook_guard.log_store import LogStructuredStore
+from webhook_guard.serialization import BinaryCodec, JsonCodec, PickleCodec, ResultSerializer
+from webhook_guard.sqlite_store import SqliteStore
+
+
+OUTPUT = {
+    "status": "ok",
+    "charge": {"id": "ch_3Nx", "amount": 1200, "currency": "usd", "refunded": False},
+    "lines": [{"sku": "A-1", "qty": 2, "price": 9.99}, {"sku": "B-2", "qty": -1, "price": None}],
+    "big": 2 ** 80,
+    "unicode": "größe ✓",
+}
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), PickleCodec(), BinaryCodec()])
+def test_codecs_round_trip(codec):
+    serializer = ResultSerializer(codec)
+    assert serializer.loads(serializer.dumps(OUTPUT)) == OUTPUT
+    assert serializer.loads(serializer.dumps(None)) is None
+
+
+def test_binary_codec_is_compact_and_strict():
+    codec = BinaryCodec()
+    assert len(codec.encode(OUTPUT)) < len(JsonCodec().encode(OUTPUT))
+    assert codec.decode(codec.encode(b"\x00raw")) == b"\x00raw"
+    assert codec.decode(codec.encode(-(2 ** 70))) == -(2 ** 70)
+
+    with pytest.raises(TypeError):
+        codec.encode(object())
+    with pytest.raises(ValueError, match="Trailing"):
+        codec.decode(codec.encode(1) + b"\x00")
+
+
+def test_compression_is_per_record():
+    serializer = ResultSerializer(BinaryCodec(), compression="zlib", compress_min_bytes=256)
+    small = serializer.dumps({"status": "ok"})
+    large = serializer.dumps({"body": "abc" * 10_000})
+
+    assert small[0] >> 4 == 0
+    assert large[0] >> 4 == 1 and len(large) < 1000
+
+    # Another configuration still reads both
+    reader = ResultSerializer(JsonCodec(), compression="lzma")
+    assert reader.loads(small) == {"status": "ok"}
+    assert reader.loads(large) == {"body": "abc" * 10_000}
+
+
+def test_legacy_pickles_and_restricted_reads():
+    legacy = pickle.dumps(OUTPUT, protocol=pickle.HIGHEST_PROTOCOL)
+    assert ResultSerializer().loads(legacy) == OUTPUT
+
+    safe = ResultSerializer(BinaryCodec(), readable=[JsonCodec()])
+    assert safe.loads(ResultSerializer(JsonCodec()).dumps(OUTPUT)) == OUTPUT
+    with pytest.raises(ValueError, match="not readable"):
+        safe.loads(ResultSerializer(PickleCodec()).dumps(OUTPUT))
+
+    with pytest.raises(ValueError):
+        ResultSerializer(compression="brotli")
+
+
+def test_durable_stores_use_the_serializer(tmp_path):
+    serializer = ResultSerializer(BinaryCodec(), compression="zlib")
+
+    sqlite = SqliteStore(str(tmp_path / "webhooks.db"), serializer=serializer)
+    sqlite.reserve("evt-1", 60)
+    sqlite.mark_processing("evt-1")
+    sqlite.mark_complete("evt-1", OUTPUT)
+    (blob,) = sqlite._connection().execute("SELECT result FROM webhook_state").fetchone()
+    assert blob[0] & 0x0F == BinaryCodec.codec_id
+    assert sqlite.get_state("evt-1").result == OUTPUT
+    sqlite.close()
+
+    # Records written with pickle stay readable after switching codecs
+    directory = str(tmp_path / "log")
+    log = LogStructuredStore(directory, fsync=False)
+    log.reserve("evt-1", 60)
+    log.mark_processing("evt-1")
+    log.mark_complete("evt-1", OUTPUT)
+    log.close()
+
+    reopened = LogStructuredStore(directory, fsync=False, serializer=serializer)
+    assert reopened.get_state("evt-1").result == OUTPUT
+    reopened.reserve("evt-2", 60)
+    assert reopened.get_state("evt-2").status.value == "PENDING"
+    reopened.close()
@@ -0,0 +1,137 @@
+"""
+Tests proving SharedMemoryStore deduplicates across processes.
+
+Validates that:
+- It follows the WebhookStore transition contract
+- Colliding probes and a full table are handled
+- Forked workers sharing the file reserve each id exactly once
+- Closing one of two stores on a file keeps the other's locks
+"""
+
+import fcntl
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from webhook_guard.models import WebhookStatus
+from webhook_guard.shm_store import SharedMemoryStore
+
+
+def test_transitions_and_reopen(tmp_path):
+    path = str(tmp_path / "webhooks.shm")
+    store = SharedMemoryStore(path, capacity=64, payload_bytes=64 * 1024)
+
+    assert store.reserve("shm-1", 60) == (True, None)
+    reserved, existing = store.reserve("shm-1", 60)
+    assert reserved is False and existing.status == WebhookStatus.PENDING
+
+    with pytest.raises(ValueError, match="cannot mark COMPLETE"):
+        store.mark_complete("shm-1", "early")
+    with pytest.raises(ValueError, match="does not exist"):
+        store.mark_processing("missing")
+
+    store.mark_processing("shm-1")
+    store.mark_complete("shm-1", {"charge": "ch_1"})
+
+    assert store.begin("shm-2", 60, "worker-a") == (True, None)
+    store.mark_failed("shm-2", "boom")
+    store.close()
+
+    reopened = SharedMemoryStore(path)
+    assert reopened.capacity == 64
+    assert reopened.get_state("shm-1").result == {"charge": "ch_1"}
+    failed = reopened.get_state("shm-2")
+    assert failed.status == WebhookStatus.FAILED
+    assert failed.error == "boom" and failed.owner == "worker-a"
+    reopened.close()
+
+
+def test_probing_and_full_table(tmp_path):
+    store = SharedMemoryStore(str(tmp_path / "webhooks.shm"), capacity=8, payload_bytes=1024)
+
+    for i in range(8):
+        assert store.reserve(f"evt-{i}", 60) == (True, None)
+    for i in range(8):
+        assert store.get_state(f"evt-{i}").status == WebhookStatus.PENDING
+
+    assert store.get_state("evt-missing") is None
+    with pytest.raises(RuntimeError, match="full"):
+        store.reserve("evt-8", 60)
+    store.close()
+
+
+def test_threads_reserve_once(tmp_path):
+    store = SharedMemoryStore(str(tmp_path / "webhooks.shm"), capacity=256)
+    barrier = threading.Barrier(16)
+
+    def worker(_):
+        barrier.wait()
+        return sum(store.reserve(f"evt-{i}", 60)[0] for i in range(100))
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        assert sum(pool.map(worker, range(16))) == 100
+    store.close()
+
+
+def _reserve_all(path, ids, barrier, wins):
+    store = SharedMemoryStore(path)
+    barrier.wait()
+    wins.put(sum(store.reserve(webhook_id, 60)[0] for webhook_id in ids))
+
+
+def test_forked_workers_share_one_table(tmp_path):
+    path = str(tmp_path / "webhooks.shm")
+    SharedMemoryStore(path, capacity=1024).close()
+
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(4)
+    wins = ctx.Queue()
+    ids = [f"evt-{i}" for i in range(200)]
+
+    workers = [ctx.Process(target=_reserve_all, args=(path, ids, barrier, wins)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    total = sum(wins.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert total == len(ids)
+
+
+def _try_byte(path, offset, results):
+    fd = os.open(path, os.O_RDWR)
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset)
+        results.put(True)
+    except OSError:
+        results.put(False)
+
+
+def test_stores_on_one_file_share_its_descriptor(tmp_path):
+    path = str(tmp_path / "webhooks.shm")
+    first = SharedMemoryStore(path, capacity=64, payload_bytes=64 * 1024)
+    second = SharedMemoryStore(path)
+    assert first._fd == second._fd
+
+    # first holds a slot lock while second is closed
+    first._lock(3)
+    second.close()
+
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    child = ctx.Process(target=_try_byte, args=(path, first._slot_offset(3), results))
+    child.start()
+    assert results.get(timeout=30) is False
+    child.join(timeout=30)
+
+    first._unlock(3)
+    assert first.reserve("evt-1", 60) == (True, None)
+    first.close()
+    first.close()
+
+    reopened = SharedMemoryStore(path)
+    assert reopened.get_state("evt-1").status == WebhookStatus.PENDING
+    reopened.close()
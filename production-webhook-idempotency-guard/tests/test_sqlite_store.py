@@ -0,0 +1,296 @@
+"""
+Tests proving SqliteStore follows the WebhookStore contract durably.
+
+Validates that:
+- Reservation is atomic across threads and connections
+- Only valid transitions are accepted
+- State survives reopening the database
+- Taking over an expired reservation drops its leftover blob
+- Connections of exited threads are closed
+- The guard executes handlers once on top of it
+"""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, fields, replace
+from typing import Optional
+
+import pytest
+
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.models import ProcessingResult, ResultRef, WebhookStatus
+from webhook_guard.sqlite_store import SqliteStore
+
+
+# -------- fake distributed lock --------
+
+class FakeLockHandle:
+    def __init__(self, lock, key: str):
+        self._lock = lock
+        self._key = key
+
+    def release(self) -> None:
+        with self._lock._mutex:
+            self._lock._held.discard(self._key)
+
+
+class FakeDistributedLock:
+    def __init__(self):
+        self._held = set()
+        self._mutex = threading.Lock()
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[FakeLockHandle]:
+        with self._mutex:
+            if key in self._held:
+                return None
+            self._held.add(key)
+            return FakeLockHandle(self, key)
+
+
+# -------- tests --------
+
+def test_transitions_and_persistence(tmp_path):
+    path = str(tmp_path / "webhooks.db")
+    store = SqliteStore(path)
+
+    assert store.reserve("sqlite-1", 60) == (True, None)
+    reserved, existing = store.reserve("sqlite-1", 60)
+    assert reserved is False and existing.status == WebhookStatus.PENDING
+
+    with pytest.raises(ValueError, match="cannot mark COMPLETE"):
+        store.mark_complete("sqlite-1", "early")
+
+    store.mark_processing("sqlite-1")
+    store.mark_complete("sqlite-1", {"charge": "ch_1", "amount": 1200})
+
+    with pytest.raises(ValueError, match="cannot mark FAILED"):
+        store.mark_failed("sqlite-1", "late")
+    with pytest.raises(ValueError, match="does not exist"):
+        store.mark_processing("missing")
+
+    store.close()
+
+    reopened = SqliteStore(path)
+    state = reopened.get_state("sqlite-1")
+    assert state.status == WebhookStatus.COMPLETE
+    assert state.result == {"charge": "ch_1", "amount": 1200}
+    assert state.created_at <= state.updated_at
+    reopened.close()
+
+
+def test_begin_and_bulk_operations(tmp_path):
+    store = SqliteStore(str(tmp_path / "webhooks.db"))
+
+    assert store.begin("begin-1", 60, "owner-a") == (True, None)
+    begun, existing = store.begin("begin-1", 60, "owner-b")
+    assert begun is False and existing.owner == "owner-a"
+
+    assert store.begin("begin-2", 0, "owner-a") == (True, None)
+    assert store.begin("begin-2", 60, "owner-b") == (True, None)
+    assert store.get_state("begin-2").owner == "owner-b"
+
+    ids = [f"bulk-{i}" for i in range(1200)]
+    outcomes = store.reserve_many(ids + ["bulk-0"], 60)
+    assert all(reserved for reserved, _ in outcomes[:-1])
+    assert outcomes[-1][0] is False
+
+    store.mark_processing_many(ids)
+    store.mark_complete_many({webhook_id: i for i, webhook_id in enumerate(ids)})
+    states = store.get_states(ids)
+    assert len(states) == 1200
+    assert states["bulk-7"].result == 7
+
+    # A failing item rolls the whole batch back
+    store.reserve_many(["rollback-1", "rollback-2"], 60)
+    with pytest.raises(ValueError):
+        store.mark_processing_many(["rollback-1", "missing"])
+    assert store.get_state("rollback-1").status == WebhookStatus.PENDING
+    store.close()
+
+
+def test_takeover_drops_leftover_result(tmp_path):
+    store = SqliteStore(str(tmp_path / "webhooks.db"))
+    conn = store._connection()
+
+    # Zero-second lease, with a blob left behind by its worker
+    assert store.begin("takeover-1", 0, "owner-a") == (True, None)
+    conn.execute("INSERT INTO webhook_result (webhook_id, result) VALUES (?, ?)", ("takeover-1", b"stale"))
+
+    assert store.begin("takeover-1", 60, "owner-b") == (True, None)
+    assert conn.execute("SELECT COUNT(*) FROM webhook_result").fetchone() == (0,)
+
+    # A live reservation is not taken over and keeps its row
+    conn.execute("INSERT INTO webhook_result (webhook_id, result) VALUES (?, ?)", ("takeover-1", b"kept"))
+    assert store.begin("takeover-1", 60, "owner-c")[0] is False
+    assert conn.execute("SELECT COUNT(*) FROM webhook_result").fetchone() == (1,)
+    store.close()
+
+
+def test_connections_of_exited_threads_are_closed(tmp_path):
+    store = SqliteStore(str(tmp_path / "webhooks.db"))
+    opened = []
+
+    def worker():
+        opened.append(store._connection())
+        store.get_state("any")
+
+    for _ in range(4):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    assert len(store._connections) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+    store.close()
+
+
+def test_guard_executes_once_across_threads(tmp_path):
+    store = SqliteStore(str(tmp_path / "webhooks.db"))
+    guard = WebhookGuard(store=store, lock=FakeDistributedLock(), coalesce=False)
+
+    execution_count = 0
+    counter_lock = threading.Lock()
+
+    def handler():
+        nonlocal execution_count
+        with counter_lock:
+            execution_count += 1
+        return "done"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(guard.process, f"threaded-{i % 10}", handler, 60)
+            for i in range(80)
+        ]
+        results = [future.result() for future in futures]
+
+    assert execution_count == 10
+    assert all(r.output == "done" for r in results if r.success)
+    store.close()
+
+
+def test_group_commit_batches_terminal_writes(tmp_path):
+    store = SqliteStore(
+        str(tmp_path / "webhooks.db"),
+        group_commit_window_seconds=0.05,
+        group_commit_max_batch=16,
+    )
+    ids = [f"group-{i}" for i in range(16)]
+    for webhook_id in ids + ["group-invalid"]:
+        store.reserve(webhook_id, 60)
+    for webhook_id in ids:
+        store.mark_processing(webhook_id)
+
+    commits = []
+    original_commit = store._commit_terminal_batch
+
+    def counting_commit(writes):
+        commits.append(len(writes))
+        return original_commit(writes)
+
+    store._terminal_writer._commit = counting_commit
+    barrier = threading.Barrier(17)
+
+    def complete(webhook_id):
+        barrier.wait()
+        store.mark_complete(webhook_id, webhook_id)
+
+    def complete_invalid():
+        barrier.wait()
+        with pytest.raises(ValueError, match="cannot mark COMPLETE"):
+            store.mark_complete("group-invalid", "nope")
+
+    with ThreadPoolExecutor(max_workers=17) as executor:
+        futures = [executor.submit(complete, webhook_id) for webhook_id in ids]
+        futures.append(executor.submit(complete_invalid))
+        for future in futures:
+            future.result()
+
+    assert sum(commits) == 17
+    assert len(commits) < 17
+    states = store.get_states(ids)
+    assert all(state.status == WebhookStatus.COMPLETE for state in states.values())
+    assert store.get_state("group-invalid").status == WebhookStatus.PENDING
+    store.close()
+
+
+def test_group_commit_isolates_failing_writes(tmp_path):
+    store = SqliteStore(str(tmp_path / "webhooks.db"), group_commit_window_seconds=0.2)
+    ids = ["isolated-ok", "isolated-unpicklable", "isolated-broken"]
+    for webhook_id in ids:
+        store.begin(webhook_id, 60, "worker")
+
+    # Fails inside the shared transaction, after its row was written
+    complete_row = store._complete_row
+
+    def breaking_row(conn, webhook_id, blob, owner):
+        complete_row(conn, webhook_id, blob, owner)
+        if webhook_id == "isolated-broken":
+            raise RuntimeError("disk on fire")
+
+    store._complete_row = breaking_row
+    barrier = threading.Barrier(3)
+
+    def complete(webhook_id, result):
+        barrier.wait()
+        try:
+            store.mark_complete(webhook_id, result)
+        except Exception as exc:
+            return type(exc)
+        return None
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        outcomes = list(executor.map(complete, ids, ["ok", lambda: None, "ok"]))
+
+    assert outcomes[0] is None
+    assert outcomes[1] is not None and outcomes[2] is RuntimeError
+    assert store.get_state("isolated-ok").status == WebhookStatus.COMPLETE
+    assert store.get_state("isolated-unpicklable").status == WebhookStatus.PROCESSING
+    assert store.get_state("isolated-broken").status == WebhookStatus.PROCESSING
+    store.close()
+
+
+def test_large_results_are_stored_out_of_line(tmp_path):
+    store = SqliteStore(str(tmp_path / "webhooks.db"), inline_result_max_bytes=1024)
+    guard = WebhookGuard(store=store, lock=FakeDistributedLock())
+    payload = {"body": "x" * 50_000}
+
+    assert guard.process("large-1", lambda: payload, 60).output == payload
+
+    loads = []
+    original_load = store._load_result
+
+    def counting_load(webhook_id):
+        loads.append(webhook_id)
+        return original_load(webhook_id)
+
+    store._load_result = counting_load
+
+    state = store.get_state("large-1")
+    assert isinstance(state.result, ResultRef)
+
+    retry = guard.process("large-1", lambda: "again", 60)
+    assert retry.cached is True and loads == []
+
+    # Internal copies and printing the result do not load the blob
+    copied = retry._copy(duration_ms=0)
+    assert "ResultRef" in repr(copied)
+    assert loads == []
+
+    # The public dataclass surface sees the value, loaded once
+    assert [field.name for field in fields(copied)] == ["success", "output", "error", "duration_ms", "cached"]
+    assert asdict(copied)["output"] == payload and loads == ["large-1"]
+    assert copied == replace(retry, duration_ms=0)
+    assert retry == ProcessingResult(True, payload, None, retry.duration_ms, True)
+    assert retry.output == payload and retry.output == payload
+    assert loads == ["large-1"]
+
+    # A rejected transition leaves no blob behind
+    store.reserve("large-2", 60)
+    with pytest.raises(ValueError, match="cannot mark COMPLETE"):
+        store.mark_complete("large-2", payload)
+    conn = store._connection()
+    assert conn.execute("SELECT COUNT(*) FROM webhook_result").fetchone() == (1,)
+    store.close()
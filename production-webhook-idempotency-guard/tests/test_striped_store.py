@@ -0,0 +1,53 @@
+"""
+Tests proving StripedInMemoryStore reservation is atomic under threads.
+
+Validates that:
+- Exactly one thread wins each reservation
+- Bulk operations preserve input order across shards
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from webhook_guard.models import WebhookStatus
+from webhook_guard.store import StripedInMemoryStore
+
+
+def test_reserve_is_atomic_under_threads():
+    store = StripedInMemoryStore(shards=8)
+    ids = [f"striped-{i}" for i in range(200)]
+    wins = []
+    wins_lock = threading.Lock()
+    barrier = threading.Barrier(16)
+
+    def worker():
+        barrier.wait()
+        for webhook_id in ids:
+            reserved, _ = store.reserve(webhook_id, 60)
+            if reserved:
+                with wins_lock:
+                    wins.append(webhook_id)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for future in [executor.submit(worker) for _ in range(16)]:
+            future.result()
+
+    assert sorted(wins) == sorted(ids)
+
+
+def test_bulk_operations_span_shards():
+    store = StripedInMemoryStore(shards=4)
+    ids = [f"bulk-{i}" for i in range(20)]
+
+    store.reserve("bulk-7", 60)
+    outcomes = store.reserve_many(ids, 60)
+
+    assert [reserved for reserved, _ in outcomes] == [webhook_id != "bulk-7" for webhook_id in ids]
+
+    store.mark_processing_many(ids)
+    store.mark_complete_many({webhook_id: webhook_id.upper() for webhook_id in ids})
+
+    states = store.get_states(ids + ["missing"])
+    assert set(states) == set(ids)
+    assert all(state.status == WebhookStatus.COMPLETE for state in states.values())
+    assert states["bulk-3"].result == "BULK-3"
@@ -0,0 +1,111 @@
+"""
+Tests proving TieredStore keeps the durable tier authoritative.
+
+Validates that:
+- Writes reach the cold tier and are mirrored into the hot tier
+- Finished webhooks are read from the hot tier, not the cold one, and
+  retries of them skip the lock
+- Terminal states are promoted on a hot miss; others never served hot
+- The hot tier is bounded
+"""
+
+from typing import Optional
+
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.models import WebhookStatus
+from webhook_guard.sqlite_store import SqliteStore
+from webhook_guard.store import InMemoryStore
+from webhook_guard.tiered_store import TieredStore
+
+
+# -------- fake distributed lock --------
+
+class FakeLockHandle:
+    def __init__(self, lock, key: str):
+        self._lock = lock
+        self._key = key
+
+    def release(self) -> None:
+        self._lock._held.discard(self._key)
+
+
+class FakeDistributedLock:
+    def __init__(self):
+        self._held = set()
+        self.attempts = 0
+
+    def try_lock(self, key: str, timeout_seconds: int) -> Optional[FakeLockHandle]:
+        self.attempts += 1
+        if key in self._held:
+            return None
+        self._held.add(key)
+        return FakeLockHandle(self, key)
+
+
+class CountingStore:
+    """Counts get_state calls reaching the wrapped store."""
+
+    def __init__(self, store):
+        self._store = store
+        self.reads = 0
+
+    def get_state(self, webhook_id: str):
+        self.reads += 1
+        return self._store.get_state(webhook_id)
+
+    def __getattr__(self, name: str):
+        return getattr(self._store, name)
+
+
+# -------- tests --------
+
+def test_retries_are_served_from_hot_tier(tmp_path):
+    cold = CountingStore(SqliteStore(str(tmp_path / "webhooks.db")))
+    store = TieredStore(InMemoryStore(), cold)
+    lock = FakeDistributedLock()
+    guard = WebhookGuard(store=store, lock=lock)
+
+    result = guard.process("tiered-1", lambda: "ok", 60)
+    assert result.success is True and result.cached is False
+    assert cold.get_state("tiered-1").status == WebhookStatus.COMPLETE
+    reads = cold.reads
+
+    for _ in range(5):
+        retry = guard.process("tiered-1", lambda: "again", 60)
+        assert retry.cached is True and retry.output == "ok"
+    assert cold.reads == reads
+    assert lock.attempts == 1
+
+
+def test_terminal_states_are_promoted_on_miss(tmp_path):
+    durable = SqliteStore(str(tmp_path / "webhooks.db"))
+    durable.reserve("done", 60)
+    durable.mark_processing("done")
+    durable.mark_complete("done", {"charge": "ch_1"})
+    durable.reserve("open", 60)
+
+    cold = CountingStore(durable)
+    hot = InMemoryStore()
+    store = TieredStore(hot, cold)
+
+    assert store.get_state("done").result == {"charge": "ch_1"}
+    assert store.get_state("done").result == {"charge": "ch_1"}
+    assert cold.reads == 1 and hot.get_state("done") is not None
+
+    # Non-terminal states can change elsewhere: always read from cold
+    assert store.get_state("open").status == WebhookStatus.PENDING
+    assert store.get_state("open").status == WebhookStatus.PENDING
+    assert cold.reads == 3 and hot.get_state("open") is None
+
+
+def test_hot_tier_is_bounded():
+    hot = InMemoryStore()
+    store = TieredStore(hot, InMemoryStore(), max_hot_entries=3)
+    guard = WebhookGuard(store=store, lock=FakeDistributedLock())
+
+    for i in range(10):
+        guard.process(f"evt-{i}", lambda: "ok", 60)
+
+    assert len(hot) == 3
+    assert [hot.get_state(f"evt-{i}") is not None for i in range(7, 10)] == [True] * 3
+    assert store.get_state("evt-0").status == WebhookStatus.COMPLETE
@@ -0,0 +1,104 @@
+"""
+Tests proving contended deliveries wait according to the strategy.
+
+Validates that:
+- BackoffWait grows waits exponentially, caps them and stops at the deadline
+- Jitter only shortens waits
+- AdaptiveWait sizes its first wait from observed handler durations
+- The guard polls the store until the other worker finishes
+"""
+
+import threading
+import time
+
+import pytest
+
+from webhook_guard.guard import WebhookGuard
+from webhook_guard.local_lock import StripedThreadLock
+from webhook_guard.store import StripedInMemoryStore
+from webhook_guard.wait import AdaptiveWait, BackoffWait, FixedWait
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _drain(strategy, clock):
+    delays = []
+    for delay in strategy.delays():
+        delays.append(delay)
+        clock.now += delay
+    return delays
+
+
+def test_backoff_is_capped_and_bounded_by_the_deadline():
+    clock = FakeClock()
+    strategy = BackoffWait(
+        initial_seconds=0.05, max_delay_seconds=0.4, deadline_seconds=2.0, jitter=0.0, clock=clock
+    )
+
+    delays = _drain(strategy, clock)
+    assert delays[:5] == pytest.approx([0.05, 0.1, 0.2, 0.4, 0.4])
+    assert max(delays) == pytest.approx(0.4)
+    assert sum(delays) == pytest.approx(2.0)
+
+
+def test_jitter_only_shortens_waits():
+    clock = FakeClock()
+    strategy = BackoffWait(initial_seconds=1.0, deadline_seconds=3.0, jitter=0.5, clock=clock, rand=lambda: 1.0)
+    assert _drain(strategy, clock)[:2] == pytest.approx([0.5, 1.0])
+
+    with pytest.raises(ValueError):
+        BackoffWait(jitter=1.0)
+
+
+def test_adaptive_first_wait_follows_observed_durations():
+    clock = FakeClock()
+    strategy = AdaptiveWait(window=3, initial_seconds=0.05, jitter=0.0, clock=clock)
+    assert next(strategy.delays()) == pytest.approx(0.05)
+
+    for duration in (9.0, 0.2, 0.4, 0.6):
+        strategy.observe(duration)
+
+    # The 9 s outlier left the window; median 0.4 -> first wait 0.2
+    assert next(strategy.delays()) == pytest.approx(0.2)
+
+
+def _contended(wait_strategy):
+    store = StripedInMemoryStore()
+    guard = WebhookGuard(store=store, lock=StripedThreadLock(), wait_strategy=wait_strategy)
+
+    # Another host is processing; it finishes without notifying this one
+    store.begin("evt-1", 60, "other-host")
+    finisher = threading.Timer(0.15, store.mark_complete, ("evt-1", "done"))
+    finisher.start()
+    try:
+        return guard.process("evt-1", lambda: "duplicate")
+    finally:
+        finisher.join()
+
+
+def test_guard_polls_until_the_other_worker_finishes():
+    started = time.monotonic()
+    result = _contended(BackoffWait(initial_seconds=0.02, max_delay_seconds=0.1, deadline_seconds=5.0))
+
+    assert result.success and result.cached and result.output == "done"
+    assert time.monotonic() - started < 1.0
+
+    result = _contended(FixedWait(0.01))
+    assert not result.success and result.error == "Webhook is currently being processed"
+
+
+def test_guard_reports_handler_durations():
+    strategy = AdaptiveWait()
+    guard = WebhookGuard(store=StripedInMemoryStore(), lock=StripedThreadLock(), wait_strategy=strategy)
+
+    guard.process("evt-1", lambda: time.sleep(0.02))
+    guard.process_many([("evt-2", lambda: None), ("evt-3", lambda: None)])
+
+    assert len(strategy._durations) == 3
+    assert strategy._durations[0] >= 0.02